@@ -0,0 +1,56 @@
+"""Benchmark scrape_fashion_data sekuensial vs konkuren terhadap server lokal berlatensi.
+
+Jalankan: python -m benchmarks.bench_extract --pages 50 --latency 0.05 --parse-workers 0 4
+"""
+import argparse
+import logging
+import time
+
+from benchmarks.mock_site import MockSite
+from benchmarks.results import record
+from utils.extract import scrape_fashion_data
+
+
+def run(pages, latency, worker_counts, parse_worker_counts=(0,), anomaly_rate=0.0, latency_jitter=0.0):
+    results = []
+    baseline = None
+    with MockSite(pages=pages, latency=latency, latency_jitter=latency_jitter, anomaly_rate=anomaly_rate) as site:
+        for workers, parse_workers in [(w, p) for p in parse_worker_counts for w in worker_counts]:
+            start = time.perf_counter()
+            data = scrape_fashion_data(site.base_url, end_page=pages, limit=10**9, workers=workers, parse_workers=parse_workers)
+            elapsed = time.perf_counter() - start
+            records = [{k: v for k, v in item.items() if k != 'timestamp'} for item in data]
+            if baseline is None:
+                baseline = records
+            results.append({
+                'workers': workers,
+                'parse_workers': parse_workers,
+                'seconds': round(elapsed, 3),
+                'pages_per_sec': round(pages / elapsed, 1),
+                'records': len(data),
+                'same_output': records == baseline,
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--pages', type=int, default=50)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8, 16])
+    parser.add_argument('--parse-workers', type=int, nargs='+', default=[0])
+    parser.add_argument('--anomaly-rate', type=float, default=0.0)
+    parser.add_argument('--latency-jitter', type=float, default=0.0)
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(args.pages, args.latency, args.workers, args.parse_workers, args.anomaly_rate, args.latency_jitter)
+    for row in results:
+        print(row)
+    if not args.no_record:
+        record('extract', results, vars(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+"""Benchmark loader: CSV, Parquet (snappy/zstd), snapshot Arrow IPC dan SQL (to_sql ke SQLite lokal).
+
+Data bersih dibuat dari katalog sintetis (benchmarks.synthetic) yang sudah melalui process_dataframe.
+
+Jalankan: python -m benchmarks.bench_load --sizes 10000 1000000
+"""
+import argparse
+import logging
+import os
+import tempfile
+import time
+
+from benchmarks.results import record
+from benchmarks.synthetic import iter_raw_records
+from utils.load import save_to_csv, save_to_parquet, save_raw_snapshot, save_to_postgres, sinks
+from utils.transform import process_dataframe
+
+
+def loaders(tmp):
+    return {
+        'csv': (lambda df: save_to_csv(df, os.path.join(tmp, 'products.csv')), 'products.csv'),
+        'parquet_snappy': (lambda df: save_to_parquet(df, os.path.join(tmp, 'snappy.parquet')), 'snappy.parquet'),
+        'parquet_zstd': (lambda df: save_to_parquet(df, os.path.join(tmp, 'zstd.parquet'), compression='zstd'), 'zstd.parquet'),
+        'arrow_snapshot': (lambda df: save_raw_snapshot(df, os.path.join(tmp, 'products.arrow')), 'products.arrow'),
+        'sqlite': (lambda df: save_to_postgres(df, f"sqlite:///{os.path.join(tmp, 'products.db')}"), 'products.db'),
+    }
+
+
+def run(sizes, anomaly_rate=0.1):
+    results = []
+    for rows in sizes:
+        clean = process_dataframe(list(iter_raw_records(rows, anomaly_rate)))
+        with tempfile.TemporaryDirectory() as tmp:
+            for sink, (load, filename) in loaders(tmp).items():
+                start = time.perf_counter()
+                ok = load(clean)
+                elapsed = time.perf_counter() - start
+                results.append({
+                    'rows': rows,
+                    'sink': sink,
+                    'ok': ok,
+                    'seconds': round(elapsed, 3),
+                    'rows_per_sec': round(len(clean) / elapsed, 1),
+                    'size_mb': round(os.path.getsize(os.path.join(tmp, filename)) / 1024 / 1024, 2),
+                })
+            sinks.dispose()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10000, 1000000])
+    parser.add_argument('--anomaly-rate', type=float, default=0.1)
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(args.sizes, args.anomaly_rate)
+    for row in results:
+        print(row)
+    if not args.no_record:
+        record('load', results, vars(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark cleaning dengan memoization (engine memoized) vs vectorized pada data miring (skewed).
+
+Baris mentah diambil dari katalog sintetis berisi --catalog produk unik dengan bobot Zipf
+(sedikit produk populer muncul sangat sering, seperti hasil scraping berulang), lalu diproses
+per chunk seperti transform streaming sehingga cache nilai terpakai lintas chunk.
+
+Jalankan: python -m benchmarks.bench_memoize --sizes 100000 1000000 --catalog 20000 --zipf 1.2
+"""
+import argparse
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.results import record
+from benchmarks.synthetic import make_raw_frame
+from utils.transform import ValueCache, clean_columns
+import utils.transform as transform
+
+
+def make_skewed_frame(rows, catalog_size, zipf, seed=0):
+    catalog = make_raw_frame(catalog_size, anomaly_rate=0.1, seed=seed)
+    rng = np.random.default_rng(seed)
+    weights = 1.0 / np.arange(1, catalog_size + 1) ** zipf
+    picks = rng.choice(catalog_size, size=rows, p=weights / weights.sum())
+    return catalog.iloc[picks].reset_index(drop=True)
+
+
+def time_chunks(raw, engine, chunk_size):
+    start = time.perf_counter()
+    chunks = [clean_columns(raw.iloc[i:i + chunk_size].copy(), engine) for i in range(0, len(raw), chunk_size)]
+    elapsed = time.perf_counter() - start
+    return elapsed, pd.concat(chunks)
+
+
+def run(sizes, catalog_size, zipf, chunk_size, maxsize):
+    results = []
+    for rows in sizes:
+        raw = make_skewed_frame(rows, catalog_size, zipf)
+        vectorized_time, vectorized = time_chunks(raw, 'vectorized', chunk_size)
+        transform.value_cache = ValueCache(maxsize)
+        memoized_time, memoized = time_chunks(raw, 'memoized', chunk_size)
+        report = transform.value_cache.report()
+        results.append({
+            'rows': rows,
+            'catalog': catalog_size,
+            'chunk_size': chunk_size,
+            'vectorized_s': round(vectorized_time, 3),
+            'memoized_s': round(memoized_time, 3),
+            'speedup': round(vectorized_time / memoized_time, 1),
+            'identical': vectorized.equals(memoized),
+            'hit_rate': {column: stats['hit_rate'] for column, stats in report.items()},
+            'cleaned_values': sum(stats['misses'] for stats in report.values()),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--catalog', type=int, default=20000)
+    parser.add_argument('--zipf', type=float, default=1.2)
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--maxsize', type=int, default=100000)
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(args.sizes, args.catalog, args.zipf, args.chunk_size, args.maxsize)
+    for row in results:
+        print(row)
+    if not args.no_record:
+        record('memoize', results, vars(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,29 @@
+"""Memory report DataFrame bersih: skema biasa vs skema compact (compact_dtypes).
+
+Jalankan: python -m benchmarks.bench_memory --rows 1000000
+"""
+import argparse
+import contextlib
+import io
+import logging
+
+import pandas as pd
+
+from benchmarks.bench_streaming import iter_raw_records
+from utils.transform import compact_dtypes, memory_report, process_dataframe
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rows', type=int, default=1000000)
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    with contextlib.redirect_stdout(io.StringIO()):
+        clean = process_dataframe(list(iter_raw_records(args.rows)))
+    with pd.option_context('display.width', 120):
+        print(memory_report(clean, compact_dtypes(clean)))
+
+
+if __name__ == '__main__':
+    main()
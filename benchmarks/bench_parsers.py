@@ -0,0 +1,60 @@
+"""Benchmark waktu parsing per halaman untuk setiap backend parser.
+
+Jalankan: python -m benchmarks.bench_parsers --repeat 50
+"""
+import argparse
+import glob
+import logging
+import os
+import time
+
+from benchmarks.results import record
+from benchmarks.synthetic import render_page
+from utils.parsers import PARSERS
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'fixtures')
+
+
+def load_pages():
+    pages = {}
+    for path in sorted(glob.glob(os.path.join(FIXTURES_DIR, '*.html'))):
+        with open(path, 'rb') as f:
+            pages[os.path.basename(path)] = f.read()
+    pages['synthetic-20-cards'] = render_page(1, products_per_page=20)
+    pages['synthetic-200-cards'] = render_page(1, products_per_page=200)
+    pages['synthetic-anomalies'] = render_page(1, products_per_page=200, anomaly_rate=0.3)
+    return pages
+
+
+def run(repeat):
+    results = []
+    for page_name, content in load_pages().items():
+        for backend, parse in PARSERS.items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                parse(content)
+            elapsed = time.perf_counter() - start
+            results.append({
+                'page': page_name,
+                'backend': backend,
+                'ms_per_page': round(elapsed / repeat * 1000, 3),
+            })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=50)
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.CRITICAL)
+    results = run(args.repeat)
+    for row in results:
+        print(row)
+    if not args.no_record:
+        record('parsers', results, vars(args))
+
+
+if __name__ == '__main__':
+    main()
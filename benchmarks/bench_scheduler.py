@@ -0,0 +1,72 @@
+"""Benchmark crawl multi-sumber: scrape_fashion_data per sumber (berurutan) vs CrawlScheduler (bergiliran).
+
+Setiap sumber adalah MockSite sendiri (domain/port berbeda); satu sumber dibuat lebih lambat
+(--slow-latency) untuk memperlihatkan bahwa sumber lambat tidak menahan sumber lain.
+
+Jalankan: python -m benchmarks.bench_scheduler --sources 1 2 4 --pages 20 --latency 0.05 --slow-latency 0.2
+"""
+import argparse
+import logging
+import time
+from contextlib import ExitStack
+
+from benchmarks.mock_site import MockSite
+from benchmarks.results import record
+from utils.extract import scrape_fashion_data
+from utils.scheduler import CatalogSource, scrape_catalogs
+
+
+def run(source_counts, pages, latency, slow_latency, max_connections, parser):
+    results = []
+    for count in source_counts:
+        with ExitStack() as stack:
+            sites = [stack.enter_context(MockSite(pages=pages, latency=slow_latency if i == count - 1 and count > 1 else latency, seed=i))
+                     for i in range(count)]
+
+            start = time.perf_counter()
+            sequential = []
+            for site in sites:
+                sequential.extend(scrape_fashion_data(site.base_url, end_page=pages, limit=10**9, workers=max_connections,
+                                                      per_host_limit=max_connections, parser=parser))
+            sequential_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            scheduled = scrape_catalogs([CatalogSource(site.base_url, end_page=pages, limit=10**9) for site in sites],
+                                        workers=max_connections * count, max_connections=max_connections, parser=parser)
+            scheduled_time = time.perf_counter() - start
+
+        strip = lambda data: sorted(tuple(sorted((k, v) for k, v in item.items() if k != 'timestamp')) for item in data)
+        results.append({
+            'sources': count,
+            'pages_per_source': pages,
+            'sequential_s': round(sequential_time, 3),
+            'scheduler_s': round(scheduled_time, 3),
+            'speedup': round(sequential_time / scheduled_time, 1),
+            'pages_per_sec': round(count * pages / scheduled_time, 1),
+            'records': len(scheduled),
+            'same_output': strip(sequential) == strip(scheduled),
+        })
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sources', type=int, nargs='+', default=[1, 2, 4])
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--latency', type=float, default=0.05)
+    parser.add_argument('--slow-latency', type=float, default=0.2)
+    parser.add_argument('--max-connections', type=int, default=4)
+    parser.add_argument('--parser', default='lxml')
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(args.sources, args.pages, args.latency, args.slow_latency, args.max_connections, args.parser)
+    for row in results:
+        print(row)
+    if not args.no_record:
+        record('scheduler', results, vars(args))
+
+
+if __name__ == '__main__':
+    main()
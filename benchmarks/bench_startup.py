@@ -0,0 +1,90 @@
+"""Benchmark waktu startup CLI (main.py) per subcommand dengan python -X importtime.
+
+Setiap skenario dijalankan di proses baru; dicatat waktu wall (median), total waktu impor
+(jumlah kolom cumulative modul tingkat atas dari -X importtime) dan dependensi berat yang ikut dimuat.
+Skenario 'eager' mengimpor semua modul utils + library sink sekaligus, seperti main.py sebelum impor lazy.
+
+Jalankan: python -m benchmarks.bench_startup --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.results import record
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'main.py')
+HEAVY_MODULES = ('pandas', 'pyarrow', 'numpy', 'requests', 'bs4', 'lxml', 'gspread', 'oauth2client', 'sqlalchemy')
+EAGER_IMPORTS = ("import utils.extract, utils.scheduler, utils.transform, utils.load, utils.pipeline, utils.cdc, "
+                 "gspread, oauth2client.service_account, sqlalchemy, pyarrow.dataset, bs4")
+
+
+# Fungsi untuk membaca output -X importtime: total cumulative (mikrodetik) modul tingkat atas dan paket yang dimuat
+def parse_importtime(stderr):
+    total_us = 0
+    packages = set()
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'imported package' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|', 2)
+        if not name.startswith('  '):
+            total_us += int(cumulative)
+        packages.add(name.strip().split('.')[0])
+    return total_us, packages
+
+
+# Fungsi untuk menjalankan satu skenario beberapa kali di proses baru
+def measure(argv, repeat, cwd):
+    walls, imports = [], []
+    packages = set()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        proc = subprocess.run([sys.executable, '-X', 'importtime', *argv], cwd=cwd, capture_output=True, text=True)
+        walls.append(time.perf_counter() - start)
+        if proc.returncode != 0:
+            raise RuntimeError(f"{argv} failed: {proc.stderr[-500:]}")
+        total_us, packages = parse_importtime(proc.stderr)
+        imports.append(total_us)
+    return {
+        'wall_s': round(statistics.median(walls), 3),
+        'import_s': round(statistics.median(imports) / 1e6, 3),
+        'heavy_modules': [name for name in HEAVY_MODULES if name in packages],
+    }
+
+
+def run(repeat, raw_csv):
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        clean_csv = os.path.join(tmp, 'clean.csv')
+        scenarios = [
+            ('eager imports', ['-c', EAGER_IMPORTS]),
+            ('--help', [MAIN, '--help']),
+            ('transform csv', [MAIN, '--report', '', 'transform', '--input', raw_csv, '--output', clean_csv]),
+            ('load --sinks csv', [MAIN, '--report', '', 'load', '--input', clean_csv, '--sinks', 'csv']),
+            ('load --sinks parquet', [MAIN, '--report', '', 'load', '--input', clean_csv, '--sinks', 'parquet']),
+        ]
+        for name, argv in scenarios:
+            results.append({'scenario': name, **measure(argv, repeat, cwd=ROOT if argv[0] == '-c' else tmp)})
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--raw-csv', default=os.path.join(ROOT, 'products_raw.csv'))
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    args = parser.parse_args()
+
+    results = run(args.repeat, args.raw_csv)
+    for row in results:
+        print(row)
+    if not args.no_record:
+        record('startup', results, vars(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark store query lokal (SQLite ber-index) vs scan penuh products.csv dengan pandas.
+
+Data bersih dibuat dari katalog sintetis (benchmarks.synthetic) yang sudah melalui process_dataframe,
+lalu ditulis ke CSV dan disinkronkan ke ProductStore. Untuk setiap pertanyaan dicatat waktu
+scan CSV (read_csv + filter, seperti analis sekarang), filter pandas pada DataFrame yang sudah
+di memori, dan query store. Juga dicatat waktu build awal dan refresh incremental (1% baris berubah).
+
+Jalankan: python -m benchmarks.bench_store --sizes 100000 1000000
+"""
+import argparse
+import logging
+import os
+import statistics
+import tempfile
+import time
+
+import pandas as pd
+
+from benchmarks.results import record
+from benchmarks.synthetic import iter_raw_records
+from utils.store import ProductStore, save_to_store
+from utils.transform import process_dataframe
+
+# Fungsi untuk filter pandas Gender + Size
+def _women_xl(df):
+    return df.loc[(df['Gender'] == 'Women') & (df['Size'] == 'XL'), 'Price']
+
+
+# Pertanyaan analis: (nama, query store, filter pandas yang setara); keduanya menghasilkan jawaban yang sebanding
+QUESTIONS = [
+    ('price_range_women_xl',
+     lambda store: tuple(store.price_range(gender='Women', size='XL')[key] for key in ('count', 'min', 'max')),
+     lambda df: (len(_women_xl(df)), _women_xl(df).min(), _women_xl(df).max())),
+    ('top10_rated_hoodies',
+     lambda store: store.top_rated(10, title_contains='hoodie')['Title'].tolist(),
+     lambda df: df[df['Title'].str.contains('hoodie', case=False)].sort_values(['Rating', 'Price'], ascending=[False, True])
+                  .head(10)['Title'].tolist()),
+    ('price_between_1m_1.1m',
+     lambda store: len(store.query(columns=['Title', 'Price'], min_price=1000000, max_price=1100000)),
+     lambda df: int(df['Price'].between(1000000, 1100000).sum())),
+]
+
+
+def timed(func, repeat):
+    times, result = [], None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), result
+
+
+def run(sizes, repeat):
+    results = []
+    for rows in sizes:
+        clean = process_dataframe(list(iter_raw_records(rows, anomaly_rate=0.0)))
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'products.csv')
+            store_path = os.path.join(tmp, 'products.sqlite')
+            start = time.perf_counter()
+            save_to_store(clean, store_path)
+            build_time = time.perf_counter() - start
+
+            # Refresh incremental: 1% produk berganti harga
+            changed = clean.copy()
+            changed.iloc[::100, changed.columns.get_loc('Price')] += 1000
+            start = time.perf_counter()
+            save_to_store(changed, store_path)
+            refresh_time = time.perf_counter() - start
+            changed.to_csv(csv_path, index=False)
+
+            store = ProductStore(store_path)
+            for name, ask_store, ask_frame in QUESTIONS:
+                scan_time, expected = timed(lambda: ask_frame(pd.read_csv(csv_path)), 1)
+                memory_time, _ = timed(lambda: ask_frame(changed), repeat)
+                store_time, answer = timed(lambda: ask_store(store), repeat)
+                results.append({
+                    'rows': len(clean),
+                    'question': name,
+                    'csv_scan_s': round(scan_time, 4),
+                    'pandas_in_memory_s': round(memory_time, 4),
+                    'store_s': round(store_time, 4),
+                    'speedup_vs_csv': round(scan_time / store_time, 1),
+                    'same_result': answer == expected,
+                    'build_s': round(build_time, 3),
+                    'refresh_1pct_s': round(refresh_time, 3),
+                    'store_mb': round(os.path.getsize(store_path) / 1024 / 1024, 1),
+                    'csv_mb': round(os.path.getsize(csv_path) / 1024 / 1024, 1),
+                })
+            store.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(args.sizes, args.repeat)
+    for row in results:
+        print(row)
+    if not args.no_record:
+        record('store', results, vars(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""Benchmark peak RSS: process_dataframe (seluruh data di memori) vs iter_clean_chunks (streaming).
+
+Setiap pengukuran berjalan di subprocess terpisah agar peak RSS tidak saling memengaruhi.
+
+Jalankan: python -m benchmarks.bench_streaming --sizes 100000 1000000 --chunk-size 50000
+"""
+import argparse
+import contextlib
+import io
+import itertools
+import json
+import logging
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import pandas as pd
+
+from benchmarks.results import record
+
+RAW_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'products_raw.csv')
+
+
+# Generator record mentah: baris products_raw.csv diulang dengan Title unik agar tidak terhapus sebagai duplikat
+def iter_raw_records(rows):
+    sample = pd.read_csv(RAW_CSV, dtype=str).to_dict('records')
+    for i, record in zip(range(rows), itertools.cycle(sample)):
+        yield dict(record, Title=f"{record['Title']} #{i}")
+
+
+def measure(mode, rows, chunk_size):
+    from utils.transform import iter_clean_chunks, process_dataframe
+
+    logging.getLogger().setLevel(logging.WARNING)
+    start = time.perf_counter()
+    if mode == 'batch':
+        with contextlib.redirect_stdout(io.StringIO()):
+            rows_out = len(process_dataframe(list(iter_raw_records(rows))))
+    else:
+        rows_out = sum(len(chunk) for chunk in iter_clean_chunks(iter_raw_records(rows), chunk_size=chunk_size))
+    elapsed = time.perf_counter() - start
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    return {'mode': mode, 'rows': rows, 'rows_out': rows_out, 'seconds': round(elapsed, 2), 'peak_rss_mb': round(peak_mb, 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100000, 1000000])
+    parser.add_argument('--chunk-size', type=int, default=50000)
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    parser.add_argument('--child', nargs=2, metavar=('MODE', 'ROWS'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(measure(args.child[0], int(args.child[1]), args.chunk_size)))
+        return
+
+    results = []
+    for rows in args.sizes:
+        for mode in ('batch', 'stream'):
+            output = subprocess.run(
+                [sys.executable, '-m', 'benchmarks.bench_streaming', '--child', mode, str(rows), '--chunk-size', str(args.chunk_size)],
+                check=True, capture_output=True, text=True
+            ).stdout
+            results.append(json.loads(output.strip().splitlines()[-1]))
+            print(results[-1])
+    if not args.no_record:
+        record('streaming', results, {'sizes': args.sizes, 'chunk_size': args.chunk_size})
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark cleaning kolom: engine vectorized vs scalar (apply per baris).
+
+Data mentah diambil secara acak (dengan pengembalian) dari products_raw.csv, atau dibuat oleh
+katalog sintetis (--source synthetic); anomali "Unknown Product", "Invalid Rating" dan
+"Price Unavailable" ikut terbawa pada keduanya.
+
+Jalankan: python -m benchmarks.bench_transform --sizes 1000 100000 10000000
+"""
+import argparse
+import logging
+import os
+import time
+
+import pandas as pd
+
+from benchmarks import synthetic
+from benchmarks.results import record
+from utils.transform import clean_columns
+
+RAW_CSV = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'products_raw.csv')
+
+
+def make_raw_frame(rows, seed=0):
+    sample = pd.read_csv(RAW_CSV, dtype=str)
+    return sample.sample(n=rows, replace=True, random_state=seed).reset_index(drop=True)
+
+
+def time_engine(raw, engine):
+    df = raw.copy()
+    start = time.perf_counter()
+    clean_columns(df, engine)
+    return time.perf_counter() - start, df
+
+
+def run(sizes, scalar_max_rows=None, source='sample', anomaly_rate=0.1):
+    results = []
+    for rows in sizes:
+        raw = make_raw_frame(rows) if source == 'sample' else synthetic.make_raw_frame(rows, anomaly_rate)
+        vectorized_time, vectorized = time_engine(raw, 'vectorized')
+        row = {'rows': rows, 'source': source, 'vectorized_s': round(vectorized_time, 3)}
+        if scalar_max_rows is None or rows <= scalar_max_rows:
+            scalar_time, scalar = time_engine(raw, 'scalar')
+            row['scalar_s'] = round(scalar_time, 3)
+            row['speedup'] = round(scalar_time / vectorized_time, 1)
+            row['identical'] = vectorized.equals(scalar)
+        results.append(row)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 100000, 10000000])
+    parser.add_argument('--scalar-max-rows', type=int, default=None,
+                        help='Lewati engine scalar untuk ukuran di atas nilai ini')
+    parser.add_argument('--source', choices=['sample', 'synthetic'], default='sample')
+    parser.add_argument('--anomaly-rate', type=float, default=0.1)
+    parser.add_argument('--no-record', action='store_true', help='Jangan simpan hasil ke benchmarks/results')
+    args = parser.parse_args()
+
+    logging.getLogger().setLevel(logging.WARNING)
+    results = run(args.sizes, args.scalar_max_rows, args.source, args.anomaly_rate)
+    for row in results:
+        print(row)
+    if not args.no_record:
+        record('transform', results, vars(args))
+
+
+if __name__ == '__main__':
+    main()
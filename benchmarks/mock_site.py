@@ -0,0 +1,66 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import random
+import threading
+import time
+import re
+
+from benchmarks.synthetic import render_page
+
+# Server HTTP lokal yang meniru situs katalog dengan latensi buatan per request.
+# latency_jitter menambah latensi acak 0..jitter detik; anomaly_rate meneruskan anomali katalog sintetis.
+class MockSite:
+    def __init__(self, pages=50, latency=0.05, products_per_page=20, latency_jitter=0.0, anomaly_rate=0.0, seed=0):
+        self.pages = pages
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.products_per_page = products_per_page
+        self.anomaly_rate = anomaly_rate
+        self.seed = seed
+        self.request_count = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address
+        return f"http://{host}:{port}"
+
+    def _make_handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                with site._lock:
+                    site.request_count += 1
+                time.sleep(site.latency + random.uniform(0, site.latency_jitter))
+                # Skema /pageN (fashion-studio) atau /catalog?page=N (untuk sumber dengan url_template)
+                match = re.fullmatch(r'/page(\d+)|/catalog\?page=(\d+)', self.path)
+                page = int(match.group(1) or match.group(2)) if match else 1
+                if self.path not in ('/', '') and not match or page > site.pages:
+                    self.send_response(404)
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = render_page(page, site.products_per_page, site.pages, site.anomaly_rate, site.seed)
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/html; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,99 @@
+"""Penyimpanan hasil benchmark per commit dan perbandingan antar run.
+
+Setiap benchmark menambahkan hasilnya ke benchmarks/results/<nama>.jsonl bersama commit git,
+waktu run dan versi Python. Perbandingan run terakhir dengan run sebelumnya (commit berbeda):
+
+Jalankan: python -m benchmarks.results --metric seconds
+"""
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+from datetime import datetime
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+
+# Fungsi untuk mengambil commit git saat ini (ditandai '-dirty' jika ada perubahan belum di-commit)
+def current_commit():
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=root, capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(['git', 'status', '--porcelain', '--untracked-files=no'], cwd=root, capture_output=True, text=True).stdout.strip()
+        return f"{commit}-dirty" if dirty else commit
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+
+# Fungsi untuk menyimpan satu run benchmark (list of dict hasil) ke file JSONL
+def record(benchmark, rows, params=None, results_dir=RESULTS_DIR):
+    os.makedirs(results_dir, exist_ok=True)
+    entry = {
+        'benchmark': benchmark,
+        'commit': current_commit(),
+        'recorded_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        'python': platform.python_version(),
+        'params': params or {},
+        'results': rows,
+    }
+    path = os.path.join(results_dir, f"{benchmark}.jsonl")
+    with open(path, 'a') as f:
+        f.write(json.dumps(entry) + '\n')
+    return path
+
+
+# Fungsi untuk membaca semua run satu benchmark (urut waktu)
+def load_runs(benchmark, results_dir=RESULTS_DIR):
+    path = os.path.join(results_dir, f"{benchmark}.jsonl")
+    if not os.path.exists(path):
+        return []
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+# Fungsi untuk membandingkan run terakhir dengan run terakhir dari commit sebelumnya.
+# Baris hasil dicocokkan berdasarkan field non-metrik (mis. rows, workers, engine).
+def compare(benchmark, metric='seconds', results_dir=RESULTS_DIR):
+    runs = load_runs(benchmark, results_dir)
+    if not runs:
+        return []
+    latest = runs[-1]
+    previous = next((run for run in reversed(runs[:-1]) if run['commit'] != latest['commit']), None)
+    if previous is None:
+        return []
+
+    def key(row):
+        return tuple(sorted((k, v) for k, v in row.items() if not isinstance(v, float) and k != metric))
+
+    baseline = {key(row): row for row in previous['results'] if metric in row}
+    comparison = []
+    for row in latest['results']:
+        before = baseline.get(key(row))
+        if before is None or metric not in row or not before[metric]:
+            continue
+        comparison.append({
+            'config': dict(key(row)),
+            'previous': before[metric],
+            'latest': row[metric],
+            'change_pct': round((row[metric] - before[metric]) / before[metric] * 100, 1),
+            'commits': f"{previous['commit']} -> {latest['commit']}",
+        })
+    return comparison
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--metric', default='seconds')
+    parser.add_argument('--results-dir', default=RESULTS_DIR)
+    args = parser.parse_args()
+
+    for path in sorted(glob.glob(os.path.join(args.results_dir, '*.jsonl'))):
+        benchmark = os.path.splitext(os.path.basename(path))[0]
+        for row in compare(benchmark, args.metric, args.results_dir):
+            print(benchmark, row)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""Generator katalog sintetis bergaya fashion-studio: halaman HTML dan record mentah pada skala berapa pun.
+
+Hasilnya deterministik untuk seed yang sama. Dengan anomaly_rate > 0, sebagian produk dibuat
+menjadi anomali yang sama seperti situs aslinya: "Unknown Product", "Invalid Rating" dan
+"Price Unavailable" (dengan "Not Rated").
+"""
+import random
+
+import pandas as pd
+
+CATEGORIES = ['T-shirt', 'Pants', 'Jacket', 'Hoodie', 'Outerwear', 'Shoes', 'Dress', 'Crewneck', 'Shirt', 'Sweater']
+SIZES = ['S', 'M', 'L', 'XL', 'XXL']
+GENDERS = ['Men', 'Women', 'Unisex']
+ANOMALIES = ('unknown_product', 'invalid_rating', 'price_unavailable')
+
+
+# Fungsi untuk membuat field mentah satu produk (teks persis seperti hasil parser)
+def make_product(number, rng, anomaly_rate=0.0):
+    product = {
+        'Title': f"{rng.choice(CATEGORIES)} {number}",
+        'Price': f"${rng.uniform(10, 500):.2f}",
+        'Rating': f"Rating: ⭐ {rng.randint(10, 50) / 10:.1f} / 5",
+        'Colors': f"{rng.randint(1, 8)} Colors",
+        'Size': f"Size: {rng.choice(SIZES)}",
+        'Gender': f"Gender: {rng.choice(GENDERS)}",
+    }
+    if anomaly_rate and rng.random() < anomaly_rate:
+        anomaly = rng.choice(ANOMALIES)
+        if anomaly == 'unknown_product':
+            product.update(Title='Unknown Product', Price='$100.00', Rating='Rating: ⭐ Invalid Rating / 5',
+                           Colors='5 Colors', Size='Size: M', Gender='Gender: Men')
+        elif anomaly == 'invalid_rating':
+            product['Rating'] = 'Rating: ⭐ Invalid Rating / 5'
+        else:
+            product.update(Price='Price Unavailable', Rating='Rating: ⭐ Not Rated')
+    return product
+
+
+# Fungsi untuk membuat HTML satu kartu produk (span.price biasa, p.price untuk "Price Unavailable")
+def render_card(product):
+    if product['Price'] == 'Price Unavailable':
+        price = f"<p class=\"price\">{product['Price']}</p>"
+    else:
+        price = f"<div class=\"price-container\"><span class=\"price\">{product['Price']}</span></div>"
+    return f"""
+        <div class="collection-card">
+            <div style="position: relative;">
+                <img src="https://picsum.photos/280/350" class="collection-image" alt="{product['Title']}">
+            </div>
+            <div class="product-details">
+                <h3 class="product-title">{product['Title']}</h3>
+                {price}
+                <p style="font-size: 14px; color: #777;">{product['Rating']}</p>
+                <p style="font-size: 14px; color: #777;">{product['Colors']}</p>
+                <p style="font-size: 14px; color: #777;">{product['Size']}</p>
+                <p style="font-size: 14px; color: #777;">{product['Gender']}</p>
+            </div>
+        </div>"""
+
+
+# Fungsi untuk membuat produk pada satu halaman (deterministik per seed dan nomor halaman)
+def page_products(page, products_per_page=20, anomaly_rate=0.0, seed=0):
+    rng = random.Random(f"{seed}-{page}")
+    first = (page - 1) * products_per_page + 1
+    return [make_product(number, rng, anomaly_rate) for number in range(first, first + products_per_page)]
+
+
+# Fungsi untuk membuat HTML satu halaman katalog, termasuk pagination "Page N of M" jika total_pages diisi
+def render_page(page, products_per_page=20, total_pages=None, anomaly_rate=0.0, seed=0):
+    cards = ''.join(render_card(product) for product in page_products(page, products_per_page, anomaly_rate, seed))
+    pagination = ''
+    if total_pages:
+        pagination = f"<ul class='pagination'><li class='page-item current'><span class='page-link'>Page {page} of {total_pages}</span></li></ul>"
+    return f"<html><body><div class='collection-grid'>{cards}</div>{pagination}</body></html>".encode('utf-8')
+
+
+# Generator record mentah (dict seperti hasil scraping) sebanyak rows baris
+def iter_raw_records(rows, anomaly_rate=0.1, seed=0, products_per_page=20, timestamp='2025-12-20 18:01:02'):
+    page = 1
+    produced = 0
+    while produced < rows:
+        for product in page_products(page, products_per_page, anomaly_rate, seed)[:rows - produced]:
+            yield dict(product, timestamp=timestamp)
+            produced += 1
+        page += 1
+
+
+# Fungsi untuk membuat DataFrame mentah (kolom string) sebanyak rows baris
+def make_raw_frame(rows, anomaly_rate=0.1, seed=0):
+    return pd.DataFrame(list(iter_raw_records(rows, anomaly_rate, seed)))
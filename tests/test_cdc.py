@@ -0,0 +1,76 @@
+import unittest
+import os
+import tempfile
+import pandas as pd
+from utils.cdc import FingerprintIndex
+from utils.transform import compact_dtypes
+
+class TestCdc(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'cdc.sqlite')
+        self.df = pd.DataFrame({
+            'Title': ['T-shirt 2', 'Jeans Regular', 'Hoodie 5'],
+            'Price': [1634400.0, 500000.0, 250000.0],
+            'Rating': [3.9, 4.5, 4.0],
+            'Colors': [3, 2, 1],
+            'Size': ['M', 'L', 'S'],
+            'Gender': ['Women', 'Men', 'Unisex'],
+            'timestamp': ['2025-12-20 18:01:02'] * 3,
+        })
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # Test run pertama: semua produk adalah insert; setelah commit, run yang sama tidak menghasilkan delta
+    def test_first_run_inserts_everything(self):
+        index = FingerprintIndex(self.path)
+        changes = index.diff(self.df)
+        self.assertEqual(changes.summary(), {'inserts': 3, 'updates': 0, 'deletes': 0, 'unchanged': 0, 'churn': 1.0})
+        index.commit(changes)
+        index.close()
+
+        # Index persisten: dibuka ulang, timestamp baru dan skema compact tidak dianggap perubahan
+        index = FingerprintIndex(self.path)
+        rescraped = compact_dtypes(self.df.assign(timestamp='2025-12-21 08:00:00'))
+        self.assertEqual(len(index), 3)
+        self.assertEqual(len(index.diff(rescraped)), 0)
+        index.close()
+
+    # Test katalog kosong pada sinkronisasi penuh: semua produk tersimpan menjadi delete
+    def test_empty_catalog_deletes_everything(self):
+        index = FingerprintIndex(self.path)
+        index.commit(index.diff(self.df))
+        changes = index.diff(self.df.iloc[:0])
+        self.assertEqual((len(changes.inserts), len(changes.updates), len(changes.deletes)), (0, 0, 3))
+        index.close()
+
+    # Test delta insert/update/delete antar run
+    def test_diff_detects_changes(self):
+        index = FingerprintIndex(self.path)
+        index.commit(index.diff(self.df))
+
+        current = self.df.iloc[1:].copy()
+        current.loc[1, 'Price'] = 450000.0
+        current = pd.concat([current, self.df.iloc[:1].assign(Title='Dress 9')], ignore_index=True)
+        changes = index.diff(current)
+
+        self.assertEqual(changes.inserts['Title'].tolist(), ['Dress 9'])
+        self.assertEqual(changes.updates['Title'].tolist(), ['Jeans Regular'])
+        self.assertEqual(changes.updates['Price'].tolist(), [450000.0])
+        self.assertEqual(changes.deletes.to_dict('records'), [{'Title': 'T-shirt 2', 'Size': 'M', 'Gender': 'Women'}])
+        self.assertEqual(changes.unchanged, 1)
+        self.assertEqual(changes.to_frame()['change'].tolist(), ['insert', 'update', 'delete'])
+
+        # Tanpa commit (load gagal) delta yang sama muncul lagi
+        self.assertEqual(len(index.diff(current)), 3)
+        index.commit(changes)
+        self.assertEqual(len(index.diff(current)), 0)
+
+        # full=False (batch parsial) tidak menghapus produk yang tidak ada di batch
+        self.assertEqual(len(index.diff(current.iloc[:1], full=False)), 0)
+        index.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+import os
+import subprocess
+import sys
+import tempfile
+import pandas as pd
+import main
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Fungsi untuk menjalankan main.py di proses baru dengan -X importtime, mengembalikan paket tingkat atas yang diimpor
+def run_cli(args, cwd):
+    proc = subprocess.run([sys.executable, '-X', 'importtime', os.path.join(ROOT, 'main.py'), *args],
+                          cwd=cwd, capture_output=True, text=True)
+    packages = {line.split('|')[-1].strip().split('.')[0] for line in proc.stderr.splitlines() if line.startswith('import time:')}
+    return proc, packages
+
+class TestCli(unittest.TestCase):
+
+    # Test --help tidak mengimpor pandas maupun library sink
+    def test_help_is_lightweight(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            proc, packages = run_cli(['--help'], tmp)
+        self.assertEqual(proc.returncode, 0)
+        self.assertIn('transform', proc.stdout)
+        self.assertFalse(packages & {'pandas', 'requests', 'gspread', 'oauth2client', 'sqlalchemy'})
+
+    # Test transform lalu load CSV saja: hasil sama dengan process_dataframe, tanpa gspread/SQLAlchemy/requests
+    def test_transform_and_csv_load(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            proc, _ = run_cli(['--report', '', 'transform', '--input', os.path.join(ROOT, 'products_raw.csv'), '--output', 'clean.csv'], tmp)
+            self.assertEqual(proc.returncode, 0, proc.stderr[-500:])
+            proc, packages = run_cli(['--report', '', 'load', '--input', 'clean.csv', '--sinks', 'csv'], tmp)
+            self.assertEqual(proc.returncode, 0, proc.stderr[-500:])
+            loaded = pd.read_csv(os.path.join(tmp, 'products.csv'))
+            clean = pd.read_csv(os.path.join(tmp, 'clean.csv'))
+
+        self.assertFalse(packages & {'requests', 'bs4', 'gspread', 'oauth2client', 'sqlalchemy'})
+        self.assertTrue(loaded.equals(clean))
+        self.assertGreater(len(loaded), 0)
+        self.assertTrue((loaded['Price'] > 0).all())
+
+    # Test transform menulis per chunk: Parquet dan CSV berisi baris yang sama; input tanpa baris valid gagal (exit 1)
+    def test_transform_streams_chunks(self):
+        raw = os.path.join(ROOT, 'products_raw.csv')
+        with tempfile.TemporaryDirectory() as tmp, patch('utils.metrics.metrics.write_report'):
+            csv_path, parquet_path = os.path.join(tmp, 'clean.csv'), os.path.join(tmp, 'clean.parquet')
+            self.assertEqual(main.cli(['transform', '--input', raw, '--output', csv_path, '--chunk-size', '100']), 0)
+            self.assertEqual(main.cli(['transform', '--input', raw, '--output', parquet_path, '--chunk-size', '100']), 0)
+            from_csv = pd.read_csv(csv_path)
+            from_parquet = pd.read_parquet(parquet_path)
+
+            empty = os.path.join(tmp, 'empty.csv')
+            pd.read_csv(raw, nrows=0).to_csv(empty, index=False)
+            self.assertEqual(main.cli(['transform', '--input', empty, '--output', os.path.join(tmp, 'none.csv')]), 1)
+
+        self.assertGreater(len(from_csv), 100)
+        self.assertEqual(from_parquet['Title'].astype(str).tolist(), from_csv['Title'].tolist())
+
+    # Test mode streaming: exit 1 jika stage extract error atau batch gagal dimuat, exit 0 jika semua batch masuk
+    def test_streaming_exit_code(self):
+        def report(errors=(), failed=0, rows=10):
+            return {'rows_scraped': rows, 'errors': list(errors), 'failed_batches': {'csv': failed}}
+
+        with tempfile.TemporaryDirectory() as tmp, patch('utils.metrics.metrics.write_report'), \
+             patch('main.HTTP_CACHE_PATH', os.path.join(tmp, 'cache.sqlite')), \
+             patch('utils.pipeline.run_streaming_pipeline') as mock_pipeline:
+            mock_pipeline.return_value = report(errors=['extract: Connection refused'])
+            self.assertEqual(main.cli(['run', '--mode', 'streaming', '--sinks', 'csv']), 1)
+            mock_pipeline.return_value = report(failed=2)
+            self.assertEqual(main.cli(['run', '--mode', 'streaming', '--sinks', 'csv']), 1)
+            mock_pipeline.return_value = report(rows=0)
+            self.assertEqual(main.cli(['run', '--mode', 'streaming', '--sinks', 'csv']), 1)
+            mock_pipeline.return_value = report()
+            self.assertEqual(main.cli(['run', '--mode', 'streaming', '--sinks', 'csv']), 0)
+
+    # Test cache HTTP (SQLite) tetap ditutup saat crawl gagal, pada mode batch maupun streaming
+    def test_http_cache_closed_on_failure(self):
+        with patch('utils.http_cache.HttpCache') as mock_cache, \
+             patch('utils.scheduler.scrape_catalogs', side_effect=RuntimeError("Network Down")), \
+             patch('utils.pipeline.run_streaming_pipeline', side_effect=RuntimeError("Network Down")):
+            with self.assertRaises(RuntimeError):
+                main.extract()
+            self.assertEqual(mock_cache.return_value.close.call_count, 1)
+            with self.assertRaises(RuntimeError):
+                main.main_streaming(())
+            self.assertEqual(mock_cache.return_value.close.call_count, 2)
+
+    # Test tanpa subcommand menjalankan pipeline batch dengan semua sink; --sinks membatasi target load
+    def test_default_and_sink_selection(self):
+        with patch('main.main') as mock_main, patch('main.main_streaming') as mock_streaming, patch('utils.metrics.metrics.write_report'):
+            main.cli([])
+            main.cli(['run', '--mode', 'streaming', '--sinks', 'csv'])
+        mock_main.assert_called_once_with(main.SINKS, run_id=None)
+        mock_streaming.assert_called_once_with(['csv'])
+
+        with self.assertRaises(SystemExit), patch('sys.stderr'):
+            main.build_parser().parse_args(['load', '--sinks', 'ftp'])
+
+if __name__ == '__main__':
+    unittest.main()
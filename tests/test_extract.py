@@ -1,7 +1,14 @@
 import unittest
 from unittest.mock import patch, Mock
 import requests
-from utils.extract import get_page_content, scrape_fashion_data
+import os
+import queue
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from utils.extract import get_page_content, scrape_fashion_data, build_page_url, RateLimiter, HostLimiter, discover_last_page, CrawlCheckpoint
+from utils.extract import iter_fashion_data, FetchPolicy, CircuitBreaker, PageOutcomes, _produce_pages, _iter_parsed_pipeline
 
 class TestExtract(unittest.TestCase):
 
@@ -164,5 +171,419 @@ class TestExtract(unittest.TestCase):
             
             self.assertTrue(any("Error parsing product item" in m for m in log.output))
 
+    # Test mode konkuren menjaga urutan halaman dan hasil yang sama dengan mode sekuensial
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_concurrent_preserves_order(self, mock_content_func, mock_session_cls):
+        """Halaman diambil paralel, tetapi record tetap berurutan per halaman."""
+        def fake_content(session, url):
+            page = int(url.rsplit('page', 1)[1]) if '/page' in url else 1
+            html = "<html><body>" + self._create_dummy_product(f"Item {page}-1") + self._create_dummy_product(f"Item {page}-2") + "</body></html>"
+            return html.encode('utf-8')
+        mock_content_func.side_effect = fake_content
+
+        sequential = scrape_fashion_data("http://dummy.com", end_page=6, limit=100)
+        concurrent = scrape_fashion_data("http://dummy.com", end_page=6, limit=100, workers=4, per_host_limit=2, rate_limit=1000)
+
+        titles = [item['Title'] for item in concurrent]
+        self.assertEqual(titles, [item['Title'] for item in sequential])
+        self.assertEqual(titles[:3], ["Item 1-1", "Item 1-2", "Item 2-1"])
+        self.assertEqual(len(titles), 12)
+
+    # Test mode konkuren tetap menghormati limit
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_concurrent_limit(self, mock_content_func, mock_session_cls):
+        html = "<html><body>" + self._create_dummy_product("A") + self._create_dummy_product("B") + "</body></html>"
+        mock_content_func.return_value = html.encode('utf-8')
+
+        data = scrape_fashion_data("http://dummy.com", end_page=50, limit=3, workers=4)
+        self.assertEqual([item['Title'] for item in data], ["A", "B", "A"])
+        # Jendela request terbatas: tidak semua 50 halaman diambil
+        self.assertLess(mock_content_func.call_count, 50)
+
+    # Test limit tercapai tidak memicu request halaman berikutnya (mode sekuensial)
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_limit_stops_fetching(self, mock_content_func, mock_session_cls):
+        html = "<html><body>" + self._create_dummy_product("A") + "</body></html>"
+        mock_content_func.return_value = html.encode('utf-8')
+
+        data = scrape_fashion_data("http://dummy.com", end_page=10, limit=2)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(mock_content_func.call_count, 2)
+
+    # Test generator scraping menghasilkan produk per halaman (tanpa menunggu crawl selesai)
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_iter_fashion_data_yields_per_page(self, mock_content_func, mock_session_cls):
+        html = "<html><body>" + self._create_dummy_product("A") + self._create_dummy_product("B") + "</body></html>"
+        mock_content_func.return_value = html.encode('utf-8')
+
+        pages = iter_fashion_data("http://dummy.com", end_page=10, limit=5)
+        self.assertEqual([item['Title'] for item in next(pages)], ["A", "B"])
+        self.assertEqual(mock_content_func.call_count, 1)
+        self.assertEqual([len(items) for items in pages], [2, 1])
+
+    # Test pembentukan URL halaman
+    def test_build_page_url(self):
+        self.assertEqual(build_page_url("http://dummy.com", 1), "http://dummy.com")
+        self.assertEqual(build_page_url("http://dummy.com", 3), "http://dummy.com/page3")
+
+    # Test rate limiter memberi jeda antar request
+    @patch('utils.extract.time.sleep')
+    def test_rate_limiter_waits(self, mock_sleep):
+        limiter = RateLimiter(rate=10)
+        limiter.wait()
+        limiter.wait()
+        mock_sleep.assert_called_once()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 0.1, places=2)
+
+        RateLimiter(rate=None).wait()
+        self.assertEqual(mock_sleep.call_count, 1)
+
+    # Test batas koneksi per host
+    def test_host_limiter(self):
+        limiter = HostLimiter(max_per_host=1)
+        semaphore = limiter.acquire("http://a.com/page2")
+        self.assertFalse(semaphore.acquire(blocking=False))
+        semaphore.release()
+        self.assertIsNone(HostLimiter(None).acquire("http://a.com"))
+
+    # Test pipeline fetch/parse dengan process pool (urutan dipertahankan)
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_parse_pipeline_ordered(self, mock_content_func, mock_session_cls):
+        def fake_content(session, url):
+            page = int(url.rsplit('page', 1)[1]) if '/page' in url else 1
+            return f"<html><body>{self._create_dummy_product(f'Item {page}')}</body></html>".encode('utf-8')
+        mock_content_func.side_effect = fake_content
+
+        data = scrape_fashion_data("http://dummy.com", end_page=8, limit=100, workers=2, parse_workers=2, queue_size=2)
+        self.assertEqual([item['Title'] for item in data], [f"Item {i}" for i in range(1, 9)])
+
+    # Test pipeline tanpa menjaga urutan tetap mengembalikan record yang sama dan menghormati limit
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_parse_pipeline_unordered(self, mock_content_func, mock_session_cls):
+        def fake_content(session, url):
+            page = int(url.rsplit('page', 1)[1]) if '/page' in url else 1
+            return None if page == 3 else f"<html><body>{self._create_dummy_product(f'Item {page}')}</body></html>".encode('utf-8')
+        mock_content_func.side_effect = fake_content
+
+        data = scrape_fashion_data("http://dummy.com", end_page=6, limit=100, parse_workers=2, ordered=False)
+        self.assertEqual(sorted(item['Title'] for item in data), ["Item 1", "Item 2", "Item 4", "Item 5", "Item 6"])
+
+        limited = scrape_fashion_data("http://dummy.com", end_page=6, limit=2, parse_workers=2, ordered=False)
+        self.assertEqual(len(limited), 2)
+
+    # Test error fetch pada pipeline ditangani sebagai critical error
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_parse_pipeline_failure(self, mock_content_func, mock_session_cls):
+        mock_content_func.side_effect = Exception("Producer Boom")
+        with self.assertLogs(level='ERROR') as log:
+            data = scrape_fashion_data("http://dummy.com", end_page=3, parse_workers=1)
+        self.assertEqual(data, [])
+        self.assertTrue(any("Critical error" in m for m in log.output))
+
+    # Test pipeline ditutup lebih awal: producer berhenti saat stop_event diset dan antrean dikosongkan sampai producer selesai
+    def test_parse_pipeline_closed_early(self):
+        stop_event = threading.Event()
+        stop_event.set()
+        page_queue = queue.Queue()
+        _produce_pages(((page, b'') for page in range(1, 4)), page_queue, stop_event)
+        # Hanya penanda akhir antrean, tidak ada halaman yang dikirim
+        self.assertEqual(page_queue.qsize(), 1)
+
+        class SlowPages:
+            def __init__(self):
+                self.pages = iter(range(1, 10))
+                self.closed = False
+
+            def __iter__(self):
+                return self
+
+            def __next__(self):
+                return next(self.pages), b''
+
+            def close(self):
+                time.sleep(0.3)
+                self.closed = True
+
+        pages = SlowPages()
+        pipeline = _iter_parsed_pipeline(pages, 1, 1, True, 'bs4')
+        self.assertEqual(next(pipeline), (1, []))
+        pipeline.close()
+        self.assertTrue(pages.closed)
+
+    # Test pemilihan backend parser lewat parameter
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_with_lxml_parser(self, mock_content_func, mock_session_cls):
+        html = f"<html><body>{self._create_dummy_product('Item lxml')}</body></html>"
+        mock_content_func.return_value = html.encode('utf-8')
+
+        data = scrape_fashion_data("http://dummy.com", end_page=1, parser='lxml')
+        self.assertEqual(data[0]['Title'], "Item lxml")
+        self.assertEqual(data[0]['Colors'], "1 Colors")
+
+    # Test nama backend parser yang tidak dikenal dicatat sebagai critical error
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_unknown_parser(self, mock_content_func, mock_session_cls):
+        with self.assertLogs(level='ERROR'):
+            data = scrape_fashion_data("http://dummy.com", end_page=1, parser='unknown')
+        self.assertEqual(data, [])
+        mock_content_func.assert_not_called()
+
+    # Helper konten halaman dengan markup pagination "Page N of total"
+    def _page_with_pagination(self, page, total):
+        return (f"<html><body>{self._create_dummy_product(f'Item {page}')}"
+                f"<ul class='pagination'><li class='page-item current'><span class='page-link'>Page {page} of {total}</span></li></ul>"
+                "</body></html>").encode('utf-8')
+
+    # Test membaca jumlah halaman dari pagination
+    def test_discover_last_page(self):
+        self.assertEqual(discover_last_page(self._page_with_pagination(1, 50)), 50)
+        self.assertIsNone(discover_last_page(b"<html></html>"))
+        self.assertIsNone(discover_last_page(None))
+
+    # Test crawl berhenti pada halaman terakhir yang ditemukan dari pagination
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_stops_at_discovered_last_page(self, mock_content_func, mock_session_cls):
+        def fake_content(session, url):
+            page = int(url.rsplit('page', 1)[1]) if '/page' in url else 1
+            return self._page_with_pagination(page, 3)
+        mock_content_func.side_effect = fake_content
+
+        data = scrape_fashion_data("http://dummy.com", end_page=50)
+        self.assertEqual([item['Title'] for item in data], ["Item 1", "Item 2", "Item 3"])
+        self.assertEqual(mock_content_func.call_count, 3)
+
+        data = scrape_fashion_data("http://dummy.com", end_page=50, workers=4)
+        self.assertEqual(len(data), 3)
+
+    # Test crawl berhenti setelah N halaman kosong berturut-turut; halaman gagal tidak menambah maupun mereset deret
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_stops_after_empty_pages(self, mock_content_func, mock_session_cls):
+        html = f"<html><body>{self._create_dummy_product('Item')}</body></html>".encode('utf-8')
+        mock_content_func.side_effect = [html, None, html, b"<html></html>", None, b"<html></html>"] + [html] * 10
+
+        data = scrape_fashion_data("http://dummy.com", end_page=15, max_empty_pages=2)
+        self.assertEqual(len(data), 2)
+        self.assertEqual(mock_content_func.call_count, 6)
+
+    # Test halaman gagal berturut-turut tidak dianggap akhir katalog: crawl berlanjut dan
+    # halaman gagal tercatat di outcomes
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_failed_pages_do_not_end_crawl(self, mock_content_func, mock_session_cls):
+        def fake_content(session, url):
+            page = int(url.rsplit('page', 1)[1]) if '/page' in url else 1
+            if page in (3, 4, 5):
+                return None
+            return f"<html><body>{self._create_dummy_product(f'Item {page}')}</body></html>".encode('utf-8')
+        mock_content_func.side_effect = fake_content
+
+        with tempfile.TemporaryDirectory() as tmp:
+            outcomes = os.path.join(tmp, 'outcomes.json')
+            data = scrape_fashion_data("http://dummy.com", end_page=10, max_empty_pages=3,
+                                       checkpoint=os.path.join(tmp, 'crawl.json'), outcomes=outcomes)
+            self.assertEqual([item['Title'] for item in data], [f"Item {page}" for page in (1, 2, 6, 7, 8, 9, 10)])
+            self.assertEqual(mock_content_func.call_count, 10)
+            self.assertEqual(PageOutcomes(outcomes).load("http://dummy.com").failed_pages(), [3, 4, 5])
+
+    # Test checkpoint dipertahankan jika akhir katalog tidak pasti: ada halaman gagal di antara
+    # halaman kosong, atau circuit breaker host masih open
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_keeps_checkpoint_when_end_uncertain(self, mock_content_func, mock_session_cls):
+        html = f"<html><body>{self._create_dummy_product('Item')}</body></html>".encode('utf-8')
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'crawl.json')
+            mock_content_func.side_effect = [html, b"<html></html>", None, b"<html></html>"]
+            scrape_fashion_data("http://dummy.com", end_page=10, max_empty_pages=2, checkpoint=path)
+            self.assertEqual(mock_content_func.call_count, 4)
+            self.assertTrue(os.path.exists(path))
+            os.remove(path)
+
+            policy = FetchPolicy(failure_threshold=1)
+            policy.breaker.record_failure("http://dummy.com")
+            mock_content_func.side_effect = [html, None, None]
+            scrape_fashion_data("http://dummy.com", end_page=3, checkpoint=path, fetch_policy=policy)
+            self.assertTrue(os.path.exists(path))
+
+    # Test crawl dilanjutkan dari checkpoint setelah terhenti
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_resumes_from_checkpoint(self, mock_content_func, mock_session_cls):
+        def fake_content(session, url):
+            page = int(url.rsplit('page', 1)[1]) if '/page' in url else 1
+            if page == 3 and crash['enabled']:
+                raise Exception("Crash")
+            return f"<html><body>{self._create_dummy_product(f'Item {page}')}</body></html>".encode('utf-8')
+        crash = {'enabled': True}
+        mock_content_func.side_effect = fake_content
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'crawl.json')
+            first = scrape_fashion_data("http://dummy.com", end_page=4, checkpoint=path)
+            self.assertEqual(len(first), 2)
+            self.assertTrue(os.path.exists(path))
+
+            crash['enabled'] = False
+            mock_content_func.reset_mock()
+            resumed = scrape_fashion_data("http://dummy.com", end_page=4, checkpoint=path)
+            self.assertEqual([item['Title'] for item in resumed], ["Item 1", "Item 2", "Item 3", "Item 4"])
+            self.assertEqual(mock_content_func.call_count, 2)
+            # Crawl selesai: checkpoint dihapus
+            self.assertFalse(os.path.exists(path))
+
+    # Test watermark checkpoint hanya maju untuk halaman yang berurutan
+    def test_checkpoint_out_of_order_pages(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = CrawlCheckpoint(os.path.join(tmp, 'crawl.json'))
+            checkpoint.load("http://dummy.com")
+            checkpoint.mark_done(2, [{'Title': 'B'}], 10)
+            self.assertEqual(checkpoint.last_page, 0)
+            checkpoint.mark_done(1, [{'Title': 'A'}], 10)
+            self.assertEqual(checkpoint.last_page, 2)
+
+            reloaded = CrawlCheckpoint(checkpoint.path)
+            self.assertEqual([item['Title'] for item in reloaded.load("http://dummy.com")], ['B', 'A'])
+            self.assertTrue(reloaded.is_done(2))
+            self.assertEqual(reloaded.end_page, 10)
+
+            # Checkpoint milik base URL lain diabaikan
+            other = CrawlCheckpoint(checkpoint.path)
+            with self.assertLogs(level='WARNING'):
+                self.assertEqual(other.load("http://other.com"), [])
+
+    # Helper response HTTP dengan status tertentu
+    def _response(self, status, content=b"<html></html>", headers=None):
+        response = Mock(status_code=status, content=content, headers=headers or {})
+        if status >= 400:
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(f"{status} Error", response=response)
+        return response
+
+    # Test Retry-After berupa tanggal HTTP (dibatasi max_backoff) dan format tidak dikenal kembali ke full jitter
+    @patch('utils.extract.random.uniform', return_value=0.25)
+    def test_fetch_policy_delay_retry_after_date(self, mock_uniform):
+        policy = FetchPolicy(backoff=0.5, max_backoff=30.0)
+        retry_after = lambda value: self._response(503, headers={'Retry-After': value})
+
+        self.assertAlmostEqual(policy.delay(0, retry_after(formatdate(time.time() + 10, usegmt=True))), 10, delta=2)
+        self.assertEqual(policy.delay(0, retry_after(formatdate(time.time() + 3600, usegmt=True))), 30.0)
+        self.assertEqual(policy.delay(0, retry_after(formatdate(time.time() - 60, usegmt=True))), 0.0)
+        mock_uniform.assert_not_called()
+
+        self.assertEqual(policy.delay(2, retry_after('later')), 0.25)
+        mock_uniform.assert_called_once_with(0, 2.0)
+
+    # Test retry pada 5xx sementara, dengan Retry-After dihormati
+    @patch('utils.extract.time.sleep')
+    def test_get_page_content_retries_transient_errors(self, mock_sleep):
+        mock_session = Mock()
+        mock_session.get.side_effect = [
+            self._response(503, headers={'Retry-After': '2'}),
+            requests.exceptions.ConnectionError("Reset"),
+            self._response(200, b"ok"),
+        ]
+        policy = FetchPolicy(retries=3, backoff=0.5)
+
+        self.assertEqual(get_page_content(mock_session, "http://test.com", policy=policy), b"ok")
+        self.assertEqual(mock_session.get.call_count, 3)
+        self.assertEqual(mock_sleep.call_args_list[0][0][0], 2.0)
+        self.assertLessEqual(mock_sleep.call_args_list[1][0][0], 1.0)
+        self.assertEqual(mock_session.get.call_args.kwargs['timeout'], policy.timeout)
+
+    # Test error permanen (404) tidak dicoba ulang, retry habis mengembalikan None
+    @patch('utils.extract.time.sleep')
+    def test_get_page_content_retry_limits(self, mock_sleep):
+        mock_session = Mock()
+        mock_session.get.return_value = self._response(404)
+        self.assertIsNone(get_page_content(mock_session, "http://test.com", policy=FetchPolicy(retries=3)))
+        self.assertEqual(mock_session.get.call_count, 1)
+
+        mock_session.get.reset_mock()
+        mock_session.get.return_value = self._response(500)
+        self.assertIsNone(get_page_content(mock_session, "http://test.com", policy=FetchPolicy(retries=2)))
+        self.assertEqual(mock_session.get.call_count, 3)
+
+    # Test circuit breaker membuka setelah kegagalan berturut-turut dan half-open setelah reset_timeout
+    @patch('utils.extract.time.sleep')
+    def test_circuit_breaker(self, mock_sleep):
+        mock_session = Mock()
+        mock_session.get.side_effect = requests.exceptions.Timeout("Slow")
+        policy = FetchPolicy(retries=5, failure_threshold=3, reset_timeout=60)
+
+        self.assertIsNone(get_page_content(mock_session, "http://slow.com/page2", policy=policy))
+        self.assertEqual(mock_session.get.call_count, 3)
+        self.assertTrue(policy.breaker.is_open("http://slow.com"))
+        self.assertIsNone(get_page_content(mock_session, "http://slow.com/page3", policy=policy))
+        self.assertEqual(mock_session.get.call_count, 3)
+        self.assertTrue(policy.breaker.allow("http://other.com"))
+
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+        breaker.record_failure("http://a.com")
+        self.assertTrue(breaker.allow("http://a.com"))
+        breaker.record_success("http://a.com")
+        self.assertFalse(breaker.is_open("http://a.com"))
+
+    # Test hasil per halaman dicatat dan run berikutnya hanya mengambil ulang halaman yang gagal
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_refetches_failed_pages(self, mock_content_func, mock_session_cls):
+        def fake_content(session, url):
+            page = int(url.rsplit('page', 1)[1]) if '/page' in url else 1
+            if page in failing:
+                return None
+            return f"<html><body>{self._create_dummy_product(f'Item {page}')}</body></html>".encode('utf-8')
+        failing = {2, 4}
+        mock_content_func.side_effect = fake_content
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'outcomes.json')
+            first = scrape_fashion_data("http://dummy.com", end_page=5, outcomes=path)
+            self.assertEqual(len(first), 3)
+            outcomes = PageOutcomes(path).load("http://dummy.com")
+            self.assertEqual(outcomes.failed_pages(), [2, 4])
+            self.assertEqual(outcomes.pages[1]['status'], 'ok')
+
+            failing.clear()
+            mock_content_func.reset_mock()
+            retried = scrape_fashion_data("http://dummy.com", pages=outcomes.failed_pages(), outcomes=path)
+            self.assertEqual([item['Title'] for item in retried], ["Item 2", "Item 4"])
+            self.assertEqual(mock_content_func.call_count, 2)
+            self.assertEqual(PageOutcomes(path).load("http://dummy.com").failed_pages(), [])
+
+    # Test checkpoint dipertahankan selama ada halaman gagal: run berikutnya hanya mengambil ulang halaman tersebut
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.get_page_content')
+    def test_scrape_checkpoint_refetches_only_failed_pages(self, mock_content_func, mock_session_cls):
+        def fake_content(session, url):
+            page = int(url.rsplit('page', 1)[1]) if '/page' in url else 1
+            if page in failing:
+                return None
+            return f"<html><body>{self._create_dummy_product(f'Item {page}')}</body></html>".encode('utf-8')
+        failing = {3}
+        mock_content_func.side_effect = fake_content
+
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'crawl.json')
+            first = scrape_fashion_data("http://dummy.com", end_page=5, checkpoint=path)
+            self.assertEqual(len(first), 4)
+            self.assertTrue(os.path.exists(path))
+
+            failing.clear()
+            mock_content_func.reset_mock()
+            retried = scrape_fashion_data("http://dummy.com", end_page=5, checkpoint=path)
+            self.assertEqual(mock_content_func.call_count, 1)
+            self.assertEqual(sorted(item['Title'] for item in retried), [f"Item {page}" for page in range(1, 6)])
+            self.assertFalse(os.path.exists(path))
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
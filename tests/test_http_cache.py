@@ -0,0 +1,195 @@
+import os
+import sqlite3
+import tempfile
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch, Mock
+from utils.http_cache import HttpCache, body_hash
+from utils.extract import get_page_content, scrape_fashion_data
+
+# Stand-in process pool parsing (thread) yang menghitung jumlah halaman yang dikirim untuk diparsing
+class CountingPool(ThreadPoolExecutor):
+    submitted = 0
+
+    def submit(self, *args, **kwargs):
+        CountingPool.submitted += 1
+        return super().submit(*args, **kwargs)
+
+class TestHttpCache(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.cache = HttpCache(os.path.join(self.tmp.name, 'cache', 'pages.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp.cleanup()
+
+    # Helper respons HTTP palsu
+    def _response(self, status_code=200, content=b"<html></html>", headers=None):
+        response = Mock()
+        response.status_code = status_code
+        response.content = content
+        response.headers = headers or {}
+        return response
+
+    # Test header conditional request dari entri yang tersimpan
+    def test_conditional_headers(self):
+        self.assertEqual(self.cache.conditional_headers("http://a.com"), {})
+        self.cache.store("http://a.com", {'ETag': '"v1"', 'Last-Modified': 'Mon, 01 Jan 2024 00:00:00 GMT'}, b"body")
+        self.assertEqual(self.cache.conditional_headers("http://a.com"), {
+            'If-None-Match': '"v1"',
+            'If-Modified-Since': 'Mon, 01 Jan 2024 00:00:00 GMT',
+        })
+        self.assertEqual(self.cache.stats['misses'], 1)
+
+    # Test jawaban 304 diambil dari cache
+    def test_get_page_content_revalidated(self):
+        session = Mock()
+        session.get.return_value = self._response(headers={'ETag': '"v1"'}, content=b"page-1")
+        self.assertEqual(get_page_content(session, "http://a.com", self.cache), b"page-1")
+
+        session.get.return_value = self._response(status_code=304, content=b"")
+        self.assertEqual(get_page_content(session, "http://a.com", self.cache), b"page-1")
+        self.assertEqual(session.get.call_args.kwargs['headers'], {'If-None-Match': '"v1"'})
+        self.assertEqual(self.cache.stats['hits'], 1)
+        self.assertEqual(self.cache.stats['revalidated'], 1)
+        self.assertEqual(self.cache.stats['bytes_saved'], len(b"page-1"))
+
+    # Test entri segar dipakai tanpa request
+    def test_fresh_body_skips_request(self):
+        cache = HttpCache(os.path.join(self.tmp.name, 'fresh.sqlite'), max_age=3600)
+        cache.store("http://a.com", {}, b"page-1")
+        session = Mock()
+        self.assertEqual(get_page_content(session, "http://a.com", cache), b"page-1")
+        session.get.assert_not_called()
+        cache.close()
+
+    # Test entri yang sudah melewati max_age tidak dipakai tanpa request
+    def test_stale_body_not_fresh(self):
+        cache = HttpCache(os.path.join(self.tmp.name, 'stale.sqlite'), max_age=60)
+        cache.store("http://a.com", {}, b"page-1")
+        with patch('utils.http_cache.time.time', return_value=time.time() + 120):
+            self.assertIsNone(cache.fresh_body("http://a.com"))
+        cache.close()
+
+    # Test 304 untuk URL yang tidak ada di cache (mis. sudah di-evict): halaman diminta ulang tanpa header conditional
+    def test_not_modified_without_cached_body(self):
+        session = Mock()
+        session.get.side_effect = [self._response(status_code=304, content=b""), self._response(content=b"page-1")]
+        self.assertEqual(get_page_content(session, "http://a.com", self.cache), b"page-1")
+        self.assertEqual(session.get.call_count, 2)
+
+    # Test file cache dari versi lama (tanpa kolom parser) dibuka tanpa error dan hasil parsing lamanya tidak dipakai
+    def test_upgrade_cache_without_parser_column(self):
+        path = os.path.join(self.tmp.name, 'old.sqlite')
+        conn = sqlite3.connect(path)
+        conn.execute("CREATE TABLE responses (url TEXT PRIMARY KEY, etag TEXT, last_modified TEXT, body_hash TEXT NOT NULL, "
+                     "body BLOB NOT NULL, records TEXT, size INTEGER NOT NULL, fetched_at REAL NOT NULL, last_access REAL NOT NULL)")
+        conn.execute("INSERT INTO responses VALUES ('http://a.com', NULL, NULL, ?, ?, '[{\"Title\": \"A\"}]', 10, 0, 0)",
+                     (body_hash(b"page-1"), b"page-1"))
+        conn.commit()
+        conn.close()
+
+        cache = HttpCache(path)
+        self.assertIsNone(cache.get_records("http://a.com", body_hash(b"page-1"), 'bs4@1'))
+        cache.store_records("http://a.com", body_hash(b"page-1"), [{'Title': 'B'}], 'bs4@1')
+        self.assertEqual(cache.get_records("http://a.com", body_hash(b"page-1"), 'bs4@1')[0]['Title'], 'B')
+        cache.close()
+
+    # Test hasil parsing dipakai ulang hanya jika hash body sama
+    def test_records_reused_for_same_body(self):
+        self.cache.store("http://a.com", {}, b"page-1")
+        self.cache.store_records("http://a.com", body_hash(b"page-1"), [{'Title': 'A', 'timestamp': 'old'}])
+
+        records = self.cache.get_records("http://a.com", body_hash(b"page-1"))
+        self.assertEqual(records[0]['Title'], 'A')
+        self.assertNotEqual(records[0]['timestamp'], 'old')
+        self.assertIsNone(self.cache.get_records("http://a.com", body_hash(b"page-2")))
+
+        # Body sama diunduh ulang (tanpa ETag): hasil parsing tetap tersimpan
+        self.cache.store("http://a.com", {}, b"page-1")
+        self.assertIsNotNone(self.cache.get_records("http://a.com", body_hash(b"page-1")))
+        # Body berubah: hasil parsing lama dibuang
+        self.cache.store("http://a.com", {}, b"page-2")
+        self.assertIsNone(self.cache.get_records("http://a.com", body_hash(b"page-2")))
+
+    # Test hasil parsing tidak dipakai untuk backend parser atau versi parser yang berbeda
+    def test_records_keyed_by_parser(self):
+        self.cache.store("http://a.com", {}, b"page-1")
+        self.cache.store_records("http://a.com", body_hash(b"page-1"), [{'Title': 'A'}], 'bs4@1')
+        self.assertIsNotNone(self.cache.get_records("http://a.com", body_hash(b"page-1"), 'bs4@1'))
+        self.assertIsNone(self.cache.get_records("http://a.com", body_hash(b"page-1"), 'lxml@1'))
+        self.assertIsNone(self.cache.get_records("http://a.com", body_hash(b"page-1"), 'bs4@2'))
+
+    # Test eviction berbasis ukuran membuang entri yang paling lama tidak diakses
+    def test_size_based_eviction(self):
+        cache = HttpCache(os.path.join(self.tmp.name, 'small.sqlite'), max_bytes=25)
+        cache.store("http://a.com/1", {}, b"x" * 10)
+        cache.store("http://a.com/2", {}, b"y" * 10)
+        cache.store("http://a.com/3", {}, b"z" * 10)
+        self.assertLessEqual(cache.total_bytes(), 25)
+        self.assertEqual(cache.conditional_headers("http://a.com/1"), {})
+        self.assertIsNone(cache.revalidated("http://a.com/1"))
+        self.assertEqual(cache.revalidated("http://a.com/3"), b"z" * 10)
+        self.assertEqual(cache.stats['evicted'], 1)
+        cache.close()
+
+    # Test scrape kedua melewati parsing untuk halaman yang tidak berubah
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.parse_products')
+    def test_scrape_skips_parsing_unchanged_pages(self, mock_parse, mock_session_cls):
+        session = mock_session_cls.return_value.__enter__.return_value
+        session.get.return_value = self._response(headers={'ETag': '"v1"'}, content=b"<html>page</html>")
+        mock_parse.return_value = [{'Title': 'A', 'timestamp': 't'}]
+
+        first = scrape_fashion_data("http://dummy.com", end_page=2, cache=self.cache)
+        self.assertEqual(mock_parse.call_count, 2)
+
+        session.get.return_value = self._response(status_code=304, content=b"")
+        with self.assertLogs(level='INFO') as log:
+            second = scrape_fashion_data("http://dummy.com", end_page=2, cache=self.cache)
+        self.assertEqual(mock_parse.call_count, 2)
+        self.assertEqual([item['Title'] for item in second], [item['Title'] for item in first])
+        self.assertEqual(self.cache.stats['parse_skipped'], 2)
+        self.assertTrue(any("HTTP cache: 2 hits" in m for m in log.output))
+
+    # Test ganti parser: halaman yang tidak berubah diparsing ulang dengan backend baru
+    @patch('utils.extract.requests.Session')
+    @patch('utils.extract.parse_products')
+    def test_scrape_reparses_after_parser_change(self, mock_parse, mock_session_cls):
+        session = mock_session_cls.return_value.__enter__.return_value
+        session.get.return_value = self._response(headers={'ETag': '"v1"'}, content=b"<html>page</html>")
+        mock_parse.return_value = [{'Title': 'A', 'timestamp': 't'}]
+        scrape_fashion_data("http://dummy.com", end_page=2, cache=self.cache, parser='bs4')
+
+        session.get.return_value = self._response(status_code=304, content=b"")
+        scrape_fashion_data("http://dummy.com", end_page=2, cache=self.cache, parser='lxml')
+        self.assertEqual(mock_parse.call_count, 4)
+        self.assertEqual([c.args[2] for c in mock_parse.call_args_list[2:]], ['lxml', 'lxml'])
+        scrape_fashion_data("http://dummy.com", end_page=2, cache=self.cache, parser='lxml')
+        self.assertEqual(mock_parse.call_count, 4)
+
+    # Test pipeline parse_workers: run kedua atas halaman yang tidak berubah tidak mengirim apa pun ke pool
+    @patch('utils.extract._parse_process_pool', side_effect=CountingPool)
+    @patch('utils.extract.requests.Session')
+    def test_parse_pipeline_skips_pool_for_unchanged_pages(self, mock_session_cls, mock_pool):
+        session = mock_session_cls.return_value.__enter__.return_value
+        session.get.return_value = self._response(headers={'ETag': '"v1"'}, content=(
+            b'<html><body><div class="collection-card"><h3 class="product-title">Item</h3><span class="price">$10.00</span>'
+            b'<div class="product-details"><p>Rating: 5.0</p><p>1 Colors</p><p>Size: S</p><p>Gender: M</p></div></div></body></html>'))
+        CountingPool.submitted = 0
+
+        first = scrape_fashion_data("http://dummy.com", end_page=3, cache=self.cache, parse_workers=2)
+        self.assertEqual(CountingPool.submitted, 3)
+
+        session.get.return_value = self._response(status_code=304, content=b"")
+        second = scrape_fashion_data("http://dummy.com", end_page=3, cache=self.cache, parse_workers=2)
+        self.assertEqual(CountingPool.submitted, 3)
+        strip = lambda data: [{k: v for k, v in item.items() if k != 'timestamp'} for item in data]
+        self.assertEqual(len(second), 3)
+        self.assertEqual(strip(second), strip(first))
+
+if __name__ == '__main__':
+    unittest.main()
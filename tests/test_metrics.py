@@ -0,0 +1,130 @@
+import unittest
+import io
+import json
+import os
+import tempfile
+from contextlib import redirect_stdout
+from unittest.mock import patch
+from utils.metrics import RunMetrics, metrics, instrument, result_rows, content_bytes, peak_rss_bytes
+from utils.transform import process_dataframe
+from utils.load import save_to_csv
+
+class TestMetrics(unittest.TestCase):
+
+    def tearDown(self):
+        metrics.stop()
+
+    # Test stage mencatat waktu, baris, byte, dan throughput
+    def test_stage_records_counts(self):
+        run = RunMetrics()
+        run.start()
+        with run.stage('parse', rows=10, nbytes=100):
+            pass
+        with run.stage('parse') as counts:
+            counts['rows'] = 5
+        run.stop()
+
+        stats = run.report()['stages']['parse']
+        self.assertEqual(stats['calls'], 2)
+        self.assertEqual(stats['rows'], 15)
+        self.assertEqual(stats['bytes'], 100)
+        self.assertIsNotNone(stats['rows_per_sec'])
+        self.assertIsNone(stats['peak_memory_bytes'])
+
+    # Test instrumentasi nonaktif tidak mencatat apa pun
+    def test_disabled_records_nothing(self):
+        run = RunMetrics()
+        with run.stage('fetch', rows=1):
+            pass
+        self.assertEqual(run.report()['stages'], {})
+
+    # Test tracemalloc dan cProfile opsional masuk ke laporan
+    def test_trace_memory_and_profile(self):
+        run = RunMetrics()
+        run.start(trace_memory=True, profile=True)
+        with run.stage('alloc'):
+            data = [bytes(1024) for _ in range(1000)]
+        run.stop()
+        del data
+
+        report = run.report()
+        self.assertGreater(report['stages']['alloc']['peak_memory_bytes'], 1000 * 1024)
+        self.assertTrue(report['profile'])
+
+    # Test decorator dengan penghitung byte, statistik cProfile mentah (.prof) dan platform tanpa modul resource
+    def test_instrument_bytes_and_profile_dump(self):
+        @instrument('fetch', rows=result_rows, nbytes=content_bytes)
+        def fetch(size):
+            return b"x" * size
+
+        run_metrics = RunMetrics()
+        with patch('utils.metrics.metrics', run_metrics):
+            run_metrics.start(profile=True)
+            fetch(10)
+            fetch(0)
+            run_metrics.stop()
+        self.assertEqual(run_metrics.report()['stages']['fetch']['bytes'], 10)
+
+        with tempfile.TemporaryDirectory() as tmp:
+            profile_path = os.path.join(tmp, 'run.prof')
+            run_metrics.write_report(os.path.join(tmp, 'report.json'), profile_path=profile_path)
+            self.assertTrue(os.path.exists(profile_path))
+
+        with patch('utils.metrics.resource', None):
+            self.assertIsNone(peak_rss_bytes())
+
+    # Test stage bersarang: reset_peak() di stage dalam tidak menghapus puncak memori stage luar
+    def test_trace_memory_nested_stages(self):
+        run = RunMetrics()
+        run.start(trace_memory=True)
+        with run.stage('outer'):
+            data = bytes(5 * 1024 * 1024)
+            del data
+            with run.stage('inner'):
+                small = [bytes(1024) for _ in range(10)]
+            del small
+        run.stop()
+
+        stages = run.report()['stages']
+        self.assertGreater(stages['outer']['peak_memory_bytes'], 4 * 1024 * 1024)
+        self.assertLess(stages['inner']['peak_memory_bytes'], 1024 * 1024)
+
+    # Test decorator + laporan JSON dari pipeline (transform per kolom dan sink)
+    def test_run_report_json(self):
+        @instrument('fetch', rows=result_rows)
+        def fetch():
+            return [1, 2, 3]
+
+        raw = [{'Title': 'A', 'Price': '$1.00', 'Rating': 'Rating: ⭐ 4.5 / 5', 'Colors': '3 Colors',
+                'Size': 'Size: M', 'Gender': 'Gender: Men', 'timestamp': '2025-12-20 18:01:02'}]
+        metrics.start()
+        fetch()
+        df = process_dataframe(raw)
+        with tempfile.TemporaryDirectory() as tmp:
+            save_to_csv(df, os.path.join(tmp, 'products.csv'))
+            metrics.stop()
+            path = os.path.join(tmp, 'report.json')
+            metrics.write_report(path)
+            with open(path) as f:
+                report = json.load(f)
+
+        for stage in ('fetch', 'transform', 'clean_price', 'clean_gender', 'save_to_csv'):
+            self.assertIn(stage, report['stages'])
+        self.assertEqual(report['stages']['fetch']['rows'], 3)
+        self.assertEqual(report['stages']['save_to_csv']['rows'], 1)
+        self.assertIsNotNone(report['elapsed_seconds'])
+
+    # Test df.info() hanya dicetak jika verbose=True
+    def test_process_dataframe_verbose(self):
+        raw = [{'Title': 'A', 'Price': '$1.00', 'Rating': 'Rating: ⭐ 4.5 / 5', 'Colors': '3 Colors',
+                'Size': 'Size: M', 'Gender': 'Gender: Men', 'timestamp': '2025-12-20 18:01:02'}]
+        quiet, loud = io.StringIO(), io.StringIO()
+        with redirect_stdout(quiet):
+            process_dataframe(raw)
+        with redirect_stdout(loud):
+            process_dataframe(raw, verbose=True)
+        self.assertEqual(quiet.getvalue(), '')
+        self.assertIn('DataFrame info', loud.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import os
+import unittest
+from utils.parsers import PARSERS, get_parser, register_parser, parse_products_bs4, parse_products_lxml
+from benchmarks.synthetic import render_page, page_products
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# Fungsi untuk membuang timestamp agar record dari dua backend bisa dibandingkan
+def _without_timestamp(items):
+    return [{key: value for key, value in item.items() if key != 'timestamp'} for item in items]
+
+class TestParsers(unittest.TestCase):
+
+    def _read_fixture(self, name):
+        with open(os.path.join(FIXTURES_DIR, name), 'rb') as f:
+            return f.read()
+
+    # Test kedua backend menghasilkan record identik pada halaman tersimpan
+    def test_backends_equivalent_on_saved_pages(self):
+        for name in sorted(os.listdir(FIXTURES_DIR)):
+            if not name.endswith('.html'):
+                continue
+            with self.subTest(page=name):
+                content = self._read_fixture(name)
+                with self.assertLogs(level='ERROR'):
+                    expected = _without_timestamp(parse_products_bs4(content))
+                with self.assertLogs(level='ERROR'):
+                    actual = _without_timestamp(parse_products_lxml(content))
+                self.assertTrue(expected)
+                self.assertEqual(actual, expected)
+
+    # Test kedua backend identik pada potongan HTML kecil (price di <p>, teks bersarang)
+    def test_backends_equivalent_on_snippets(self):
+        snippets = [
+            '<div class="collection-card"><h3 class="product-title">A</h3><p class="price">$9.99</p>'
+            '<div class="product-details"><p>Rating: <b>4.0</b></p><p>2 Colors</p><p>Size: S</p><p>Gender: Men</p></div></div>',
+            '<html><body><div class="collection-card"><h3 class="product-title">B</h3><span class="price">$1</span>'
+            '<div class="product-details"><p>Rating: 1</p><p>Rating: 2</p><p>1 Colors</p><p>Size: M</p><p>Gender: Women</p></div></div></body></html>',
+        ]
+        for html in snippets:
+            with self.subTest(html=html):
+                content = html.encode('utf-8')
+                self.assertEqual(_without_timestamp(parse_products_lxml(content)), _without_timestamp(parse_products_bs4(content)))
+
+    # Test halaman tanpa produk memicu warning pada kedua backend
+    def test_no_products_warning(self):
+        for backend in (parse_products_bs4, parse_products_lxml):
+            for content in (b"<html><body><div>No items here</div></body></html>", b""):
+                with self.subTest(backend=backend.__name__, content=content):
+                    with self.assertLogs(level='WARNING') as log:
+                        self.assertEqual(backend(content, page=7), [])
+                    self.assertTrue(any("No products found on page 7" in m for m in log.output))
+
+    # Test kartu rusak di-skip dan dicatat pada backend lxml
+    def test_lxml_item_parsing_error(self):
+        content = b'<div class="collection-card"><h3 class="product-title">Item Rusak</h3></div>'
+        with self.assertLogs(level='ERROR') as log:
+            self.assertEqual(parse_products_lxml(content), [])
+        self.assertTrue(any("Error parsing product item" in m for m in log.output))
+
+    # Test lxml: byte yang bukan UTF-8, komentar HTML dan kartu tanpa judul tidak menggagalkan halaman
+    def test_lxml_non_utf8_comment_and_missing_title(self):
+        content = b'<!-- promo --><div class="collection-card"><span class="price">\xff$1.00</span></div>'
+        with self.assertLogs(level='ERROR') as log:
+            self.assertEqual(parse_products_lxml(content), [])
+        self.assertTrue(any("Missing product title" in m for m in log.output))
+
+    # Test halaman katalog sintetis (benchmark) terparsing kembali menjadi produk yang sama, termasuk anomali
+    def test_backends_parse_synthetic_page(self):
+        expected = page_products(3, products_per_page=50, anomaly_rate=0.5, seed=7)
+        content = render_page(3, products_per_page=50, total_pages=10, anomaly_rate=0.5, seed=7)
+        for backend in PARSERS.values():
+            items = [{k: v for k, v in item.items() if k != 'timestamp'} for item in backend(content)]
+            self.assertEqual(items, expected)
+        self.assertTrue(any(product['Price'] == 'Price Unavailable' for product in expected))
+        self.assertTrue(any(product['Title'] == 'Unknown Product' for product in expected))
+
+    # Test registry backend parser
+    def test_parser_registry(self):
+        self.assertIs(get_parser('lxml'), parse_products_lxml)
+        self.assertIs(get_parser(None), parse_products_bs4)
+        with self.assertRaises(ValueError):
+            get_parser('unknown')
+
+        @register_parser('dummy')
+        def parse_dummy(content, page=None):
+            return []
+        try:
+            self.assertIs(get_parser('dummy'), parse_dummy)
+        finally:
+            PARSERS.pop('dummy')
+
+if __name__ == '__main__':
+    unittest.main()
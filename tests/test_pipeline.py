@@ -0,0 +1,112 @@
+import unittest
+from unittest.mock import patch
+import os
+import queue
+import tempfile
+import threading
+import pandas as pd
+import pyarrow.parquet as pq
+from utils.pipeline import run_streaming_pipeline, _put, _iter_queue, _run_stage, _STAGE_DONE
+from utils.load import CsvAppendSink, ParquetAppendSink
+
+# Record mentah seperti hasil parser
+def raw_item(i):
+    return {
+        'Title': f'Product {i}',
+        'Price': f'${i + 1}.00',
+        'Rating': 'Rating: ⭐ 4.5 / 5',
+        'Colors': '3 Colors',
+        'Size': 'Size: M',
+        'Gender': 'Gender: Men',
+        'timestamp': '2025-12-20 18:01:02',
+    }
+
+# Stand-in iter_fashion_data: 20 produk per halaman, halaman terakhir mengulang produk sebelumnya
+def fake_pages(base_url, pages=5, **options):
+    for page in range(pages):
+        yield [raw_item(page * 20 + i) for i in range(20)]
+    yield [raw_item(0), raw_item(1)]
+
+# Sink yang mencatat setiap batch
+class RecordingSink:
+    def __init__(self, name, fail=False):
+        self.name = name
+        self.fail = fail
+        self.batches = []
+        self.closed = False
+
+    def write(self, df):
+        self.batches.append(len(df))
+        return not self.fail
+
+    def close(self):
+        self.closed = True
+
+class TestPipeline(unittest.TestCase):
+
+    # Test batch mengalir ke semua sink per micro-batch, dengan dedupe lintas batch
+    @patch('utils.pipeline.iter_fashion_data', side_effect=fake_pages)
+    def test_streaming_pipeline_batches(self, mock_pages):
+        sink = RecordingSink('memory')
+        failing = RecordingSink('broken', fail=True)
+        report = run_streaming_pipeline('http://dummy.com', [sink, failing], batch_size=30, queue_size=2, pages=5)
+
+        self.assertEqual(report['rows_scraped'], 102)
+        self.assertEqual(sink.batches, [30, 30, 30, 10])
+        self.assertEqual(report['rows_loaded'], {'memory': 100, 'broken': 0})
+        self.assertEqual(report['failed_batches'], {'memory': 0, 'broken': 4})
+        self.assertIsNotNone(report['first_load_seconds'])
+        self.assertTrue(sink.closed and failing.closed)
+        self.assertEqual(report['errors'], [])
+
+    # Test output append CSV/Parquet sama dengan hasil transform batch
+    @patch('utils.pipeline.iter_fashion_data', side_effect=fake_pages)
+    def test_streaming_pipeline_append_sinks(self, mock_pages):
+        with tempfile.TemporaryDirectory() as tmp:
+            csv_path = os.path.join(tmp, 'products.csv')
+            parquet_path = os.path.join(tmp, 'products.parquet')
+            pd.DataFrame({'old': [1]}).to_csv(csv_path, index=False)
+
+            sinks = [CsvAppendSink(csv_path), ParquetAppendSink(parquet_path)]
+            run_streaming_pipeline('http://dummy.com', sinks, batch_size=30, pages=5)
+
+            from_csv = pd.read_csv(csv_path)
+            from_parquet = pq.read_table(parquet_path).to_pandas()
+            self.assertEqual(len(from_csv), 100)
+            self.assertEqual(list(from_csv['Title'][:2]), ['Product 0', 'Product 1'])
+            self.assertEqual(from_csv['Price'].iloc[-1], 100 * 16000.0)
+            pd.testing.assert_frame_equal(from_parquet, from_csv)
+            self.assertEqual(pq.ParquetFile(parquet_path).num_row_groups, 4)
+
+    # Test error pada stage extract menghentikan pipeline tanpa menggantung
+    @patch('utils.pipeline.iter_fashion_data')
+    def test_streaming_pipeline_stage_error(self, mock_pages):
+        def broken(base_url, **options):
+            yield [raw_item(0)]
+            raise RuntimeError("Network Down")
+        mock_pages.side_effect = broken
+
+        sink = RecordingSink('memory')
+        report = run_streaming_pipeline('http://dummy.com', [sink], batch_size=30)
+        self.assertEqual(report['errors'], ['extract: Network Down'])
+        self.assertTrue(sink.closed)
+
+    # Test antrean antar-stage tidak blok selamanya: put pada antrean penuh dan get pada antrean kosong berhenti saat pipeline dihentikan
+    def test_stage_queue_respects_stop(self):
+        stop_event = threading.Event()
+        full = queue.Queue(maxsize=1)
+        full.put('batch')
+        threading.Timer(0.2, stop_event.set).start()
+        self.assertFalse(_put(full, 'next', stop_event))
+
+        # Stage yang sudah dihentikan tidak meneruskan item sama sekali
+        errors = []
+        _run_stage('extract', iter(range(3)), full, stop_event, errors)
+        self.assertEqual((full.get_nowait(), full.qsize(), errors), ('batch', 0, []))
+
+        empty = queue.Queue()
+        threading.Timer(0.2, empty.put, args=(_STAGE_DONE,)).start()
+        self.assertEqual(list(_iter_queue(empty, threading.Event())), [])
+
+if __name__ == '__main__':
+    unittest.main()
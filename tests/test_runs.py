@@ -0,0 +1,120 @@
+import unittest
+from unittest.mock import patch
+import json
+import os
+import tempfile
+import pandas as pd
+import main
+import utils.load
+from utils.runs import RunManifest, file_checksum, new_run_id
+from utils.transform import transform_frame
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestRunManifest(unittest.TestCase):
+
+    # Test stage ok dilewati hanya jika input sama dan artifact tidak berubah; manifest bertahan di disk
+    def test_is_fresh_checks_inputs_and_artifact(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            manifest = RunManifest('r1', root=tmp)
+            artifact = manifest.artifact('raw.txt')
+            with open(artifact, 'w') as f:
+                f.write('data')
+            manifest.record('extract', 'ok', {'sources': 'a'}, artifact=artifact, rows=1)
+            manifest.record('load:postgres', 'failed', {'clean': 'x'}, error='connection refused')
+
+            resumed = RunManifest('r1', root=tmp)
+            self.assertTrue(resumed.is_fresh('extract', {'sources': 'a'}))
+            self.assertFalse(resumed.is_fresh('extract', {'sources': 'b'}))
+            self.assertFalse(resumed.is_fresh('load:postgres', {'clean': 'x'}))
+            self.assertEqual(resumed.failed(), ['load:postgres'])
+            self.assertEqual(resumed.checksum('extract'), file_checksum(artifact))
+
+            with open(artifact, 'w') as f:
+                f.write('tampered')
+            self.assertFalse(resumed.is_fresh('extract', {'sources': 'a'}))
+
+    # Test checksum direktori (dataset Parquet terpartisi): berubah jika isi atau nama file di dalamnya berubah
+    def test_file_checksum_directory(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            os.makedirs(os.path.join(tmp, 'Gender=Men'))
+            with open(os.path.join(tmp, 'Gender=Men', 'part-0.parquet'), 'w') as f:
+                f.write('data')
+            checksum = file_checksum(tmp)
+            self.assertEqual(file_checksum(tmp), checksum)
+
+            os.rename(os.path.join(tmp, 'Gender=Men'), os.path.join(tmp, 'Gender=Women'))
+            self.assertNotEqual(file_checksum(tmp), checksum)
+
+    # Test run ID berbasis waktu dengan sufiks acak: run yang dimulai pada detik yang sama tetap unik
+    def test_new_run_id(self):
+        run_ids = {new_run_id() for _ in range(100)}
+        self.assertEqual(len(run_ids), 100)
+        for run_id in run_ids:
+            self.assertRegex(run_id, r'^\d{8}-\d{6}-[0-9a-f]{6}$')
+
+class TestCheckpointedRun(unittest.TestCase):
+
+    def setUp(self):
+        self.raw_data = pd.read_csv(os.path.join(ROOT, 'products_raw.csv'), dtype=str).head(60).to_dict('records')
+        self.cwd = os.getcwd()
+        self.tmp = tempfile.TemporaryDirectory()
+        os.chdir(self.tmp.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmp.cleanup()
+
+    # Test run ulang dengan run ID yang sama: extract, transform dan sink yang sudah ok dilewati, hanya sink gagal diulang
+    def test_rerun_retries_only_failed_sink(self):
+        with patch('utils.scheduler.scrape_catalogs', return_value=self.raw_data) as mock_scrape, \
+             patch('utils.load.save_changes_to_postgres', side_effect=[False, True]) as mock_postgres, \
+             patch('utils.load.save_to_csv', wraps=utils.load.save_to_csv) as mock_csv:
+            self.assertFalse(main.main(('csv', 'postgres'), run_id='test-run'))
+            self.assertTrue(main.main(('csv', 'postgres'), run_id='test-run'))
+
+        self.assertEqual(mock_scrape.call_count, 1)
+        self.assertEqual(mock_postgres.call_count, 2)
+        # save_to_csv: raw CSV + sink csv pada run pertama, tidak dipanggil lagi pada run kedua
+        self.assertEqual(mock_csv.call_count, 2)
+
+        with open(os.path.join('.runs', 'test-run', 'manifest.json')) as f:
+            stages = json.load(f)['stages']
+        self.assertEqual({stage: entry['status'] for stage, entry in stages.items()},
+                         {'extract': 'ok', 'transform': 'ok', 'load:csv': 'ok', 'load:postgres': 'ok'})
+        self.assertEqual(stages['load:csv']['inputs'], {'clean': stages['transform']['checksum']})
+        self.assertGreater(stages['transform']['rows'], 0)
+
+    # Test diff CDC gagal: PostgreSQL dimuat penuh (bukan delta) dan sink lain tetap berjalan
+    def test_cdc_failure_falls_back_to_full_load(self):
+        clean_df = transform_frame(pd.DataFrame(self.raw_data))
+        with patch('utils.cdc.FingerprintIndex.diff', side_effect=ValueError("corrupt index")), \
+             patch('utils.load.save_changes_to_postgres') as mock_changes, \
+             patch('utils.load.save_to_postgres_copy', return_value=True) as mock_full, \
+             self.assertLogs(level='ERROR') as log:
+            report = main.load(clean_df, ('csv', 'postgres'))
+
+        self.assertEqual(dict(zip(report['sink'], report['status'])), {'csv': 'ok', 'postgres': 'ok'})
+        mock_changes.assert_not_called()
+        mock_full.assert_called_once_with(clean_df, db_uri=main.DB_URI)
+        self.assertTrue(any("CDC diff failed" in m for m in log.output))
+
+    # Test snapshot mentah gagal disimpan: extract dicatat gagal (run belum lengkap) dan diulang pada run berikutnya
+    def test_missing_raw_snapshot_marks_extract_failed(self):
+        with patch('utils.scheduler.scrape_catalogs', return_value=self.raw_data) as mock_scrape, \
+             patch('utils.load.save_raw_snapshot', return_value=False):
+            self.assertFalse(main.main(('csv',), run_id='test-run'))
+        extract = RunManifest('test-run', root='.runs').stages['extract']
+        self.assertEqual(extract['status'], 'failed')
+        self.assertIn('raw.arrow', extract['error'])
+
+        with patch('utils.scheduler.scrape_catalogs', return_value=self.raw_data) as mock_rescrape:
+            self.assertTrue(main.main(('csv',), run_id='test-run'))
+
+        self.assertEqual(mock_scrape.call_count, 1)
+        self.assertEqual(mock_rescrape.call_count, 1)
+        manifest = RunManifest('test-run', root='.runs')
+        self.assertEqual(manifest.stages['extract']['status'], 'ok')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,235 @@
+import unittest
+from unittest.mock import patch
+from urllib.parse import urlsplit
+import os
+import re
+import tempfile
+import threading
+import time
+from benchmarks.synthetic import render_page
+from utils.extract import CrawlCheckpoint, FetchPolicy, PageOutcomes, build_page_url
+from utils.http_cache import HttpCache
+from utils.scheduler import CatalogSource, CrawlScheduler, scrape_catalogs, _SourceCrawl
+from utils.pipeline import run_streaming_pipeline
+
+# Stand-in get_page_content: halaman sintetis per domain dengan latensi per domain,
+# mencatat URL yang diminta dan jumlah request simultan maksimum per domain
+class FakeSites:
+    def __init__(self, pages=3, latency=None, missing=(), errors=()):
+        self.pages = pages
+        self.latency = latency or {}
+        self.missing = set(missing)
+        self.errors = set(errors)
+        self.urls = []
+        self.active = {}
+        self.max_active = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, session, url, **options):
+        domain = urlsplit(url).netloc
+        with self._lock:
+            self.urls.append(url)
+            self.active[domain] = self.active.get(domain, 0) + 1
+            self.max_active[domain] = max(self.max_active.get(domain, 0), self.active[domain])
+        try:
+            time.sleep(self.latency.get(domain, 0.0))
+            if url in self.missing:
+                return None
+            if url in self.errors:
+                raise ValueError(f"broken page {url}")
+            match = re.search(r'page=?(\d+)$', url)
+            page = int(match.group(1)) if match else 1
+            return render_page(page, products_per_page=2, total_pages=self.pages, seed=domain)
+        finally:
+            with self._lock:
+                self.active[domain] -= 1
+
+class TestScheduler(unittest.TestCase):
+
+    # Test URL template untuk skema halaman selain /pageN
+    def test_build_page_url_template(self):
+        self.assertEqual(build_page_url("http://shop.com", 1, "{base_url}/catalog?page={page}"), "http://shop.com/catalog?page=1")
+        self.assertEqual(build_page_url("http://shop.com", 2), "http://shop.com/page2")
+
+    # Test beberapa sumber: semua halaman diambil (pagination membatasi crawl), nama sumber ditambahkan ke produk
+    def test_scrape_catalogs_multiple_sources(self):
+        sites = FakeSites(pages=3)
+        sources = [
+            CatalogSource("http://a.test", name='a'),
+            CatalogSource("http://b.test", name='b', url_template="{base_url}/catalog?page={page}"),
+        ]
+        with patch('utils.scheduler.get_page_content', side_effect=sites):
+            data = scrape_catalogs(sources, workers=4, max_connections=2, source_column='Source')
+
+        self.assertEqual(len(data), 12)
+        # Hasil tiap sumber tetap berurutan halaman
+        numbers = [int(item['Title'].split()[-1]) for item in data if item['Source'] == 'a']
+        self.assertEqual(numbers, [1, 2, 3, 4, 5, 6])
+        self.assertEqual(sorted(url for url in sites.urls if 'b.test' in url),
+                         [f"http://b.test/catalog?page={page}" for page in (1, 2, 3)])
+        self.assertEqual(sorted(url for url in sites.urls if 'a.test' in url),
+                         ["http://a.test", "http://a.test/page2", "http://a.test/page3"])
+
+    # Test batas koneksi per domain dan sumber lambat tidak menahan sumber lain
+    def test_per_domain_limits_and_interleaving(self):
+        sites = FakeSites(pages=6, latency={'slow.test': 0.1, 'fast.test': 0.01})
+        scheduler = CrawlScheduler([CatalogSource("http://slow.test"), CatalogSource("http://fast.test")],
+                                   workers=4, max_connections=1, domain_limits={'fast.test': {'max_connections': 3}})
+        finished = {}
+        start = time.perf_counter()
+        with patch('utils.scheduler.get_page_content', side_effect=sites):
+            for source, page, items in scheduler.iter_pages():
+                finished[source.name] = (page, time.perf_counter() - start)
+        scheduler.close()
+
+        self.assertEqual(sites.max_active, {'slow.test': 1, 'fast.test': 3})
+        self.assertEqual(finished['fast.test'][0], 6)
+        self.assertEqual(finished['slow.test'][0], 6)
+        # Sumber cepat selesai jauh sebelum sumber lambat (6 x 0.1 detik)
+        self.assertLess(finished['fast.test'][1], 0.3)
+        self.assertGreaterEqual(finished['slow.test'][1], 0.6)
+        self.assertEqual(scheduler.report()['requests_per_domain'], {'slow.test': 6, 'fast.test': 6})
+
+    # Test rate limit per domain: hanya domain yang dibatasi yang melambat
+    def test_per_domain_rate_limit(self):
+        sites = FakeSites(pages=5)
+        scheduler = CrawlScheduler([CatalogSource("http://limited.test"), CatalogSource("http://free.test")],
+                                   workers=4, domain_limits={'limited.test': {'rate_limit': 20}})
+        finished = {}
+        start = time.perf_counter()
+        with patch('utils.scheduler.get_page_content', side_effect=sites):
+            for source, page, items in scheduler.iter_pages():
+                finished[source.name] = time.perf_counter() - start
+        scheduler.close()
+
+        self.assertGreaterEqual(finished['limited.test'], 0.2)
+        self.assertLess(finished['free.test'], 0.15)
+
+    # Test limit per sumber dan halaman gagal tercatat di outcomes sumbernya
+    def test_limit_and_outcomes_per_source(self):
+        sites = FakeSites(pages=4, missing={"http://a.test/page2"})
+        with tempfile.TemporaryDirectory() as tmp:
+            outcomes = os.path.join(tmp, 'outcomes.json')
+            sources = [CatalogSource("http://a.test", outcomes=outcomes), CatalogSource("http://b.test", limit=3)]
+            with patch('utils.scheduler.get_page_content', side_effect=sites):
+                data = scrape_catalogs(sources, workers=2, source_column='Source')
+            failed = PageOutcomes(outcomes).load("http://a.test").failed_pages()
+
+        self.assertEqual(sum(item['Source'] == 'a.test' for item in data), 6)
+        self.assertEqual(sum(item['Source'] == 'b.test' for item in data), 3)
+        self.assertEqual(failed, [2])
+
+    # Test halaman gagal berturut-turut tidak dianggap akhir katalog pada crawl multi-sumber
+    def test_failed_pages_do_not_end_crawl(self):
+        sites = FakeSites(pages=10, missing={f"http://a.test/page{page}" for page in (3, 4, 5)})
+        with tempfile.TemporaryDirectory() as tmp:
+            outcomes = os.path.join(tmp, 'outcomes.json')
+            source = CatalogSource("http://a.test", checkpoint=os.path.join(tmp, 'crawl.json'), outcomes=outcomes)
+            with patch('utils.scheduler.get_page_content', side_effect=sites):
+                data = scrape_catalogs([source], workers=2, max_empty_pages=3)
+            failed = PageOutcomes(outcomes).load("http://a.test").failed_pages()
+
+        self.assertEqual(len(data), 14)
+        self.assertEqual(len(sites.urls), 10)
+        self.assertEqual(failed, [3, 4, 5])
+
+    # Test resume dari checkpoint: halaman yang sudah selesai tidak diambil ulang, record-nya dikirim lebih dulu,
+    # dan checkpoint dihapus setelah crawl sumber selesai
+    def test_resume_from_checkpoint(self):
+        sites = FakeSites(pages=3)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'crawl.json')
+            checkpoint = CrawlCheckpoint(path)
+            checkpoint.load("http://a.test")
+            checkpoint.mark_done(1, [{'Title': 'Saved 1'}, {'Title': 'Saved 2'}], end_page=3)
+
+            scheduler = CrawlScheduler([CatalogSource("http://a.test", checkpoint=path)], workers=2)
+            with patch('utils.scheduler.get_page_content', side_effect=sites):
+                pages = [(page, len(items)) for _, page, items in scheduler.iter_pages()]
+            scheduler.close()
+
+            self.assertEqual(pages, [(None, 2), (2, 2), (3, 2)])
+            self.assertEqual(sorted(sites.urls), ["http://a.test/page2", "http://a.test/page3"])
+            self.assertFalse(os.path.exists(path))
+
+    # Test daftar halaman eksplisit: hanya halaman tersebut yang diambil (berurutan), tanpa batas pagination
+    def test_explicit_pages(self):
+        sites = FakeSites(pages=2)
+        with patch('utils.scheduler.get_page_content', side_effect=sites):
+            data = scrape_catalogs([CatalogSource("http://a.test", pages=[5, 3])], workers=2)
+        self.assertEqual(sorted(sites.urls), ["http://a.test/page3", "http://a.test/page5"])
+        self.assertEqual([int(item['Title'].split()[-1]) for item in data], [5, 6, 9, 10])
+
+    # Test parsing di process pool menghasilkan produk yang sama dengan parsing di worker
+    def test_parse_workers(self):
+        sources = [CatalogSource("http://a.test"), CatalogSource("http://b.test")]
+        with patch('utils.scheduler.get_page_content', side_effect=FakeSites(pages=3)):
+            inline = scrape_catalogs(sources, workers=2)
+        with patch('utils.scheduler.get_page_content', side_effect=FakeSites(pages=3)):
+            pooled = scrape_catalogs(sources, workers=2, parse_workers=1)
+        self.assertEqual(len(pooled), 12)
+        self.assertEqual(sorted((item['Title'], item['Price']) for item in pooled), sorted((item['Title'], item['Price']) for item in inline))
+
+    # Test error tak terduga saat fetch/parsing dicatat sebagai halaman gagal tanpa menghentikan sumber lain
+    def test_fetch_exception(self):
+        sites = FakeSites(pages=3, errors={"http://a.test/page2"})
+        scheduler = CrawlScheduler([CatalogSource("http://a.test"), CatalogSource("http://b.test")], workers=2)
+        with patch('utils.scheduler.get_page_content', side_effect=sites):
+            data = [item for _, _, items in scheduler.iter_pages() for item in items]
+        scheduler.close()
+
+        self.assertEqual(len(data), 10)
+        self.assertEqual(scheduler.report()['sources']['a.test'], {'pages': 3, 'failed': 1, 'items': 4})
+
+    # Test halaman di luar jumlah halaman hasil pagination yang sudah terlanjur diambil tidak ikut dikirim
+    def test_pages_beyond_discovered_end_skipped(self):
+        sites = FakeSites(pages=2)
+        scheduler = CrawlScheduler([CatalogSource("http://a.test")], workers=4, max_connections=4)
+        with patch('utils.scheduler.get_page_content', side_effect=sites):
+            data = [item for _, _, items in scheduler.iter_pages() for item in items]
+        scheduler.close()
+
+        self.assertIn("http://a.test/page4", sites.urls)
+        self.assertEqual(len(data), 4)
+        self.assertEqual(scheduler.report()['sources']['a.test']['pages'], 2)
+
+        # Crawl yang sudah berhenti tidak memberi halaman baru
+        crawl = _SourceCrawl(CatalogSource("http://a.test"), discover_pages=False)
+        crawl.progress.stopped = True
+        self.assertIsNone(crawl.next_page())
+
+    # Test cache dan fetch policy diteruskan ke setiap fetch
+    def test_cache_and_fetch_policy_options(self):
+        policy = FetchPolicy()
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = HttpCache(os.path.join(tmp, 'pages.sqlite'))
+            with patch('utils.scheduler.get_page_content', side_effect=FakeSites(pages=2)) as mock_fetch:
+                data = scrape_catalogs([CatalogSource("http://a.test")], workers=2, cache=cache, fetch_policy=policy)
+            cache.close()
+        self.assertEqual(len(data), 4)
+        self.assertEqual(mock_fetch.call_args.kwargs, {'cache': cache, 'policy': policy})
+
+    # Test generator ditutup lebih awal: request yang masih menunggu dibatalkan tanpa menggantung
+    def test_close_cancels_pending_pages(self):
+        sites = FakeSites(pages=3, latency={'slow.test': 0.3})
+        scheduler = CrawlScheduler([CatalogSource("http://fast.test"), CatalogSource("http://slow.test")], workers=2)
+        with patch('utils.scheduler.get_page_content', side_effect=sites):
+            pages = scheduler.iter_pages()
+            source, page, items = next(pages)
+            pages.close()
+        scheduler.close()
+
+        self.assertEqual((source.name, page), ('fast.test', 1))
+        self.assertEqual(scheduler.report()['sources']['slow.test']['pages'], 0)
+
+    # Test pipeline streaming dengan daftar sumber (CrawlScheduler) sebagai input
+    def test_streaming_pipeline_with_sources(self):
+        sites = FakeSites(pages=3)
+        sources = [CatalogSource("http://a.test"), CatalogSource("http://b.test")]
+        with patch('utils.scheduler.get_page_content', side_effect=sites):
+            report = run_streaming_pipeline(sources, [], batch_size=4, workers=4)
+        self.assertEqual(report['rows_scraped'], 12)
+        self.assertEqual(report['errors'], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os
+import tempfile
+import pandas as pd
+from utils.store import ProductStore, StoreAppendSink, save_to_store
+
+def make_clean(rows):
+    return pd.DataFrame(rows, columns=['Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp'])
+
+CATALOG = make_clean([
+    ('Hoodie 1', 800000.0, 4.5, 3, 'XL', 'Women', '2025-01-01 10:00:00'),
+    ('Hoodie 2', 950000.0, 4.9, 2, 'M', 'Men', '2025-01-01 10:00:00'),
+    ('Jacket 3', 1200000.0, 4.9, 5, 'XL', 'Women', '2025-01-01 10:00:00'),
+    ('Dress 4', 600000.0, 3.2, 1, 'XL', 'Women', '2025-01-01 10:00:00'),
+    ('Pants 5', 400000.0, 4.0, 4, 'S', 'Unisex', '2025-01-01 10:00:00'),
+])
+
+class TestProductStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'products.sqlite')
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    # Test query API: rentang harga per Gender+Size, top rated dengan filter judul, filter harga + urutan
+    def test_queries(self):
+        self.assertTrue(save_to_store(CATALOG, self.path))
+        store = ProductStore(self.path)
+
+        self.assertEqual(store.price_range(gender='Women', size='XL'), {'count': 3, 'min': 600000.0, 'max': 1200000.0, 'avg': 866666.67})
+        self.assertEqual(store.top_rated(1, title_contains='HOODIE')['Title'].tolist(), ['Hoodie 2'])
+        self.assertEqual(store.top_rated(2)['Title'].tolist(), ['Hoodie 2', 'Jacket 3'])
+        result = store.query(columns=['Title', 'Price'], min_price=500000, max_price=1000000, order_by='Price', descending=True)
+        self.assertEqual(result['Title'].tolist(), ['Hoodie 2', 'Hoodie 1', 'Dress 4'])
+        self.assertEqual(store.query(columns=['Title'], order_by='Price', limit=2)['Title'].tolist(), ['Pants 5', 'Dress 4'])
+        self.assertEqual(store.query(gender='Men').iloc[0].to_dict(), CATALOG.iloc[1].to_dict())
+        with self.assertRaises(ValueError):
+            store.query(order_by='Price; DROP TABLE products')
+        store.close()
+
+    # Test filter memakai index (bukan scan penuh tabel)
+    def test_indexes_used(self):
+        save_to_store(CATALOG, self.path)
+        store = ProductStore(self.path)
+        self.assertIn('idx_products_gender_size_price', ' '.join(store.explain(gender='Women', size='XL')))
+        self.assertIn('idx_products_size_price', ' '.join(store.explain(size='M')))
+        self.assertIn('idx_products_price', ' '.join(store.explain(min_price=100, max_price=200)))
+        self.assertIn('idx_products_rating', ' '.join(store.explain(min_rating=4.5)))
+        store.close()
+
+    # Test refresh incremental: update, insert dan delete diterapkan; run tanpa perubahan tidak menulis apa pun
+    def test_incremental_refresh(self):
+        save_to_store(CATALOG, self.path)
+        updated = pd.concat([CATALOG.iloc[1:], make_clean([('Shirt 6', 300000.0, 4.1, 2, 'L', 'Men', '2025-01-02 10:00:00')])])
+        updated.loc[updated['Title'] == 'Hoodie 2', 'Price'] = 990000.0
+        self.assertTrue(save_to_store(updated, self.path))
+        self.assertTrue(save_to_store(updated, self.path))
+
+        store = ProductStore(self.path)
+        self.assertEqual(len(store), 5)
+        self.assertEqual(sorted(store.query(columns=['Title'])['Title']), sorted(updated['Title']))
+        self.assertEqual(store.query(title_contains='Hoodie 2')['Price'].tolist(), [990000.0])
+        store.close()
+
+    # Test store gagal dibuka (folder tujuan berupa file) mengembalikan False
+    def test_save_failure(self):
+        blocker = os.path.join(self.tmp.name, 'blocker')
+        open(blocker, 'w').close()
+        self.assertFalse(save_to_store(CATALOG, os.path.join(blocker, 'products.sqlite')))
+
+    # Test sink streaming: micro-batch hanya menambah/memperbarui, tidak menghapus produk batch lain
+    def test_append_sink(self):
+        sink = StoreAppendSink(self.path)
+        self.assertTrue(sink.write(CATALOG.iloc[:2]))
+        self.assertTrue(sink.write(CATALOG.iloc[2:]))
+        sink.close()
+        store = ProductStore(self.path)
+        self.assertEqual(len(store), 5)
+        store.close()
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,12 @@
 import unittest
-from unittest.mock import patch
+from unittest.mock import patch, Mock
 import pandas as pd
+import numpy as np
 from utils.transform import clean_price, clean_rating, clean_colors, clean_text_field, process_dataframe
+from utils.transform import clean_price_series, clean_rating_series, clean_colors_series, clean_text_series, clean_columns
+from utils.transform import iter_clean_chunks, read_raw_csv_chunks, RowFingerprints, compact_dtypes, memory_report
+from utils.transform import ValueCache, compile_spec, TRANSFORM_SPEC, VALUE_PARSERS
+import utils.transform as transform
 
 class TestTransform(unittest.TestCase):
 
@@ -94,5 +99,189 @@ class TestTransform(unittest.TestCase):
         df = process_dataframe([{'Title': 'Test'}])
         self.assertTrue(df.empty)
 
+    # Test versi vektor identik dengan fungsi skalar (referensi), termasuk nilai anomali
+    def test_vectorized_cleaners_match_scalar(self):
+        prices = pd.Series(["$64.24", "Price Unavailable", None, np.nan, "$1.2.3", ".", "$5.", "\u0663\u0664", "", 12.5, "$0.5", "$2.5"], dtype=object)
+        pd.testing.assert_series_equal(clean_price_series(prices), prices.map(clean_price).astype(float))
+
+        ratings = pd.Series(["Rating: \u2b50 4.8 / 5", "Rating: \u2b50 Invalid Rating / 5", "Not Rated", None, np.nan, 4.5, "\u0664.\u0665"], dtype=object)
+        pd.testing.assert_series_equal(clean_rating_series(ratings), ratings.map(clean_rating).astype(float))
+
+        colors = pd.Series(["3 Colors", "Colors", None, np.nan, 7, "\u0663 Colors"], dtype=object)
+        pd.testing.assert_series_equal(clean_colors_series(colors), colors.map(clean_colors).astype('int64'))
+
+        sizes = pd.Series(["Size: M", " Size: XL ", None, np.nan, "S"], dtype=object)
+        pd.testing.assert_series_equal(clean_text_series(sizes, "Size: "), sizes.map(lambda x: clean_text_field(x, "Size: ")).astype(str))
+
+    # Test process_dataframe memberi hasil yang sama untuk engine vectorized dan scalar
+    def test_process_dataframe_engines_match(self):
+        raw = pd.read_csv('products_raw.csv').to_dict('records')
+        raw.append({"Title": "Broken", "Price": None, "Rating": None, "Colors": None, "Size": None, "Gender": None, "timestamp": "2025"})
+        vectorized = process_dataframe(raw, engine='vectorized')
+        scalar = process_dataframe(raw, engine='scalar')
+        memoized = process_dataframe(raw, engine='memoized')
+        self.assertGreater(len(vectorized), 0)
+        pd.testing.assert_frame_equal(vectorized, scalar)
+        pd.testing.assert_frame_equal(memoized, scalar)
+
+    # Test engine yang tidak dikenal
+    def test_clean_columns_unknown_engine(self):
+        with self.assertRaises(ValueError):
+            clean_columns(pd.DataFrame({'Price': []}), engine='unknown')
+
+    # Test transform streaming dari chunk CSV sama dengan process_dataframe
+    def test_iter_clean_chunks_csv_matches_process_dataframe(self):
+        expected = process_dataframe(pd.read_csv('products_raw.csv', dtype=str).to_dict('records'))
+        chunks = list(iter_clean_chunks(read_raw_csv_chunks('products_raw.csv', chunk_size=100), chunk_size=100))
+
+        self.assertTrue(all(len(chunk) <= 100 for chunk in chunks))
+        pd.testing.assert_frame_equal(pd.concat(chunks), expected)
+
+    # Test transform streaming dari iterator record dengan duplikat lintas chunk
+    def test_iter_clean_chunks_records_dedupe_across_chunks(self):
+        record = {"Title": "T-shirt 2", "Price": "$102.15", "Rating": "3.9", "Colors": "3", "Size": "Size: M", "Gender": "Gender: Women", "timestamp": "2025"}
+        other = dict(record, Title="Hoodie 3")
+        source = iter([record, record, other, record, other, dict(record, Price="Price Unavailable")])
+
+        chunks = list(iter_clean_chunks(source, chunk_size=2))
+        result = pd.concat(chunks)
+        self.assertEqual(list(result['Title']), ["T-shirt 2", "Hoodie 3"])
+        self.assertEqual(list(result.index), [0, 2])
+        self.assertEqual(result.iloc[0]['Size'], "M")
+
+    # Test fingerprint baris hanya menandai kemunculan pertama
+    def test_row_fingerprints(self):
+        fingerprints = RowFingerprints()
+        first = fingerprints.add_new(np.array([5, 3, 5, 9], dtype=np.uint64))
+        self.assertEqual(first.tolist(), [True, True, False, True])
+        second = fingerprints.add_new(np.array([9, 1, 3, 1], dtype=np.uint64))
+        self.assertEqual(second.tolist(), [False, True, False, False])
+        self.assertEqual(fingerprints.add_new(np.array([5], dtype=np.uint64)).tolist(), [False])
+        self.assertEqual(len(fingerprints), 4)
+        self.assertEqual(fingerprints.nbytes, 32)
+        self.assertEqual(fingerprints.add_new(np.array([], dtype=np.uint64)).tolist(), [])
+
+    # Test skema compact: category, float32, int8 dan datetime64
+    def test_process_dataframe_compact(self):
+        raw = pd.read_csv('products_raw.csv', dtype=str).to_dict('records')
+        regular = process_dataframe(raw)
+        compact = process_dataframe(raw, compact=True)
+
+        self.assertEqual(str(compact['Size'].dtype), 'category')
+        self.assertEqual(str(compact['Gender'].dtype), 'category')
+        self.assertEqual(compact['Title'].dtype, object)
+        self.assertEqual(compact['Rating'].dtype, np.float32)
+        self.assertEqual(compact['Colors'].dtype, np.int8)
+        self.assertTrue(pd.api.types.is_datetime64_any_dtype(compact['timestamp']))
+        self.assertEqual(list(compact['Size'].astype(str)), list(regular['Size']))
+        np.testing.assert_allclose(compact['Rating'], regular['Rating'], rtol=1e-6)
+
+        report = memory_report(regular, compact)
+        self.assertLess(report.loc['TOTAL', 'bytes_after'], report.loc['TOTAL', 'bytes_before'])
+        self.assertEqual(report.loc['Colors', 'ratio'], 0.125)
+
+    # Test Colors memakai int16 jika nilainya melebihi int8 dan Title berulang menjadi category
+    def test_compact_dtypes_wide_colors_and_repeated_titles(self):
+        df = pd.DataFrame({'Title': ['A', 'A', 'A', 'B'], 'Colors': [1, 300, 2, 3], 'timestamp': ['2025-01-01 00:00:00', 'bad', None, '2025-01-02 10:00:00']})
+        compact = compact_dtypes(df)
+        self.assertEqual(compact['Colors'].dtype, np.int16)
+        self.assertEqual(str(compact['Title'].dtype), 'category')
+        self.assertEqual(int(compact['timestamp'].isna().sum()), 2)
+
+    # Test cache nilai: setiap nilai unik dibersihkan sekali, termasuk lintas chunk dan input category
+    def test_value_cache_cleans_distinct_values_once(self):
+        cache = ValueCache()
+        sizes = pd.Series(["Size: M", "Size: L", "Size: M", None, np.nan, "Size: M"], dtype=object)
+        cleaner = Mock(side_effect=lambda series: clean_text_series(series, "Size: "))
+        expected = sizes.map(lambda x: clean_text_field(x, "Size: ")).astype(str)
+
+        pd.testing.assert_series_equal(cache.clean('Size', sizes, cleaner, object), expected)
+        pd.testing.assert_series_equal(cache.clean('Size', sizes.iloc[:3].astype('category'), cleaner, object), expected.iloc[:3])
+        # Panggilan pertama: 2 nilai unik + baris null; panggilan kedua: semua dari cache
+        self.assertEqual([len(call.args[0]) for call in cleaner.call_args_list], [2, 2])
+
+        stats = cache.report()['Size']
+        self.assertEqual((stats['rows'], stats['hits'], stats['misses']), (9, 2, 2))
+        self.assertEqual(stats['hit_rate'], 0.5)
+
+    # Test cache LRU terbatas: entri paling lama tidak dipakai dibuang
+    def test_value_cache_lru_bound(self):
+        cache = ValueCache(maxsize=2)
+        colors = lambda *values: pd.Series(list(values), dtype=object)
+        cache.clean('Colors', colors("1 Colors", "2 Colors"), clean_colors_series, 'int64')
+        cache.clean('Colors', colors("1 Colors"), clean_colors_series, 'int64')
+        result = cache.clean('Colors', colors("3 Colors", "1 Colors"), clean_colors_series, 'int64')
+        self.assertEqual(list(result), [3, 1])
+        self.assertEqual(len(cache), 2)
+        self.assertEqual(set(key[-1] for key in cache._entries), {"1 Colors", "3 Colors"})
+        cache.clear()
+        self.assertEqual((len(cache), cache.stats), (0, {}))
+
+    # Test engine memoized dipakai transform streaming: cache bertahan lintas chunk
+    def test_iter_clean_chunks_memoized(self):
+        source = read_raw_csv_chunks('products_raw.csv', chunk_size=500)
+        expected = pd.concat(iter_clean_chunks(read_raw_csv_chunks('products_raw.csv', chunk_size=500)))
+        with patch.object(transform, 'value_cache', ValueCache()):
+            memoized = pd.concat(iter_clean_chunks(source, chunk_size=500, engine='memoized'))
+            stats = transform.value_cache.report()
+        pd.testing.assert_frame_equal(memoized, expected)
+        self.assertGreater(stats['Gender']['hits'], 0)
+
+    # Test spec default menghasilkan data yang sama dengan aturan lama (exclude, cleaning penuh, lalu filter)
+    def test_default_spec_matches_full_cleaning(self):
+        raw = pd.read_csv('products_raw.csv', dtype=str).drop_duplicates()
+        legacy = compile_spec().clean_columns(raw[raw['Title'] != "Unknown Product"].copy())
+        legacy = legacy[(legacy['Price'] > 0) & (legacy['Rating'] > 0)]
+        for engine in ('vectorized', 'scalar', 'memoized'):
+            with patch.object(transform, 'value_cache', ValueCache()):
+                pd.testing.assert_frame_equal(compile_spec(TRANSFORM_SPEC, engine).run(raw), legacy)
+        pd.testing.assert_frame_equal(transform.transform_frame(raw), legacy)
+
+    # Test spec kustom: kurs lain, filter tambahan dan kunci dedupe
+    def test_custom_spec(self):
+        spec = dict(TRANSFORM_SPEC, dedupe=['Title'],
+                    columns=dict(TRANSFORM_SPEC['columns'], Price={'parser': 'price', 'rate': 10}),
+                    filters=[('Price', '>', 0), ('Rating', '>=', 4.5)])
+        data = [
+            {"Title": "A", "Price": "$10.00", "Rating": "Rating: ⭐ 4.8 / 5", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men"},
+            {"Title": "A", "Price": "$12.00", "Rating": "Rating: ⭐ 4.9 / 5", "Colors": "3 Colors", "Size": "Size: M", "Gender": "Gender: Men"},
+            {"Title": "B", "Price": "$20.00", "Rating": "Rating: ⭐ 3.0 / 5", "Colors": "1 Colors", "Size": "Size: L", "Gender": "Gender: Women"},
+        ]
+        df = process_dataframe(data, spec=spec)
+        self.assertEqual(df['Title'].tolist(), ["A"])
+        self.assertEqual(df['Price'].tolist(), [100.0])
+
+        chunks = list(iter_clean_chunks(iter(data), chunk_size=1, spec=compile_spec(spec)))
+        self.assertEqual([chunk['Title'].iloc[0] for chunk in chunks], ["A"])
+
+    # Test plan: baris yang dibuang exclude/filter tidak ikut dibersihkan oleh pass kolom lain
+    def test_plan_filters_before_other_passes(self):
+        probe = Mock(side_effect=lambda series: series.str.len())
+        spec = {
+            'exclude': {'Title': ['Unknown Product']},
+            'columns': {'Price': {'parser': 'price'}, 'Size': {'parser': 'probe'}},
+            'filters': [('Price', '>', 0)],
+        }
+        raw = pd.DataFrame({
+            'Title': ['Unknown Product', 'A', 'B'],
+            'Price': ['$1.00', 'Price Unavailable', '$2.00'],
+            'Size': ['Size: S', 'Size: M', 'Size: XL'],
+        })
+        with patch.dict(VALUE_PARSERS, probe=(len, probe, 'int64')):
+            plan = compile_spec(spec)
+            df = plan.run(raw)
+        self.assertEqual(df['Title'].tolist(), ['B'])
+        self.assertEqual(probe.call_args.args[0].tolist(), ['Size: XL'])
+        self.assertEqual(plan.describe(), ["exclude Title in ['Unknown Product']", "clean Price", "filter Price > 0", "clean Size"])
+
+    # Test spec tidak valid ditolak saat kompilasi
+    def test_compile_spec_invalid(self):
+        with self.assertRaises(ValueError):
+            compile_spec({'columns': {'Price': {'parser': 'currency'}}})
+        with self.assertRaises(ValueError):
+            compile_spec({'filters': [('Price', '~', 0)]})
+        with self.assertRaises(ValueError):
+            compile_spec(engine='gpu')
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,148 @@
+import json
+import logging
+import os
+import sqlite3
+import threading
+import numpy as np
+import pandas as pd
+from utils.load import NATURAL_KEY
+
+# Fungsi untuk menghitung hash 64-bit per baris dari kolom tertentu (signed, agar muat di INTEGER SQLite).
+# Nilai dinormalisasi ke teks dulu, sehingga skema compact (category/float32) menghasilkan hash yang sama.
+def _hash_columns(df, columns):
+    if not len(df):
+        return np.empty(0, dtype=np.int64)
+    values = df[list(columns)].astype(str)
+    return pd.util.hash_pandas_object(values, index=False).to_numpy().view(np.int64)
+
+# Delta antara katalog bersih run ini dan run sebelumnya.
+# inserts/updates berisi baris lengkap, deletes hanya kolom key produk yang hilang.
+class ChangeSet:
+    def __init__(self, inserts, updates, deletes, unchanged=0, entries=None, removed=None):
+        self.inserts = inserts
+        self.updates = updates
+        self.deletes = deletes
+        self.unchanged = unchanged
+        # Baris index yang ditulis saat FingerprintIndex.commit() (key_hash, row_hash, key JSON)
+        self._entries = entries or []
+        self._removed = removed if removed is not None else []
+
+    def __len__(self):
+        return len(self.inserts) + len(self.updates) + len(self.deletes)
+
+    # Baris baru + berubah (untuk upsert)
+    @property
+    def upserts(self):
+        return pd.concat([self.inserts, self.updates])
+
+    # Satu DataFrame berisi semua perubahan dengan kolom change = insert/update/delete
+    def to_frame(self):
+        return pd.concat([
+            self.inserts.assign(change='insert'),
+            self.updates.assign(change='update'),
+            self.deletes.assign(change='delete'),
+        ], ignore_index=True)
+
+    def summary(self):
+        total = len(self.inserts) + len(self.updates) + self.unchanged
+        return {
+            'inserts': len(self.inserts),
+            'updates': len(self.updates),
+            'deletes': len(self.deletes),
+            'unchanged': self.unchanged,
+            'churn': round(len(self) / total, 4) if total else 0.0,
+        }
+
+# Index fingerprint persisten (SQLite) dari produk bersih yang sudah dimuat, dikunci per natural key
+# (Title + atribut). Setiap run membandingkan hash isi baris dengan index untuk menghasilkan delta
+# insert/update/delete, sehingga loader hanya menulis produk yang benar-benar berubah.
+# ignore_columns tidak ikut dibandingkan (timestamp berubah setiap scraping walaupun produknya sama).
+# Index baru diperbarui lewat commit() setelah delta berhasil dimuat; jika load gagal, delta yang
+# sama muncul lagi di run berikutnya.
+class FingerprintIndex:
+    def __init__(self, path='.http_cache/cdc_index.sqlite', key_columns=NATURAL_KEY, ignore_columns=('timestamp',)):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.key_columns = list(key_columns)
+        self.ignore_columns = tuple(ignore_columns)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fingerprints (
+                key_hash INTEGER PRIMARY KEY,
+                row_hash INTEGER NOT NULL,
+                key TEXT NOT NULL
+            )
+        """)
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    # Hash yang tersimpan (tanpa kolom key JSON, yang hanya dibutuhkan untuk produk yang dihapus)
+    def _stored(self):
+        with self._lock:
+            rows = self._conn.execute("SELECT key_hash, row_hash FROM fingerprints").fetchall()
+        return pd.DataFrame(np.array(rows, dtype=np.int64).reshape(-1, 2), columns=['key_hash', 'row_hash'])
+
+    # Fungsi untuk mengambil natural key (JSON) produk yang dihapus, per blok agar jumlah parameter SQL tetap kecil
+    def _keys(self, key_hashes, block_size=500):
+        keys = []
+        with self._lock:
+            for start in range(0, len(key_hashes), block_size):
+                block = key_hashes[start:start + block_size]
+                keys.extend(row[0] for row in self._conn.execute(
+                    f"SELECT key FROM fingerprints WHERE key_hash IN ({', '.join('?' * len(block))})", block))
+        return keys
+
+    # Fungsi untuk menghitung delta df terhadap index.
+    # full=True berarti df adalah katalog lengkap, jadi produk di index yang tidak ada di df menjadi delete;
+    # full=False (mis. satu micro-batch streaming) hanya menghasilkan insert/update.
+    def diff(self, df, full=True):
+        df = df.drop_duplicates(subset=self.key_columns, keep='last')
+        value_columns = [column for column in df.columns if column not in self.ignore_columns]
+        key_hashes = _hash_columns(df, self.key_columns)
+        row_hashes = _hash_columns(df, value_columns)
+
+        stored = self._stored()
+        positions = pd.Index(stored['key_hash']).get_indexer(key_hashes)
+        new = positions < 0
+        changed = np.zeros(len(df), dtype=bool)
+        changed[~new] = stored['row_hash'].to_numpy()[positions[~new]] != row_hashes[~new]
+
+        if full:
+            removed = stored.loc[~stored['key_hash'].isin(key_hashes), 'key_hash'].tolist()
+        else:
+            removed = []
+        deletes = pd.DataFrame([json.loads(key) for key in self._keys(removed)], columns=self.key_columns)
+
+        touched = new | changed
+        keys = df.loc[touched, self.key_columns]
+        # Satu encoder untuk semua baris (json.dumps dengan default= membuat encoder baru setiap panggilan)
+        encode = json.JSONEncoder(default=str).encode
+        entries = list(zip(key_hashes[touched].tolist(), row_hashes[touched].tolist(),
+                           (encode(list(key)) for key in keys.itertuples(index=False, name=None))))
+        return ChangeSet(
+            inserts=df[new],
+            updates=df[changed],
+            deletes=deletes,
+            unchanged=int((~touched).sum()),
+            entries=entries,
+            removed=removed,
+        )
+
+    # Fungsi untuk mencatat delta yang sudah berhasil dimuat ke index (satu transaksi).
+    # Entry diurutkan per key_hash sehingga insert ke B-tree SQLite berurutan, bukan acak.
+    def commit(self, changes):
+        with self._lock:
+            self._conn.executemany("INSERT OR REPLACE INTO fingerprints (key_hash, row_hash, key) VALUES (?, ?, ?)", sorted(changes._entries))
+            self._conn.executemany("DELETE FROM fingerprints WHERE key_hash = ?", [(key,) for key in changes._removed])
+            self._conn.commit()
+        logging.info(f"CDC index updated: {len(changes._entries)} upserted, {len(changes._removed)} removed")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
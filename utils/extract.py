@@ -1,97 +1,660 @@
 import requests
-from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from contextlib import closing
 from datetime import datetime
+import json
+import multiprocessing
+import os
+import queue
+import random
+import re
+from urllib.parse import urlsplit
+import threading
+import time
 import logging
+from utils.parsers import DEFAULT_PARSER, get_parser, parser_key
+from utils.http_cache import body_hash, parse_retry_after
+from utils.metrics import instrument, result_rows, content_bytes
 
 # Konfigurasi Logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-# Fungsi untuk mendapatkan konten halaman
-def get_page_content(session, url):
+# Header default untuk semua Session scraping
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Pembatas laju request (request per detik) yang aman dipakai bersama oleh banyak thread
+class RateLimiter:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate else 0.0
+        self._next_time = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            wait_time = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if wait_time > 0:
+            time.sleep(wait_time)
+
+# Pembatas jumlah koneksi simultan per host
+class HostLimiter:
+    def __init__(self, max_per_host):
+        self.max_per_host = max_per_host
+        self._semaphores = {}
+        self._lock = threading.Lock()
+
+    def acquire(self, url):
+        if not self.max_per_host:
+            return None
+        host = urlsplit(url).netloc
+        with self._lock:
+            semaphore = self._semaphores.setdefault(host, threading.BoundedSemaphore(self.max_per_host))
+        semaphore.acquire()
+        return semaphore
+
+# Circuit breaker per host: setelah failure_threshold kegagalan berturut-turut host dianggap "open"
+# dan request langsung ditolak selama reset_timeout detik; setelah itu satu request percobaan
+# (half-open) diizinkan, dan sukses menutup kembali circuit.
+class CircuitBreaker:
+    def __init__(self, failure_threshold=5, reset_timeout=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = {}
+        self._opened_at = {}
+        self._lock = threading.Lock()
+
+    def allow(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            opened_at = self._opened_at.get(host)
+            if opened_at is None:
+                return True
+            if time.monotonic() - opened_at >= self.reset_timeout:
+                # Half-open: satu request percobaan, request lain tetap ditolak sampai hasilnya diketahui
+                self._opened_at[host] = time.monotonic()
+                return True
+            return False
+
+    def record_success(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures.pop(host, None)
+            self._opened_at.pop(host, None)
+
+    def record_failure(self, url):
+        host = urlsplit(url).netloc
+        with self._lock:
+            self._failures[host] = self._failures.get(host, 0) + 1
+            if self._failures[host] >= self.failure_threshold and host not in self._opened_at:
+                logging.warning(f"Circuit opened for {host} after {self._failures[host]} consecutive failures")
+                self._opened_at[host] = time.monotonic()
+
+    def is_open(self, url):
+        with self._lock:
+            return urlsplit(url).netloc in self._opened_at
+
+# Kebijakan fetch: jumlah retry, exponential backoff dengan full jitter, penghormatan header
+# Retry-After, timeout (connect, read), dan circuit breaker per host.
+# Hanya error sementara yang dicoba ulang: koneksi/timeout dan status pada retry_statuses.
+class FetchPolicy:
+    def __init__(self, retries=3, backoff=0.5, max_backoff=30.0, timeout=(3.05, 10), retry_statuses=(429, 500, 502, 503, 504),
+                 failure_threshold=5, reset_timeout=30.0):
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.retry_statuses = set(retry_statuses)
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+
+    def is_retryable(self, error):
+        if isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+            return True
+        response = getattr(error, 'response', None)
+        return response is not None and response.status_code in self.retry_statuses
+
+    # Waktu tunggu sebelum percobaan ke-(attempt + 2): Retry-After jika ada, selain itu full jitter
+    def delay(self, attempt, response=None):
+        retry_after = response.headers.get('Retry-After') if response is not None else None
+        seconds = parse_retry_after(retry_after, self.max_backoff) if retry_after else None
+        if seconds is not None:
+            return seconds
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+# Hasil fetch per halaman (ok / empty / failed) yang disimpan ke disk, sehingga run berikutnya
+# dapat mengambil ulang hanya halaman yang gagal: scrape_fashion_data(..., pages=outcomes.failed_pages()).
+class PageOutcomes:
+    def __init__(self, path):
+        self.path = path
+        self.base_url = None
+        self.pages = {}
+
+    def load(self, base_url):
+        self.base_url = base_url
+        self.pages = {}
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                state = json.load(f)
+            if state.get('base_url') == base_url:
+                self.pages = {int(page): outcome for page, outcome in state['pages'].items()}
+        return self
+
+    def record(self, page, status, items=0):
+        self.pages[page] = {'status': status, 'items': items, 'at': datetime.now().strftime("%Y-%m-%d %H:%M:%S")}
+
+    def failed_pages(self):
+        return sorted(page for page, outcome in self.pages.items() if outcome['status'] == 'failed')
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'base_url': self.base_url, 'pages': {str(page): outcome for page, outcome in sorted(self.pages.items())}}, f, indent=1)
+        os.replace(tmp_path, self.path)
+
+# Fungsi untuk membentuk URL halaman katalog.
+# Default skema fashion-studio (/pageN, halaman 1 = base_url); url_template untuk skema lain,
+# mis. "{base_url}/catalog?page={page}", dipakai untuk semua halaman.
+def build_page_url(base_url, page, url_template=None):
+    if url_template:
+        return url_template.format(base_url=base_url, page=page)
+    return f"{base_url}/page{page}" if page > 1 else base_url
+
+# Pola penanda pagination, contoh: "Page 1 of 50"
+PAGINATION_PATTERN = re.compile(rb'Page\s+\d+\s+of\s+(\d+)')
+
+# Fungsi untuk membaca jumlah halaman sebenarnya dari markup pagination (None jika tidak ada)
+def discover_last_page(content):
+    match = PAGINATION_PATTERN.search(content) if content else None
+    return int(match.group(1)) if match else None
+
+# Generator nomor halaman yang batas akhirnya dapat diperkecil selama crawl berjalan
+# (misalnya setelah halaman terakhir ditemukan dari pagination)
+def _page_numbers(start_page, progress):
+    page = start_page
+    while page <= progress.end_page:
+        yield page
+        page += 1
+
+# Membungkus iterator konten halaman: halaman terakhir dari pagination memperkecil batas crawl
+def _discover_pages(page_iter, progress):
     try:
-        response = session.get(url, timeout=10) 
+        for page, content in page_iter:
+            progress.discover(discover_last_page(content))
+            if page <= progress.end_page:
+                yield page, content
+    finally:
+        page_iter.close()
+
+# Checkpoint crawl di disk: halaman yang sudah selesai beserta record-nya, sehingga crawl
+# yang terhenti dapat dilanjutkan tanpa mengulang dari halaman pertama.
+# State disimpan sebagai JSON (ditulis atomik), record disimpan sebagai JSON Lines di <path>.records.
+class CrawlCheckpoint:
+    def __init__(self, path):
+        self.path = path
+        self.records_path = f"{path}.records"
+        self.base_url = None
+        self.last_page = 0
+        self.done_pages = set()
+        self.end_page = None
+
+    # Memuat checkpoint untuk base_url yang sama; mengembalikan record yang sudah tersimpan
+    def load(self, base_url):
+        self.base_url = base_url
+        if not os.path.exists(self.path):
+            return []
+        with open(self.path, encoding='utf-8') as f:
+            state = json.load(f)
+        if state.get('base_url') != base_url:
+            logging.warning(f"Checkpoint {self.path} belongs to {state.get('base_url')}, starting fresh")
+            self.clear()
+            return []
+
+        self.last_page = state['last_page']
+        self.done_pages = set(state.get('done_pages', []))
+        self.end_page = state.get('end_page')
+        records = []
+        if os.path.exists(self.records_path):
+            with open(self.records_path, encoding='utf-8') as f:
+                records = [json.loads(line) for line in f if line.strip()]
+        logging.info(f"Resuming crawl from checkpoint: last completed page {self.last_page}, {len(records)} records")
+        return records
+
+    def is_done(self, page):
+        return page <= self.last_page or page in self.done_pages
+
+    # Mencatat satu halaman selesai; last_page hanya maju jika semua halaman sebelumnya juga selesai
+    def mark_done(self, page, items, end_page=None):
+        if items:
+            with open(self.records_path, 'a', encoding='utf-8') as f:
+                for item in items:
+                    f.write(json.dumps(item) + '\n')
+        self.done_pages.add(page)
+        while self.last_page + 1 in self.done_pages:
+            self.last_page += 1
+            self.done_pages.discard(self.last_page)
+        self.done_pages = {done for done in self.done_pages if done > self.last_page}
+        self.end_page = end_page
+
+        state = {
+            'base_url': self.base_url,
+            'last_page': self.last_page,
+            'done_pages': sorted(self.done_pages),
+            'end_page': end_page,
+        }
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.path)
+
+    def clear(self):
+        for path in (self.path, self.records_path):
+            if os.path.exists(path):
+                os.remove(path)
+        self.last_page = 0
+        self.done_pages = set()
+        self.end_page = None
+
+# Bookkeeping crawl satu sumber, dipakai bersama oleh iter_fashion_data dan CrawlScheduler:
+# resume dari checkpoint, batas halaman (end_page), limit, outcomes dan checkpoint per halaman,
+# serta penghentian crawl (limit tercapai atau katalog habis setelah max_empty_pages halaman kosong).
+# finished menandai sumber benar-benar selesai, sehingga checkpoint dihapus saat close(); tidak berlaku
+# jika ada halaman gagal di dalam deret halaman kosong atau circuit breaker host masih open.
+# Selama masih ada halaman gagal (dan limit belum tercapai) checkpoint juga dipertahankan, sehingga
+# run berikutnya hanya mengambil ulang halaman yang gagal.
+class CrawlProgress:
+    def __init__(self, base_url, start_page=1, end_page=50, limit=1000, checkpoint=None, outcomes=None,
+                 max_empty_pages=None, name=None, breaker=None):
+        self.base_url = base_url
+        self.limit = limit
+        self.checkpoint = CrawlCheckpoint(checkpoint) if isinstance(checkpoint, str) else checkpoint
+        self.outcomes = PageOutcomes(outcomes) if isinstance(outcomes, str) else outcomes
+        self.max_empty_pages = max_empty_pages
+        self.breaker = breaker
+        self.prefix = f"[{name}] " if name else ""
+        self.end_page = end_page if limit > 0 else start_page - 1
+        self.count = 0
+        self.empty_streak = 0
+        self.streak_failures = 0
+        self.failed_pages = set()
+        self.stopped = False
+        self.finished = False
+
+    # Memuat outcomes dan checkpoint; mengembalikan produk dari crawl sebelumnya (dipotong sesuai limit)
+    def resume(self):
+        if self.outcomes is not None:
+            self.outcomes.load(self.base_url)
+        if self.checkpoint is None:
+            return []
+        resumed = self.checkpoint.load(self.base_url)[:self.limit]
+        self.count = len(resumed)
+        if self.checkpoint.end_page is not None:
+            self.end_page = min(self.end_page, self.checkpoint.end_page)
+        return resumed
+
+    def is_done(self, page):
+        return self.checkpoint is not None and self.checkpoint.is_done(page)
+
+    # Halaman terakhir dari pagination memperkecil batas crawl
+    def discover(self, last_page):
+        if last_page is not None and last_page < self.end_page:
+            logging.info(f"{self.prefix}Pagination reports {last_page} pages, stopping crawl after page {last_page}")
+            self.end_page = last_page
+
+    # Mencatat hasil satu halaman (items None = fetch gagal); mengembalikan produk setelah dipotong limit
+    def record(self, page, items):
+        failed = items is None
+        items = (items or [])[:max(self.limit - self.count, 0)]
+        self.count += len(items)
+        if self.outcomes is not None:
+            self.outcomes.record(page, 'failed' if failed else 'ok' if items else 'empty', len(items))
+        # Halaman gagal tidak ditandai selesai di checkpoint agar diambil ulang
+        if self.checkpoint is not None and not failed:
+            self.checkpoint.mark_done(page, items, self.end_page)
+
+        # Hentikan crawl jika katalog sudah habis (N halaman kosong berturut-turut). Halaman gagal tidak
+        # menambah maupun mereset deret, karena isinya tidak diketahui.
+        if failed:
+            self.failed_pages.add(page)
+            self.streak_failures += 1
+        elif items:
+            self.failed_pages.discard(page)
+            self.empty_streak = self.streak_failures = 0
+        else:
+            self.failed_pages.discard(page)
+            self.empty_streak += 1
+        if self.max_empty_pages and self.empty_streak >= self.max_empty_pages:
+            logging.info(f"{self.prefix}Stopping crawl after {self.empty_streak} consecutive empty pages (last page {page})")
+            if self.streak_failures:
+                logging.warning(f"{self.prefix}{self.streak_failures} pages failed within the empty pages, keeping checkpoint")
+            self.stopped = True
+            self.finished = not self.streak_failures
+        elif self.count >= self.limit:
+            self.stopped = self.finished = True
+        return items
+
+    # Semua halaman sudah diproses tanpa error fatal
+    def exhausted(self):
+        if not self.stopped:
+            self.finished = True
+
+    # Menyimpan outcomes; checkpoint tidak diperlukan lagi jika crawl sumber ini selesai normal
+    def close(self):
+        if self.outcomes is not None:
+            self.outcomes.save()
+            failed_pages = self.outcomes.failed_pages()
+            if failed_pages:
+                logging.warning(f"{self.prefix}{len(failed_pages)} pages failed to fetch: {failed_pages}")
+        if self.finished and self.breaker is not None and self.breaker.is_open(self.base_url):
+            logging.warning(f"{self.prefix}Circuit open for {urlsplit(self.base_url).netloc}, keeping checkpoint")
+            self.finished = False
+        if self.finished and self.failed_pages and self.count < self.limit:
+            logging.warning(f"{self.prefix}{len(self.failed_pages)} pages still failed, keeping checkpoint to re-fetch only those pages")
+            self.finished = False
+        if self.finished and self.checkpoint is not None:
+            self.checkpoint.clear()
+
+# Satu percobaan request halaman (melempar RequestException jika gagal)
+def _request_page(session, url, cache, timeout):
+    if cache is None:
+        response = session.get(url, timeout=timeout)
         response.raise_for_status()
         return response.content
-    except requests.exceptions.RequestException as e:
-        logging.error(f"Error fetching URL {url}: {e}")
-        return None
 
-# Fungsi utama untuk scraping data fashion
-def scrape_fashion_data(base_url, start_page=1, end_page=50, limit=1000):
-    data = []
-    
-    # Menggunakan Session untuk semua request
-    with requests.Session() as session:
-        session.headers.update({
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        })
+    content = cache.fresh_body(url)
+    if content is not None:
+        return content
+
+    response = session.get(url, timeout=timeout, headers=cache.conditional_headers(url))
+    if response.status_code == 304:
+        content = cache.revalidated(url)
+        if content is not None:
+            return content
+        response = session.get(url, timeout=timeout)
+    response.raise_for_status()
+    cache.store(url, response.headers, response.content)
+    return response.content
+
+# Fungsi untuk mendapatkan konten halaman.
+# Dengan cache (HttpCache), entri segar dipakai langsung dan entri lama divalidasi ulang
+# memakai conditional request; jawaban 304 diambil dari cache tanpa mengunduh ulang.
+# Dengan policy (FetchPolicy), error sementara dicoba ulang dengan backoff dan host yang terus
+# gagal diputus oleh circuit breaker. Tanpa policy: satu percobaan dengan timeout 10 detik.
+@instrument('fetch', nbytes=content_bytes)
+def get_page_content(session, url, cache=None, policy=None):
+    attempts = 1 + (policy.retries if policy is not None else 0)
+    for attempt in range(attempts):
+        if policy is not None and not policy.breaker.allow(url):
+            logging.error(f"Error fetching URL {url}: circuit open for {urlsplit(url).netloc}")
+            return None
+        try:
+            content = _request_page(session, url, cache, policy.timeout if policy is not None else 10)
+            if policy is not None:
+                policy.breaker.record_success(url)
+            return content
+        except requests.exceptions.RequestException as e:
+            retryable = policy is not None and policy.is_retryable(e)
+            if retryable:
+                policy.breaker.record_failure(url)
+            if not retryable or attempt == attempts - 1:
+                logging.error(f"Error fetching URL {url}: {e}")
+                return None
+            delay = policy.delay(attempt, getattr(e, 'response', None))
+            logging.warning(f"Retrying {url} in {delay:.2f}s (attempt {attempt + 2}/{attempts}): {e}")
+            time.sleep(delay)
+
+# Fungsi untuk mengambil satu halaman dengan memperhatikan rate limit dan batas per host
+def _fetch_page(session, url, rate_limiter, host_limiter, cache=None, policy=None):
+    options = {}
+    if cache is not None:
+        options['cache'] = cache
+    if policy is not None:
+        options['policy'] = policy
+    semaphore = host_limiter.acquire(url)
+    try:
+        rate_limiter.wait()
+        return get_page_content(session, url, **options)
+    finally:
+        if semaphore is not None:
+            semaphore.release()
+
+# Generator konten halaman (page, content) sesuai urutan halaman.
+# Dengan workers > 1, halaman diambil paralel memakai thread pool dengan jendela
+# request terbatas, namun hasil tetap dikembalikan berurutan.
+def iter_page_contents(session, base_url, pages, workers=1, per_host_limit=None, rate_limit=None, cache=None, fetch_policy=None):
+    rate_limiter = RateLimiter(rate_limit)
+    host_limiter = HostLimiter(per_host_limit)
+
+    if workers <= 1:
+        for page in pages:
+            logging.info(f"Scraping page: {page}")
+            yield page, _fetch_page(session, build_page_url(base_url, page), rate_limiter, host_limiter, cache, fetch_policy)
+        return
 
+    pages = iter(pages)
+    pending = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
         try:
-            for page in range(start_page, end_page + 1):
-                if len(data) >= limit:
+            # Isi jendela awal, lalu tambahkan satu halaman setiap kali satu hasil diambil
+            for page in pages:
+                pending.append((page, executor.submit(_fetch_page, session, build_page_url(base_url, page), rate_limiter, host_limiter, cache, fetch_policy)))
+                if len(pending) >= workers * 2:
                     break
-                
-                url = f"{base_url}/page{page}" if page > 1 else base_url # Typo fix: page/
+
+            while pending:
+                page, future = pending.popleft()
                 logging.info(f"Scraping page: {page}")
-                
-                # Mengambil konten halaman
-                content = get_page_content(session, url)
-                
-                if not content:
-                    continue
-                
-                # Parsing HTML dengan BeautifulSoup
-                soup = BeautifulSoup(content, 'html.parser')
-                products = soup.find_all('div', class_='collection-card') 
+                content = future.result()
+                next_page = next(pages, None)
+                if next_page is not None:
+                    pending.append((next_page, executor.submit(_fetch_page, session, build_page_url(base_url, next_page), rate_limiter, host_limiter, cache, fetch_policy)))
+                yield page, content
+        finally:
+            # Batalkan request yang belum berjalan jika konsumen berhenti lebih awal (limit tercapai)
+            for _, future in pending:
+                future.cancel()
+
+# Fungsi untuk parsing satu halaman HTML menjadi daftar produk memakai backend parser terpilih.
+# Berdiri sendiri (tanpa state) agar dapat dijalankan di process pool.
+@instrument('parse', rows=result_rows, nbytes=content_bytes)
+def parse_products(content, page=None, parser=DEFAULT_PARSER):
+    return get_parser(parser)(content, page)
+
+# Fungsi untuk mencari hasil parsing halaman di cache; mengembalikan (key, items), items None jika belum ada.
+# key (url, hash body, parser) dipakai _store_cached_records setelah halaman diparsing.
+def _cached_records(cache, content, url, parser):
+    key = (url, body_hash(content), parser_key(parser))
+    return key, cache.get_records(*key)
+
+def _store_cached_records(cache, key, items):
+    url, digest, parser = key
+    cache.store_records(url, digest, items, parser)
 
-                if not products:
-                    logging.warning(f"No products found on page {page}")
+# Fungsi parsing dengan cache: halaman yang isinya sama dengan run sebelumnya tidak diparsing ulang.
+# parse menggantikan parse_products, mis. untuk menjalankan parsing di process pool.
+def _parse_page(content, page, url, parser, cache, parse=None):
+    parse = parse or parse_products
+    if cache is None:
+        return parse(content, page, parser)
+    key, items = _cached_records(cache, content, url, parser)
+    if items is None:
+        items = parse(content, page, parser)
+        _store_cached_records(cache, key, items)
+    return items
+
+# Process pool untuk parsing. Konteks 'spawn' dipakai karena proses dibuat saat thread fetch sedang berjalan
+def _parse_process_pool(parse_workers):
+    return ProcessPoolExecutor(max_workers=parse_workers, mp_context=multiprocessing.get_context('spawn'))
+
+# Penanda akhir antrean dari producer
+_QUEUE_DONE = object()
+
+# Producer: mengambil halaman lalu memasukkan (page, content) ke antrean terbatas.
+# put() akan blok saat antrean penuh sehingga fetch menunggu parser (backpressure).
+def _produce_pages(page_iter, page_queue, stop_event):
+    try:
+        for page, content in page_iter:
+            while not stop_event.is_set():
+                try:
+                    page_queue.put((page, content), timeout=0.1)
+                    break
+                except queue.Full:
                     continue
+            if stop_event.is_set():
+                break
+    except Exception as e:
+        page_queue.put(e)
+    finally:
+        page_iter.close()
+        page_queue.put(_QUEUE_DONE)
+
+# Consumer: parsing halaman dari antrean memakai process pool, hasil dikirim
+# berurutan halaman (ordered=True) atau sesuai urutan selesai (ordered=False)
+def _iter_parsed_pipeline(page_iter, parse_workers, queue_size, ordered, parser, base_url=None, cache=None):
+    page_queue = queue.Queue(maxsize=queue_size)
+    stop_event = threading.Event()
+    producer = threading.Thread(target=_produce_pages, args=(page_iter, page_queue, stop_event), daemon=True)
 
-                for product in products:
-                    if len(data) >= limit:
+    executor = _parse_process_pool(parse_workers)
+    in_flight = {}
+    order = deque()
+    completed = {}
+    cache_keys = {}
+    producer_done = False
+    producer.start()
+    try:
+        while not producer_done or in_flight:
+            # Ambil halaman dari antrean selama slot parser masih tersedia
+            while not producer_done and len(in_flight) < parse_workers * 2:
+                item = page_queue.get()
+                if item is _QUEUE_DONE:
+                    producer_done = True
+                elif isinstance(item, Exception):
+                    raise item
+                else:
+                    page, content = item
+                    order.append(page)
+                    if not content:
+                        # Fetch gagal (None) atau halaman kosong: tidak perlu diparsing
+                        completed[page] = None if content is None else []
                         break
+                    if cache is not None:
+                        key, items = _cached_records(cache, content, build_page_url(base_url, page), parser)
+                        if items is not None:
+                            # Halaman tidak berubah: lewati process pool dan langsung kirim hasilnya
+                            completed[page] = items
+                            break
+                        cache_keys[page] = key
+                    in_flight[executor.submit(parse_products, content, page, parser)] = page
+
+            if in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page = in_flight.pop(future)
+                    completed[page] = future.result()
+                    if page in cache_keys:
+                        _store_cached_records(cache, cache_keys.pop(page), completed[page])
+
+            if not ordered:
+                for page in list(completed):
+                    order.remove(page)
+                    yield page, completed.pop(page)
+
+            while ordered and order and order[0] in completed:
+                page = order.popleft()
+                yield page, completed.pop(page)
+    finally:
+        stop_event.set()
+        # Kosongkan antrean agar producer yang sedang blok bisa selesai
+        while producer.is_alive():
+            try:
+                page_queue.get(timeout=0.1)
+            except queue.Empty:
+                pass
+        for future in in_flight:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+# Fungsi generator scraping: menghasilkan list produk per halaman segera setelah halaman diparsing,
+# tanpa menampung seluruh hasil di memori (dipakai pipeline streaming dan scrape_fashion_data).
+# Parameter sama dengan scrape_fashion_data. Produk dari checkpoint (crawl sebelumnya) dihasilkan lebih dulu.
+def iter_fashion_data(base_url, start_page=1, end_page=50, limit=1000, workers=1, per_host_limit=None, rate_limit=None,
+                      parse_workers=0, queue_size=16, ordered=True, parser=DEFAULT_PARSER, cache=None,
+                      discover_pages=True, max_empty_pages=None, checkpoint=None, fetch_policy=None, outcomes=None, pages=None):
+    progress = CrawlProgress(base_url, start_page, end_page, limit, checkpoint, outcomes, max_empty_pages,
+                             breaker=fetch_policy.breaker if fetch_policy is not None else None)
+
+    # Menggunakan Session untuk semua request
+    with requests.Session() as session:
+        session.headers.update(DEFAULT_HEADERS)
+        if workers > 1:
+            # Perbesar pool koneksi agar setiap worker mendapat koneksi keep-alive sendiri
+            adapter = requests.adapters.HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+
+        try:
+            get_parser(parser)
+            resumed = progress.resume()
+            if resumed:
+                yield resumed
+
+            # pages: daftar halaman eksplisit (mis. outcomes.failed_pages() dari run sebelumnya)
+            page_numbers = iter(sorted(pages)) if pages is not None else _page_numbers(start_page, progress)
+            pending_pages = (page for page in page_numbers if not progress.is_done(page))
+            page_iter = iter_page_contents(session, base_url, pending_pages, workers, per_host_limit, rate_limit, cache, fetch_policy)
+            if discover_pages and pages is None:
+                page_iter = _discover_pages(page_iter, progress)
+
+            if parse_workers > 0:
+                parsed_pages = _iter_parsed_pipeline(page_iter, parse_workers, queue_size, ordered, parser, base_url, cache)
+            else:
+                parsed_pages = ((page, None if content is None else
+                                 _parse_page(content, page, build_page_url(base_url, page), parser, cache) if content else [])
+                                for page, content in page_iter)
+
+            with closing(parsed_pages):
+                for page, items in parsed_pages:
+                    items = progress.record(page, items)
+                    if items:
+                        yield items
+                    # Berhenti sebelum halaman berikutnya diambil (limit tercapai atau katalog habis)
+                    if progress.stopped:
+                        break
+            progress.exhausted()
 
-                    try:
-                        # Mengambil title produk
-                        title_elem = product.find('h3', class_='product-title')
-                        title = title_elem.get_text(strip=True)
-
-                        # Logika Harga (Span vs P)
-                        price_elem = product.find('span', class_='price')
-                        if not price_elem:
-                            price_elem = product.find('p', class_='price')
-                        
-                        price = price_elem.get_text(strip=True)
-
-                        # Logika Detail Produk (untuk tags p)
-                        details_container = product.find('div', class_='product-details')
-
-                        if details_container:
-                            paragraphs = details_container.find_all('p')
-                            for p in paragraphs:
-                                text = p.get_text(strip=True)
-                                if "Rating:" in text: rating = text
-                                elif "Colors" in text: colors = text
-                                elif "Size:" in text: size = text
-                                elif "Gender:" in text: gender = text
-
-                        item = {
-                            "Title": title,
-                            "Price": price,
-                            "Rating": rating,
-                            "Colors": colors,
-                            "Size": size,
-                            "Gender": gender,
-                            "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-                        }
-                        data.append(item)
-                        
-                    except Exception as e:
-                        logging.error(f"Error parsing product item: {e}")
-                        continue
-                        
         except Exception as e:
             logging.error(f"Critical error in scraping process: {e}")
-    
-    return data
\ No newline at end of file
+        finally:
+            progress.close()
+
+    if cache is not None:
+        cache.report()
+
+# Fungsi utama untuk scraping data fashion.
+# parse_workers > 0 mengaktifkan pipeline producer/consumer: fetch dan parsing berjalan
+# bersamaan, dengan queue_size sebagai batas halaman yang menunggu untuk diparsing.
+# parser memilih backend parsing HTML yang terdaftar di utils.parsers ('bs4' atau 'lxml').
+# cache (utils.http_cache.HttpCache) mengaktifkan conditional request dan melewati parsing halaman yang tidak berubah.
+# discover_pages membatasi crawl pada jumlah halaman dari pagination, max_empty_pages menghentikan
+# crawl setelah N halaman kosong berturut-turut (halaman gagal tidak dihitung), dan checkpoint (CrawlCheckpoint atau path)
+# menyimpan progres agar crawl yang terhenti bisa dilanjutkan.
+# fetch_policy (FetchPolicy) mengaktifkan retry/backoff dan circuit breaker, outcomes (PageOutcomes atau path)
+# mencatat hasil per halaman, dan pages membatasi crawl pada daftar halaman tertentu (mis. yang gagal).
+@instrument('extract', rows=result_rows)
+def scrape_fashion_data(base_url, start_page=1, end_page=50, limit=1000, workers=1, per_host_limit=None, rate_limit=None,
+                        parse_workers=0, queue_size=16, ordered=True, parser=DEFAULT_PARSER, cache=None,
+                        discover_pages=True, max_empty_pages=None, checkpoint=None, fetch_policy=None, outcomes=None, pages=None):
+    data = []
+    for items in iter_fashion_data(base_url, start_page, end_page, limit, workers, per_host_limit, rate_limit,
+                                   parse_workers, queue_size, ordered, parser, cache,
+                                   discover_pages, max_empty_pages, checkpoint, fetch_policy, outcomes, pages):
+        data.extend(items)
+    return data
@@ -0,0 +1,181 @@
+from datetime import datetime
+from email.utils import parsedate_to_datetime
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+# Fungsi untuk menghitung hash isi halaman (dipakai untuk mendeteksi halaman yang tidak berubah)
+def body_hash(content):
+    return hashlib.sha256(content).hexdigest()
+
+# Fungsi untuk membaca header Retry-After (detik atau tanggal HTTP) sebagai detik tunggu, dibatasi 0..cap.
+# None jika formatnya tidak dikenali (pemanggil kembali ke backoff biasa).
+def parse_retry_after(value, cap):
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+            seconds = (retry_at - datetime.now(retry_at.tzinfo)).total_seconds()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), cap)
+
+# Cache respons HTTP persisten di disk (SQLite), dikunci per URL.
+# Menyimpan ETag/Last-Modified untuk conditional request, hash isi halaman, dan
+# hasil parsing halaman agar halaman yang tidak berubah tidak perlu diparsing ulang.
+# Hasil parsing hanya dipakai untuk parser (backend + versi) yang sama dengan yang menyimpannya.
+class HttpCache:
+    def __init__(self, path='.http_cache/pages.sqlite', max_bytes=256 * 1024 * 1024, max_age=0):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.stats = {'hits': 0, 'misses': 0, 'revalidated': 0, 'bytes_saved': 0, 'parse_skipped': 0, 'evicted': 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                body BLOB NOT NULL,
+                records TEXT,
+                parser TEXT,
+                size INTEGER NOT NULL,
+                fetched_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            )
+        """)
+        # Cache lama (sebelum kolom parser ada): hasil parsingnya dianggap tidak cocok dengan parser mana pun
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(responses)")}
+        if 'parser' not in columns:
+            self._conn.execute("ALTER TABLE responses ADD COLUMN parser TEXT")
+        self._conn.commit()
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+    def _row(self, url, columns):
+        with self._lock:
+            return self._conn.execute(f"SELECT {columns} FROM responses WHERE url = ?", (url,)).fetchone()
+
+    # Body dari cache jika entri masih segar (umur < max_age detik), tanpa request sama sekali
+    def fresh_body(self, url):
+        if not self.max_age:
+            return None
+        row = self._row(url, 'body, fetched_at')
+        if row is None or time.time() - row[1] >= self.max_age:
+            return None
+        self._touch(url)
+        self._count('hits')
+        self._count('bytes_saved', len(row[0]))
+        return row[0]
+
+    # Header conditional request (If-None-Match / If-Modified-Since) untuk URL yang sudah di-cache
+    def conditional_headers(self, url):
+        row = self._row(url, 'etag, last_modified')
+        headers = {}
+        if row is not None:
+            if row[0]:
+                headers['If-None-Match'] = row[0]
+            if row[1]:
+                headers['If-Modified-Since'] = row[1]
+        return headers
+
+    # Dipanggil saat server menjawab 304 Not Modified: body diambil dari cache
+    def revalidated(self, url):
+        row = self._row(url, 'body')
+        if row is None:
+            return None
+        with self._lock:
+            self._conn.execute("UPDATE responses SET fetched_at = ?, last_access = ? WHERE url = ?", (time.time(), time.time(), url))
+            self._conn.commit()
+        self._count('hits')
+        self._count('revalidated')
+        self._count('bytes_saved', len(row[0]))
+        return row[0]
+
+    # Menyimpan respons 200 baru; hasil parsing lama tetap dipakai jika hash body tidak berubah
+    def store(self, url, headers, content):
+        self._count('misses')
+        digest = body_hash(content)
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT body_hash, records, parser FROM responses WHERE url = ?", (url,)).fetchone()
+            records, parser = row[1:] if row is not None and row[0] == digest else (None, None)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (url, etag, last_modified, body_hash, body, records, parser, size, fetched_at, last_access) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, headers.get('ETag'), headers.get('Last-Modified'), digest, content, records, parser,
+                 len(content) + len(records or ''), now, now)
+            )
+            self._conn.commit()
+        self._evict()
+
+    # Hasil parsing tersimpan untuk URL, hanya jika hash body sama (halaman tidak berubah)
+    # dan diparsing oleh parser yang sama (lihat utils.parsers.parser_key)
+    def get_records(self, url, digest, parser=None):
+        row = self._row(url, 'body_hash, records, parser')
+        if row is None or row[0] != digest or row[1] is None or row[2] != parser:
+            return None
+        self._count('parse_skipped')
+        # Timestamp adalah waktu scraping, jadi diperbarui walaupun hasil parsing diambil dari cache
+        now = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        return [dict(item, timestamp=now) for item in json.loads(row[1])]
+
+    def store_records(self, url, digest, records, parser=None):
+        payload = json.dumps(records)
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET records = ?, parser = ?, size = length(body) + ? WHERE url = ? AND body_hash = ?",
+                (payload, parser, len(payload), url, digest)
+            )
+            self._conn.commit()
+        self._evict()
+
+    def _touch(self, url):
+        with self._lock:
+            self._conn.execute("UPDATE responses SET last_access = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    # Eviction berbasis ukuran: hapus entri yang paling lama tidak diakses sampai total <= max_bytes
+    def _evict(self):
+        with self._lock:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            evicted = 0
+            for url, size in self._conn.execute("SELECT url, size FROM responses ORDER BY last_access").fetchall():
+                if total <= self.max_bytes:
+                    break
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                total -= size
+                evicted += 1
+            self._conn.commit()
+            self.stats['evicted'] += evicted
+
+    def total_bytes(self):
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+
+    # Ringkasan hit/miss untuk laporan run
+    def report(self):
+        logging.info(
+            f"HTTP cache: {self.stats['hits']} hits ({self.stats['revalidated']} revalidated), "
+            f"{self.stats['misses']} misses, {self.stats['bytes_saved']} bytes saved, "
+            f"{self.stats['parse_skipped']} pages not re-parsed"
+        )
+        return dict(self.stats)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
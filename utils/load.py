@@ -1,9 +1,130 @@
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
-from sqlalchemy import create_engine
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import hashlib
+import io
+import json
 import logging
+from utils.metrics import instrument, frame_rows
+from utils.http_cache import parse_retry_after
+import os
+import threading
+import time
+
+# Library sink yang berat (gspread/oauth2client, SQLAlchemy, pyarrow) diimport di dalam fungsi yang
+# memakainya, sehingga run yang hanya menulis CSV tidak membayar waktu import semua sink.
+
+# Registry sink per proses: engine SQLAlchemy (dengan connection pool) dan client Google Sheets
+# dibuat sekali per URI/keyfile lalu dipakai ulang oleh setiap pemanggilan loader, sehingga
+# koneksi dan autentikasi tidak diulang pada pipeline terjadwal atau yang berjalan berulang.
+class SinkRegistry:
+    def __init__(self, pool_size=5, max_overflow=10, pool_pre_ping=True, pool_recycle=1800):
+        self.engine_options = {
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_pre_ping': pool_pre_ping,
+            'pool_recycle': pool_recycle,
+        }
+        self._engines = {}
+        self._sheets_clients = {}
+        self._lock = threading.Lock()
+        self._reset_metrics()
+
+    def _reset_metrics(self):
+        self.metrics = {
+            'engines_created': 0,
+            'engine_reuses': 0,
+            'connections_opened': 0,
+            'checkouts': 0,
+            'checkout_wait_seconds': 0.0,
+            'max_checkout_wait_seconds': 0.0,
+            'sheets_clients_created': 0,
+            'sheets_client_reuses': 0,
+        }
+
+    # Mengubah konfigurasi pool untuk engine yang dibuat setelah ini
+    def configure(self, **engine_options):
+        self.engine_options.update(engine_options)
+
+    def _count(self, key, amount=1):
+        with self._lock:
+            self.metrics[key] += amount
+
+    # Engine ber-pool untuk db_uri (dibuat sekali per proses)
+    def engine(self, db_uri):
+        with self._lock:
+            engine = self._engines.get(db_uri)
+            if engine is not None:
+                self.metrics['engine_reuses'] += 1
+                return engine
+
+            # SQLite memakai pool khusus yang tidak menerima opsi ukuran pool
+            options = {'pool_pre_ping': self.engine_options['pool_pre_ping']}
+            if not db_uri.startswith('sqlite'):
+                options.update(self.engine_options)
+            # SQLAlchemy baru diimport saat engine pertama dibuat
+            import sqlalchemy
+            engine = sqlalchemy.create_engine(db_uri, **options)
+            if isinstance(engine, sqlalchemy.engine.Engine):
+                sqlalchemy.event.listen(engine, 'connect', lambda *args: self._count('connections_opened'))
+                sqlalchemy.event.listen(engine, 'checkout', lambda *args: self._count('checkouts'))
+            self._engines[db_uri] = engine
+            self.metrics['engines_created'] += 1
+            return engine
+
+    # Mengambil koneksi dari pool sambil mencatat waktu tunggu checkout
+    def connect(self, engine, raw=False):
+        start = time.perf_counter()
+        connection = engine.raw_connection() if raw else engine.connect()
+        wait = time.perf_counter() - start
+        with self._lock:
+            self.metrics['checkout_wait_seconds'] += wait
+            self.metrics['max_checkout_wait_seconds'] = max(self.metrics['max_checkout_wait_seconds'], wait)
+        return connection
+
+    # Client gspread yang sudah diautentikasi untuk json_keyfile (dibuat sekali per proses)
+    def sheets_client(self, json_keyfile):
+        with self._lock:
+            client = self._sheets_clients.get(json_keyfile)
+            if client is not None:
+                self.metrics['sheets_client_reuses'] += 1
+                return client
+
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
+            scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
+            creds = ServiceAccountCredentials.from_json_keyfile_name(json_keyfile, scope)
+            client = gspread.authorize(creds)
+            self._sheets_clients[json_keyfile] = client
+            self.metrics['sheets_clients_created'] += 1
+            return client
+
+    # Ringkasan metrik: jumlah koneksi yang dipakai ulang dan rata-rata waktu tunggu checkout
+    def report(self):
+        with self._lock:
+            report = dict(self.metrics)
+        report['connection_reuses'] = max(report['checkouts'] - report['connections_opened'], 0)
+        report['avg_checkout_wait_seconds'] = report['checkout_wait_seconds'] / report['checkouts'] if report['checkouts'] else 0.0
+        logging.info(
+            f"Sink registry: {report['engines_created']} engines ({report['engine_reuses']} reuses), "
+            f"{report['connections_opened']} connections for {report['checkouts']} checkouts, "
+            f"avg checkout wait {report['avg_checkout_wait_seconds'] * 1000:.2f} ms"
+        )
+        return report
+
+    # Menutup semua engine dan melupakan client (mis. saat proses selesai atau di test)
+    def dispose(self):
+        with self._lock:
+            for engine in self._engines.values():
+                engine.dispose()
+            self._engines.clear()
+            self._sheets_clients.clear()
+            self._reset_metrics()
+
+# Registry default yang dipakai semua loader
+sinks = SinkRegistry()
 
 # Fungsi untuk menyimpan DataFrame ke csv
+@instrument('save_to_csv', rows=frame_rows)
 def save_to_csv(df, filename='products.csv'):
     try:
         df.to_csv(filename, index=False)
@@ -13,28 +134,434 @@ def save_to_csv(df, filename='products.csv'):
         logging.error(f"Failed to save CSV: {e}")
         return False
 
-# Fungsi untuk menyimpan DataFrame ke Google Sheets
-def save_to_google_sheets(df, json_keyfile, spreadsheet_id):
+# Fungsi untuk mengambil tanggal scraping (YYYY-MM-DD) dari kolom timestamp (string atau datetime64)
+def _scrape_dates(timestamps):
+    if pd.api.types.is_datetime64_any_dtype(timestamps):
+        return timestamps.dt.strftime("%Y-%m-%d")
+    return timestamps.astype(str).str.slice(0, 10)
+
+# Fungsi untuk menyimpan DataFrame ke Parquet (kolumnar, tipe data ikut tersimpan).
+# row_group_size mengatur jumlah baris per row group, compression memilih codec
+# ('snappy', 'zstd', 'gzip', 'none'), dan partition_by_date menulis dataset Hive
+# <path>/scrape_date=YYYY-MM-DD/ sehingga run pada tanggal yang sama menimpa partisinya sendiri.
+@instrument('save_to_parquet', rows=frame_rows)
+def save_to_parquet(df, path='products.parquet', row_group_size=None, compression='snappy', partition_by_date=False):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        compression = None if compression in (None, 'none') else compression
+        if partition_by_date:
+            import pyarrow.dataset as ds
+            df = df.assign(scrape_date=_scrape_dates(df['timestamp']))
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            file_format = ds.ParquetFileFormat()
+            ds.write_dataset(
+                table, path, format=file_format,
+                file_options=file_format.make_write_options(compression=compression),
+                partitioning=ds.partitioning(pa.schema([('scrape_date', pa.string())]), flavor='hive'),
+                max_rows_per_group=row_group_size or 1024 * 1024,
+                min_rows_per_group=min(row_group_size or 0, len(df)),
+                basename_template='part-{i}.parquet',
+                existing_data_behavior='delete_matching',
+            )
+        else:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            pq.write_table(table, path, row_group_size=row_group_size, compression=compression)
+        logging.info(f"Data saved to {path}")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to save Parquet: {e}")
+        return False
+
+# Fungsi untuk menyimpan snapshot data mentah dalam format Arrow IPC (file).
+# Tanpa kompresi (default) file dapat dibaca ulang lewat memory map tanpa menyalin data.
+@instrument('save_raw_snapshot', rows=frame_rows)
+def save_raw_snapshot(df, path='products_raw.arrow', compression=None):
+    try:
+        import pyarrow as pa
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        options = pa.ipc.IpcWriteOptions(compression=compression)
+        with pa.OSFile(path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema, options=options) as writer:
+                writer.write_table(table)
+        logging.info(f"Raw snapshot saved to {path}")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to save raw snapshot: {e}")
+        return False
+
+# Fungsi untuk membaca snapshot Arrow IPC lewat memory map (zero-copy), opsional subset kolom.
+# Mengembalikan pyarrow.Table; gunakan .to_pandas() jika butuh DataFrame.
+def read_raw_snapshot(path='products_raw.arrow', columns=None):
+    import pyarrow as pa
+    source = pa.memory_map(path, 'r')
+    table = pa.ipc.open_file(source).read_all()
+    return table.select(columns) if columns else table
+
+# Fungsi untuk mengubah DataFrame menjadi nilai yang bisa dikirim ke Google Sheets (JSON).
+# Diperlukan untuk skema compact: datetime64 menjadi string, float32 dibulatkan ke representasi
+# desimal terpendeknya (4.8, bukan 4.800000190734863), dan NaN/NaT menjadi sel kosong.
+def _sheet_values(df):
+    df = df.copy()
+    for column in df.columns:
+        series = df[column]
+        if pd.api.types.is_datetime64_any_dtype(series):
+            df[column] = series.dt.strftime("%Y-%m-%d %H:%M:%S")
+        elif series.dtype == 'float32':
+            df[column] = series.astype(str).astype(float)
+        elif isinstance(series.dtype, pd.CategoricalDtype):
+            df[column] = series.astype(object)
+    df = df.astype(object).where(df.notna(), '')
+    return [df.columns.values.tolist()] + df.values.tolist()
+
+# Status HTTP dari Sheets API yang aman untuk dicoba ulang (kuota habis / server sibuk)
+SHEETS_RETRY_STATUSES = (429, 500, 503)
+# Batas waktu tunggu dari header Retry-After (detik)
+SHEETS_MAX_BACKOFF = 60.0
+
+# Fungsi untuk memanggil Sheets API dengan retry + exponential backoff saat kena kuota
+def _sheets_call(func, *args, max_retries=5, backoff=1.0, **kwargs):
+    import gspread
+    for attempt in range(max_retries + 1):
+        try:
+            return func(*args, **kwargs)
+        except gspread.exceptions.APIError as e:
+            status = getattr(e.response, 'status_code', None)
+            if status not in SHEETS_RETRY_STATUSES or attempt == max_retries:
+                raise
+            retry_after = (getattr(e.response, 'headers', None) or {}).get('Retry-After')
+            delay = parse_retry_after(retry_after, SHEETS_MAX_BACKOFF) if retry_after else None
+            if delay is None:
+                delay = backoff * 2 ** attempt
+            logging.warning(f"Sheets API returned {status}, retrying in {delay:.1f}s ({attempt + 1}/{max_retries})")
+            time.sleep(delay)
+
+# Fungsi untuk menghitung hash tiap baris (snapshot ringkas untuk mode incremental)
+def _row_digests(values):
+    return [hashlib.sha1(json.dumps(row, default=str).encode('utf-8')).hexdigest() for row in values]
+
+# Fungsi untuk mengelompokkan indeks baris yang berubah menjadi rentang berurutan [start, end)
+def _changed_ranges(old_digests, new_digests):
+    ranges = []
+    for i, digest in enumerate(new_digests):
+        if i < len(old_digests) and old_digests[i] == digest:
+            continue
+        if ranges and ranges[-1][1] == i:
+            ranges[-1][1] = i + 1
+        else:
+            ranges.append([i, i + 1])
+    return ranges
+
+def _load_sheets_snapshot(path, spreadsheet_id):
+    if not path or not os.path.exists(path):
+        return None
     try:
-        scope = ['https://spreadsheets.google.com/feeds', 'https://www.googleapis.com/auth/drive']
-        creds = ServiceAccountCredentials.from_json_keyfile_name(json_keyfile, scope)
-        client = gspread.authorize(creds)
+        with open(path) as f:
+            snapshot = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return snapshot['rows'] if snapshot.get('spreadsheet_id') == spreadsheet_id else None
+
+def _save_sheets_snapshot(path, spreadsheet_id, digests):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, 'w') as f:
+        json.dump({'spreadsheet_id': spreadsheet_id, 'rows': digests}, f)
+    os.replace(tmp, path)
+
+# Fungsi untuk menyimpan DataFrame ke Google Sheets.
+# Upload dipecah per batch_rows baris per request. Dengan incremental=True dan snapshot_path,
+# hanya rentang baris yang berubah sejak upload terakhir yang ditulis; baris sisa di akhir dihapus.
+@instrument('save_to_google_sheets', rows=frame_rows)
+def save_to_google_sheets(df, json_keyfile, spreadsheet_id, batch_rows=5000, incremental=False, snapshot_path=None,
+                          max_retries=5, backoff=1.0):
+    try:
+        client = sinks.sheets_client(json_keyfile)
         sheet = client.open_by_key(spreadsheet_id).sheet1 # Menggunakan open_by_key dengan spreadsheet_id
-        sheet.clear()
-        sheet.update([df.columns.values.tolist()] + df.values.tolist())
-        logging.info("Data saved to Google Sheets")
+        values = _sheet_values(df)
+        digests = _row_digests(values)
+        retry = {'max_retries': max_retries, 'backoff': backoff}
+
+        previous = _load_sheets_snapshot(snapshot_path, spreadsheet_id) if incremental else None
+        if previous is None or previous[:1] != digests[:1]:
+            # Upload penuh: tanpa snapshot atau header (kolom) berubah.
+            # Snapshot lama dibuang dulu agar upload yang gagal di tengah tidak dianggap sinkron.
+            if snapshot_path and os.path.exists(snapshot_path):
+                os.remove(snapshot_path)
+            _sheets_call(sheet.clear, **retry)
+            ranges = [[0, len(values)]]
+        else:
+            ranges = _changed_ranges(previous, digests)
+            if len(previous) > len(values):
+                from gspread.utils import rowcol_to_a1
+                last_cell = rowcol_to_a1(len(previous), len(values[0]))
+                _sheets_call(sheet.batch_clear, [f"A{len(values) + 1}:{last_cell}"], **retry)
+
+        written = 0
+        for start, end in ranges:
+            for batch_start in range(start, end, batch_rows):
+                batch = values[batch_start:min(batch_start + batch_rows, end)]
+                _sheets_call(sheet.update, batch, f"A{batch_start + 1}", **retry)
+                written += len(batch)
+
+        if snapshot_path:
+            _save_sheets_snapshot(snapshot_path, spreadsheet_id, digests)
+        logging.info(f"Data saved to Google Sheets ({written} of {len(values)} rows written)")
         return True
     except Exception as e:
         logging.error(f"Failed to save to Google Sheets: {e}")
         return False
 
 # Fungsi untuk menyimpan DataFrame ke PostgreSQL
+@instrument('save_to_postgres', rows=frame_rows)
 def save_to_postgres(df, db_uri, table_name='fashion_products'):
     try:
-        engine = create_engine(db_uri)
-        df.to_sql(table_name, engine, if_exists='replace', index=False)
+        engine = sinks.engine(db_uri)
+        with sinks.connect(engine) as connection:
+            df.to_sql(table_name, connection, if_exists='replace', index=False)
+            connection.commit()
         logging.info("Data saved to PostgreSQL")
         return True
     except Exception as e:
         logging.error(f"Failed to save to PostgreSQL: {e}")
-        return False
\ No newline at end of file
+        return False
+
+# Natural key produk: Title + atribut (dipakai untuk upsert dan deteksi perubahan)
+NATURAL_KEY = ('Title', 'Size', 'Gender')
+
+# Fungsi untuk quoting identifier PostgreSQL (nama kolom seperti "Title" bersifat case-sensitive)
+def _quote_ident(name):
+    return '"' + str(name).replace('"', '""') + '"'
+
+# Fungsi untuk memetakan dtype pandas ke tipe kolom PostgreSQL (setara pemetaan to_sql)
+def _postgres_type(dtype):
+    if pd.api.types.is_bool_dtype(dtype):
+        return 'BOOLEAN'
+    if pd.api.types.is_integer_dtype(dtype):
+        return 'SMALLINT' if dtype.itemsize <= 2 else 'INTEGER' if dtype.itemsize == 4 else 'BIGINT'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL' if dtype.itemsize == 4 else 'DOUBLE PRECISION'
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return 'TIMESTAMP'
+    return 'TEXT'
+
+# Fungsi untuk stream DataFrame ke tabel lewat COPY FROM STDIN per batch agar buffer CSV di memori tetap kecil
+def _copy_frame(cursor, df, table, batch_size):
+    columns = ', '.join(_quote_ident(column) for column in df.columns)
+    for start in range(0, len(df), batch_size):
+        buffer = io.StringIO()
+        df.iloc[start:start + batch_size].to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        cursor.copy_expert(f"COPY {table} ({columns}) FROM STDIN WITH (FORMAT csv)", buffer)
+
+# Fungsi untuk menyimpan DataFrame ke PostgreSQL dengan COPY + upsert.
+# Data di-stream ke staging table sementara lewat COPY FROM STDIN (per batch_size baris), lalu
+# digabung ke tabel tujuan dengan INSERT ... ON CONFLICT pada key_columns. Jika prune=True,
+# baris yang tidak ada lagi di data baru ikut dihapus. Semua langkah berjalan dalam satu transaksi,
+# sehingga pembaca tetap melihat isi tabel lama sampai COMMIT (tidak pernah melihat tabel kosong).
+# deletes (opsional) berisi kolom key baris yang dihapus secara eksplisit (delta dari utils.cdc).
+@instrument('save_to_postgres_copy', rows=frame_rows)
+def save_to_postgres_copy(df, db_uri, table_name='fashion_products', key_columns=NATURAL_KEY, batch_size=10000, prune=True, deletes=None):
+    connection = None
+    try:
+        engine = sinks.engine(db_uri)
+        connection = sinks.connect(engine, raw=True)
+        cursor = connection.cursor()
+
+        table = _quote_ident(table_name)
+        staging = _quote_ident(f"{table_name}_staging")
+        columns = ', '.join(_quote_ident(column) for column in df.columns)
+        keys = ', '.join(_quote_ident(column) for column in key_columns)
+        definitions = ', '.join(f"{_quote_ident(column)} {_postgres_type(dtype)}" for column, dtype in df.dtypes.items())
+        updates = ', '.join(
+            f"{_quote_ident(column)} = EXCLUDED.{_quote_ident(column)}" for column in df.columns if column not in key_columns
+        )
+
+        cursor.execute(f"CREATE TABLE IF NOT EXISTS {table} ({definitions})")
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote_ident(f'{table_name}_natural_key')} ON {table} ({keys})")
+        cursor.execute(f"CREATE TEMP TABLE {staging} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+
+        _copy_frame(cursor, df, staging, batch_size)
+
+        # DISTINCT ON: jika key muncul lebih dari sekali, baris terakhir yang dipakai
+        cursor.execute(
+            f"INSERT INTO {table} ({columns}) "
+            f"SELECT DISTINCT ON ({keys}) {columns} FROM {staging} ORDER BY {keys}, ctid DESC "
+            f"ON CONFLICT ({keys}) DO " + (f"UPDATE SET {updates}" if updates else "NOTHING")
+        )
+        if prune:
+            matches = ' AND '.join(f"s.{_quote_ident(column)} = t.{_quote_ident(column)}" for column in key_columns)
+            cursor.execute(f"DELETE FROM {table} t WHERE NOT EXISTS (SELECT 1 FROM {staging} s WHERE {matches})")
+        if deletes is not None and len(deletes):
+            deleted = _quote_ident(f"{table_name}_deleted")
+            matches = ' AND '.join(f"d.{_quote_ident(column)} = t.{_quote_ident(column)}" for column in key_columns)
+            cursor.execute(f"CREATE TEMP TABLE {deleted} (LIKE {table} INCLUDING DEFAULTS) ON COMMIT DROP")
+            _copy_frame(cursor, deletes[list(key_columns)], deleted, batch_size)
+            cursor.execute(f"DELETE FROM {table} t USING {deleted} d WHERE {matches}")
+
+        connection.commit()
+        logging.info(f"Data upserted to PostgreSQL ({len(df)} rows via COPY)")
+        return True
+    except Exception as e:
+        if connection is not None:
+            connection.rollback()
+        logging.error(f"Failed to upsert to PostgreSQL: {e}")
+        return False
+    finally:
+        if connection is not None:
+            connection.close()
+
+# Fungsi untuk menerapkan delta CDC (utils.cdc.ChangeSet) ke PostgreSQL: hanya baris baru/berubah
+# yang di-COPY + upsert, dan baris yang hilang dihapus berdasarkan key, dalam satu transaksi.
+# Tanpa perubahan sama sekali tidak ada koneksi yang dibuka.
+def save_changes_to_postgres(changes, db_uri, table_name='fashion_products', key_columns=NATURAL_KEY, batch_size=10000):
+    if not len(changes):
+        logging.info("PostgreSQL up to date (no changes)")
+        return True
+    return save_to_postgres_copy(changes.upserts, db_uri, table_name, key_columns, batch_size, prune=False, deletes=changes.deletes)
+
+# Sink append untuk pipeline streaming: write(df) dipanggil per micro-batch (True/False seperti loader lain),
+# close() dipanggil sekali di akhir. Batch pertama menimpa output lama, batch berikutnya ditambahkan.
+class CsvAppendSink:
+    def __init__(self, filename='products.csv'):
+        self.name = 'csv'
+        self.filename = filename
+        self._started = False
+
+    def write(self, df):
+        try:
+            df.to_csv(self.filename, mode='a' if self._started else 'w', header=not self._started, index=False)
+            self._started = True
+            return True
+        except Exception as e:
+            logging.error(f"Failed to append CSV: {e}")
+            return False
+
+    def close(self):
+        logging.info(f"Data saved to {self.filename}")
+
+# Parquet append: satu ParquetWriter terbuka selama stream, satu row group per batch
+class ParquetAppendSink:
+    def __init__(self, path='products.parquet', compression='snappy'):
+        self.name = 'parquet'
+        self.path = path
+        self.compression = None if compression in (None, 'none') else compression
+        self._writer = None
+
+    def write(self, df):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._writer is None:
+                table = pa.Table.from_pandas(df, preserve_index=False)
+                self._writer = pq.ParquetWriter(self.path, table.schema, compression=self.compression)
+            else:
+                table = pa.Table.from_pandas(df, schema=self._writer.schema, preserve_index=False)
+            self._writer.write_table(table)
+            return True
+        except Exception as e:
+            logging.error(f"Failed to append Parquet: {e}")
+            return False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            logging.info(f"Data saved to {self.path}")
+
+# PostgreSQL append: setiap batch di-upsert lewat COPY (tanpa prune, karena batch lain belum/sudah masuk)
+class PostgresAppendSink:
+    def __init__(self, db_uri, table_name='fashion_products', key_columns=NATURAL_KEY):
+        self.name = 'postgres'
+        self.db_uri = db_uri
+        self.table_name = table_name
+        self.key_columns = key_columns
+
+    def write(self, df):
+        return save_to_postgres_copy(df, self.db_uri, self.table_name, self.key_columns, prune=False)
+
+    def close(self):
+        pass
+
+# Google Sheets append: batch pertama mengosongkan sheet dan menulis header, berikutnya append_rows
+class GoogleSheetsAppendSink:
+    def __init__(self, json_keyfile, spreadsheet_id, max_retries=5, backoff=1.0):
+        self.name = 'google_sheets'
+        self.json_keyfile = json_keyfile
+        self.spreadsheet_id = spreadsheet_id
+        self.retry = {'max_retries': max_retries, 'backoff': backoff}
+        self._sheet = None
+
+    def write(self, df):
+        try:
+            values = _sheet_values(df)
+            if self._sheet is None:
+                sheet = sinks.sheets_client(self.json_keyfile).open_by_key(self.spreadsheet_id).sheet1
+                _sheets_call(sheet.clear, **self.retry)
+                _sheets_call(sheet.update, values, 'A1', **self.retry)
+                self._sheet = sheet
+            else:
+                _sheets_call(self._sheet.append_rows, values[1:], **self.retry)
+            return True
+        except Exception as e:
+            logging.error(f"Failed to append to Google Sheets: {e}")
+            return False
+
+    def close(self):
+        pass
+
+# Satu target load untuk orchestrator: loader(df, **options) -> True/False, dengan batas waktu sendiri
+class LoadTarget:
+    def __init__(self, name, loader, timeout=None, **options):
+        self.name = name
+        self.loader = loader
+        self.timeout = timeout
+        self.options = options
+
+    def run(self, df):
+        start = time.perf_counter()
+        try:
+            ok = bool(self.loader(df, **self.options))
+            error = None if ok else 'loader returned False'
+        except Exception as e:
+            ok, error = False, str(e)
+        return ok, error, time.perf_counter() - start
+
+# Fungsi untuk menjalankan semua target load secara paralel pada DataFrame yang sama (hanya dibaca).
+# Kegagalan atau timeout satu target tidak menghentikan target lain; hasilnya dirangkum per target.
+def load_parallel(df, targets, max_workers=None):
+    start = time.perf_counter()
+    # Tanpa target tetap menghasilkan laporan (kosong); ThreadPoolExecutor menolak max_workers=0
+    executor = ThreadPoolExecutor(max_workers=max_workers or max(len(targets), 1), thread_name_prefix='load')
+    futures = [(target, executor.submit(target.run, df)) for target in targets]
+
+    results = []
+    for target, future in futures:
+        # Semua target mulai bersamaan, jadi batas waktu dihitung dari awal fan-out
+        remaining = None
+        if target.timeout is not None:
+            remaining = max(target.timeout - (time.perf_counter() - start), 0)
+        try:
+            ok, error, duration = future.result(timeout=remaining)
+            status = 'ok' if ok else 'failed'
+        except FutureTimeoutError:
+            status, error, duration = 'timeout', f"exceeded {target.timeout}s", time.perf_counter() - start
+            logging.error(f"Load target '{target.name}' timed out after {target.timeout}s")
+        results.append({
+            'sink': target.name,
+            'status': status,
+            'rows': len(df) if status == 'ok' else 0,
+            'duration_s': round(duration, 3),
+            'error': error,
+        })
+
+    # Thread target yang timeout tidak bisa dihentikan paksa; tidak ditunggu di sini
+    executor.shutdown(wait=False, cancel_futures=True)
+
+    report = pd.DataFrame(results, columns=['sink', 'status', 'rows', 'duration_s', 'error'])
+    logging.info(
+        f"Load finished in {time.perf_counter() - start:.2f}s: "
+        + ', '.join(f"{r['sink']}={r['status']} ({r['duration_s']}s)" for r in results)
+    )
+    return report
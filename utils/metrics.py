@@ -0,0 +1,178 @@
+from contextlib import contextmanager
+from datetime import datetime
+import cProfile
+import functools
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - Windows
+    resource = None
+
+# Fungsi untuk membaca puncak RSS proses (byte), None jika tidak tersedia di platform ini
+def peak_rss_bytes():
+    if resource is None:
+        return None
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+# Instrumentasi per stage: waktu (wall), jumlah baris, byte, dan puncak memori tracemalloc.
+# Nonaktif secara default sehingga fungsi yang diinstrumentasi hanya membayar satu pengecekan flag.
+# start() mengaktifkan pencatatan (opsional tracemalloc dan cProfile), report() menghasilkan
+# dict yang bisa ditulis sebagai laporan run JSON lewat write_report().
+class RunMetrics:
+    def __init__(self):
+        self.enabled = False
+        self.stages = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._profiler = None
+        self._trace_memory = False
+        self._started_at = None
+        self._start = None
+        self._elapsed = None
+
+    # Mulai run baru: reset semua stage, opsional tracemalloc (memori per stage) dan cProfile (thread pemanggil)
+    def start(self, trace_memory=False, profile=False):
+        with self._lock:
+            self.stages = {}
+        self._trace_memory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        if profile:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._started_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        self._start = time.perf_counter()
+        self._elapsed = None
+        self.enabled = True
+
+    def stop(self):
+        if not self.enabled:
+            return
+        self.enabled = False
+        self._elapsed = time.perf_counter() - self._start
+        if self._profiler is not None:
+            self._profiler.disable()
+        if self._trace_memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    # Menambahkan satu pemanggilan ke statistik stage (aman dipanggil dari banyak thread)
+    def record(self, stage, seconds, rows=0, nbytes=0, peak_memory=None):
+        with self._lock:
+            stats = self.stages.setdefault(stage, {'calls': 0, 'seconds': 0.0, 'rows': 0, 'bytes': 0, 'peak_memory_bytes': None})
+            stats['calls'] += 1
+            stats['seconds'] += seconds
+            stats['rows'] += rows
+            stats['bytes'] += nbytes
+            if peak_memory is not None:
+                stats['peak_memory_bytes'] = max(stats['peak_memory_bytes'] or 0, peak_memory)
+
+    # Context manager untuk mengukur satu blok kode sebagai stage; counts boleh diisi di dalam blok
+    @contextmanager
+    def stage(self, name, rows=0, nbytes=0):
+        if not self.enabled:
+            yield {}
+            return
+        counts = {'rows': rows, 'bytes': nbytes}
+        tracing = self._trace_memory and tracemalloc.is_tracing()
+        if tracing:
+            # Puncak per stage adalah perkiraan jika beberapa stage berjalan paralel di thread lain.
+            # Stage bersarang: puncak sejauh ini dicatat ke semua stage luar sebelum reset_peak(),
+            # sehingga stage dalam tidak menghapus puncak stage luar.
+            if not hasattr(self._local, 'stages'):
+                self._local.stages = []
+            stack = self._local.stages
+            current, traced_peak = tracemalloc.get_traced_memory()
+            for outer in stack:
+                outer['peak'] = max(outer['peak'], traced_peak)
+            frame = {'baseline': current, 'peak': current}
+            stack.append(frame)
+            tracemalloc.reset_peak()
+        start = time.perf_counter()
+        try:
+            yield counts
+        finally:
+            seconds = time.perf_counter() - start
+            peak = None
+            if tracing:
+                stack.pop()
+                peak = max(frame['peak'], tracemalloc.get_traced_memory()[1]) - frame['baseline']
+            self.record(name, seconds, counts['rows'], counts['bytes'], peak)
+
+    def _profile_summary(self, limit):
+        if self._profiler is None:
+            return None
+        stats = pstats.Stats(self._profiler).sort_stats('cumulative')
+        summary = []
+        for (filename, line, function), (_, calls, _, cumtime, _) in list(stats.stats.items()):
+            summary.append({'function': f"{os.path.basename(filename)}:{line}({function})", 'calls': calls, 'cumulative_seconds': round(cumtime, 6)})
+        summary.sort(key=lambda entry: entry['cumulative_seconds'], reverse=True)
+        return summary[:limit]
+
+    # Laporan run: per stage waktu, baris/detik, byte/detik, dan puncak memori
+    def report(self, profile_limit=25):
+        with self._lock:
+            stages = {name: dict(stats) for name, stats in self.stages.items()}
+        for stats in stages.values():
+            seconds = stats['seconds']
+            stats['seconds'] = round(seconds, 6)
+            stats['rows_per_sec'] = round(stats['rows'] / seconds, 1) if seconds else None
+            stats['bytes_per_sec'] = round(stats['bytes'] / seconds, 1) if seconds else None
+        elapsed = self._elapsed if self._elapsed is not None else (time.perf_counter() - self._start if self._start else None)
+        return {
+            'started_at': self._started_at,
+            'elapsed_seconds': round(elapsed, 6) if elapsed is not None else None,
+            'peak_rss_bytes': peak_rss_bytes(),
+            'stages': stages,
+            'profile': self._profile_summary(profile_limit),
+        }
+
+    # Menulis laporan run sebagai JSON; profile_path opsional menyimpan statistik cProfile mentah (.prof)
+    def write_report(self, path='run_report.json', profile_path=None):
+        report = self.report()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(report, f, indent=2)
+        if profile_path and self._profiler is not None:
+            self._profiler.dump_stats(profile_path)
+        logging.info(f"Run report saved to {path}")
+        return report
+
+# Instance default yang dipakai semua modul
+metrics = RunMetrics()
+
+# Decorator untuk mengukur setiap pemanggilan fungsi sebagai stage.
+# rows/nbytes adalah fungsi (result, *args, **kwargs) -> int untuk menghitung baris/byte yang diproses.
+def instrument(stage, rows=None, nbytes=None):
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not metrics.enabled:
+                return func(*args, **kwargs)
+            with metrics.stage(stage) as counts:
+                result = func(*args, **kwargs)
+                if rows is not None:
+                    counts['rows'] = rows(result, *args, **kwargs)
+                if nbytes is not None:
+                    counts['bytes'] = nbytes(result, *args, **kwargs)
+                return result
+        return wrapper
+    return decorator
+
+# Penghitung umum untuk instrument()
+def result_rows(result, *args, **kwargs):
+    return len(result) if result is not None else 0
+
+def frame_rows(result, df, *args, **kwargs):
+    return len(df)
+
+def content_bytes(result, *args, **kwargs):
+    return len(result) if result else 0
@@ -0,0 +1,203 @@
+from datetime import datetime
+import logging
+
+# Registry backend parser: nama -> fungsi parse(content, page=None) yang mengembalikan list of dict produk.
+# Backend dipilih lewat nama agar pilihan parser bisa dikirim ke process pool maupun file konfigurasi.
+PARSERS = {}
+# Versi aturan parsing per backend; naikkan saat hasil parsing berubah (mis. perbaikan bug)
+# agar hasil parsing lama di HttpCache tidak dipakai lagi
+PARSER_VERSIONS = {}
+
+DEFAULT_PARSER = 'bs4'
+
+# Decorator untuk mendaftarkan backend parser baru
+def register_parser(name, version=1):
+    def decorator(func):
+        PARSERS[name] = func
+        PARSER_VERSIONS[name] = version
+        return func
+    return decorator
+
+# Fungsi untuk identitas backend + versi parser, disimpan bersama hasil parsing di cache (contoh: 'lxml@1')
+def parser_key(name=None):
+    name = name or DEFAULT_PARSER
+    get_parser(name)
+    return f"{name}@{PARSER_VERSIONS[name]}"
+
+# Fungsi untuk mengambil backend parser berdasarkan nama
+def get_parser(name=None):
+    name = name or DEFAULT_PARSER
+    try:
+        return PARSERS[name]
+    except KeyError:
+        raise ValueError(f"Unknown parser backend '{name}'. Available: {', '.join(sorted(PARSERS))}")
+
+# Fungsi untuk membentuk dict produk dari field hasil parsing (dipakai semua backend)
+def _build_item(title, price, rating, colors, size, gender):
+    return {
+        "Title": title,
+        "Price": price,
+        "Rating": rating,
+        "Colors": colors,
+        "Size": size,
+        "Gender": gender,
+        "timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    }
+
+# Fungsi untuk mengambil data satu kartu produk (BeautifulSoup)
+def parse_product_card(product):
+    # Mengambil title produk
+    title_elem = product.find('h3', class_='product-title')
+    title = title_elem.get_text(strip=True)
+
+    # Logika Harga (Span vs P)
+    price_elem = product.find('span', class_='price')
+    if not price_elem:
+        price_elem = product.find('p', class_='price')
+
+    price = price_elem.get_text(strip=True)
+
+    # Logika Detail Produk (untuk tags p)
+    details_container = product.find('div', class_='product-details')
+
+    if details_container:
+        paragraphs = details_container.find_all('p')
+        for p in paragraphs:
+            text = p.get_text(strip=True)
+            if "Rating:" in text: rating = text
+            elif "Colors" in text: colors = text
+            elif "Size:" in text: size = text
+            elif "Gender:" in text: gender = text
+
+    return _build_item(title, price, rating, colors, size, gender)
+
+# Backend BeautifulSoup ('html.parser'): find/find_all per field pada setiap kartu produk
+@register_parser('bs4')
+def parse_products_bs4(content, page=None):
+    # Diimport saat dipakai (seperti lxml) agar backend yang tidak dipilih tidak memperlambat startup
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(content, 'html.parser')
+    products = soup.find_all('div', class_='collection-card')
+
+    if not products:
+        logging.warning(f"No products found on page {page}")
+        return []
+
+    items = []
+    for product in products:
+        try:
+            items.append(parse_product_card(product))
+        except Exception as e:
+            logging.error(f"Error parsing product item: {e}")
+            continue
+    return items
+
+# Fungsi untuk mengecek token class pada elemen lxml (setara class_='...' pada BeautifulSoup)
+def _has_class(elem, name):
+    return name in (elem.get('class') or '').split()
+
+# Fungsi untuk mengambil teks elemen lxml, setara get_text(strip=True) (komentar diabaikan)
+def _element_text(elem):
+    parts = []
+
+    def collect(node):
+        if isinstance(node.tag, str) and node.text:
+            parts.append(node.text.strip())
+        for child in node:
+            collect(child)
+            if child.tail:
+                parts.append(child.tail.strip())
+
+    collect(elem)
+    return ''.join(parts)
+
+# State satu kartu produk selama penelusuran dokumen
+class _CardState:
+    __slots__ = ('title', 'span_price', 'p_price', 'details', 'details_open', 'fields')
+
+    def __init__(self):
+        self.title = None
+        self.span_price = None
+        self.p_price = None
+        self.details = None
+        self.details_open = False
+        self.fields = {}
+
+    def to_item(self):
+        if self.title is None:
+            raise ValueError("Missing product title")
+        price = self.span_price if self.span_price is not None else self.p_price
+        if price is None:
+            raise ValueError("Missing product price")
+        missing = [key for key in ('rating', 'colors', 'size', 'gender') if key not in self.fields]
+        if missing:
+            raise ValueError(f"Missing product details: {', '.join(missing)}")
+        fields = self.fields
+        return _build_item(self.title, price, fields['rating'], fields['colors'], fields['size'], fields['gender'])
+
+# Backend lxml: satu kali penelusuran (iterwalk) seluruh dokumen, semua field kartu
+# diambil saat elemen pertama kali ditemui tanpa find/find_all berulang per field
+@register_parser('lxml')
+def parse_products_lxml(content, page=None):
+    from lxml import etree, html
+
+    if isinstance(content, bytes):
+        try:
+            content = content.decode('utf-8')
+        except UnicodeDecodeError:
+            pass
+    try:
+        root = html.document_fromstring(content)
+    except etree.ParserError:
+        logging.warning(f"No products found on page {page}")
+        return []
+
+    cards = []
+    stack = []
+    for event, elem in etree.iterwalk(root, events=('start', 'end')):
+        tag = elem.tag
+
+        if event == 'end':
+            for _, card in stack:
+                if card.details is elem:
+                    card.details_open = False
+            if stack and stack[-1][0] is elem:
+                stack.pop()
+            continue
+
+        # Kartu bersarang tetap dihitung untuk kartu luar, sama seperti find() pada BeautifulSoup
+        for _, card in stack:
+            if tag == 'h3' and card.title is None and _has_class(elem, 'product-title'):
+                card.title = _element_text(elem)
+            elif tag == 'span' and card.span_price is None and _has_class(elem, 'price'):
+                card.span_price = _element_text(elem)
+            elif tag == 'p' and card.p_price is None and _has_class(elem, 'price'):
+                card.p_price = _element_text(elem)
+
+            if tag == 'div' and card.details is None and _has_class(elem, 'product-details'):
+                card.details = elem
+                card.details_open = True
+            elif tag == 'p' and card.details_open:
+                text = _element_text(elem)
+                if "Rating:" in text: card.fields['rating'] = text
+                elif "Colors" in text: card.fields['colors'] = text
+                elif "Size:" in text: card.fields['size'] = text
+                elif "Gender:" in text: card.fields['gender'] = text
+
+        if tag == 'div' and _has_class(elem, 'collection-card'):
+            card = _CardState()
+            cards.append(card)
+            stack.append((elem, card))
+
+    if not cards:
+        logging.warning(f"No products found on page {page}")
+        return []
+
+    items = []
+    for card in cards:
+        try:
+            items.append(card.to_item())
+        except Exception as e:
+            logging.error(f"Error parsing product item: {e}")
+            continue
+    return items
@@ -0,0 +1,125 @@
+import logging
+import queue
+import threading
+import time
+
+from utils.extract import iter_fashion_data
+from utils.scheduler import iter_catalog_data
+from utils.transform import iter_clean_chunks, RowFingerprints
+from utils.metrics import metrics
+
+# Penanda akhir stream di antrean antar-stage
+_STAGE_DONE = object()
+
+# Fungsi untuk memasukkan item ke antrean bounded tanpa blok selamanya saat pipeline dihentikan
+def _put(out_queue, item, stop_event):
+    while not stop_event.is_set():
+        try:
+            out_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+# Fungsi untuk membaca antrean sampai stage sebelumnya selesai atau pipeline dihentikan
+def _iter_queue(in_queue, stop_event):
+    while not stop_event.is_set():
+        try:
+            item = in_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+        if item is _STAGE_DONE:
+            return
+        yield item
+
+# Satu stage pipeline di thread sendiri: hasil source dimasukkan ke antrean bounded (backpressure).
+# Error dicatat di errors dan menghentikan seluruh pipeline.
+def _run_stage(name, source, out_queue, stop_event, errors):
+    try:
+        for item in source:
+            if not _put(out_queue, item, stop_event):
+                break
+    except Exception as e:
+        logging.error(f"Streaming stage '{name}' failed: {e}")
+        errors.append(f"{name}: {e}")
+        stop_event.set()
+    finally:
+        close = getattr(source, 'close', None)
+        if close is not None:
+            close()
+        _put(out_queue, _STAGE_DONE, stop_event)
+
+# Fungsi untuk meratakan list produk per halaman menjadi record satu per satu (sambil dihitung)
+def _iter_records(pages, counter):
+    for items in pages:
+        counter['rows_scraped'] += len(items)
+        yield from items
+
+# Pipeline streaming extract -> transform -> load tanpa menampung seluruh dataset.
+# Halaman hasil scraping mengalir ke stage transform lewat antrean bounded (queue_size halaman),
+# dibersihkan per micro-batch batch_size baris (dedupe lintas batch memakai RowFingerprints),
+# lalu setiap batch langsung ditambahkan ke semua sink (CsvAppendSink, ParquetAppendSink, dst. di utils.load).
+# Memori puncak bergantung pada batch_size dan queue_size, bukan pada jumlah produk.
+# spec: spec transform (lihat utils.transform.TRANSFORM_SPEC) atau TransformPlan yang sudah dikompilasi.
+# scrape_options diteruskan ke utils.extract.iter_fashion_data (end_page, limit, workers, parser, ...).
+# base_url boleh berupa list CatalogSource (utils.scheduler): semua sumber di-crawl bergiliran lewat
+# CrawlScheduler dan scrape_options diteruskan ke iter_catalog_data.
+def run_streaming_pipeline(base_url, sinks, batch_size=500, queue_size=4, engine='vectorized', spec=None, **scrape_options):
+    start = time.perf_counter()
+    stop_event = threading.Event()
+    errors = []
+    counter = {'rows_scraped': 0}
+    page_queue = queue.Queue(maxsize=queue_size)
+    batch_queue = queue.Queue(maxsize=queue_size)
+
+    if isinstance(base_url, (list, tuple)):
+        pages = iter_catalog_data(base_url, **scrape_options)
+    else:
+        pages = iter_fashion_data(base_url, **scrape_options)
+    chunks = iter_clean_chunks(_iter_records(_iter_queue(page_queue, stop_event), counter), chunk_size=batch_size,
+                               engine=engine, fingerprints=RowFingerprints(), spec=spec)
+    stages = [
+        threading.Thread(target=_run_stage, args=('extract', pages, page_queue, stop_event, errors), daemon=True),
+        threading.Thread(target=_run_stage, args=('transform', chunks, batch_queue, stop_event, errors), daemon=True),
+    ]
+
+    report = {
+        'batches': 0,
+        'rows_scraped': 0,
+        'rows_loaded': {sink.name: 0 for sink in sinks},
+        'failed_batches': {sink.name: 0 for sink in sinks},
+        'first_load_seconds': None,
+        'elapsed_seconds': None,
+        'errors': errors,
+    }
+    logging.info("Streaming pipeline started")
+    for stage in stages:
+        stage.start()
+
+    try:
+        for df in _iter_queue(batch_queue, stop_event):
+            report['batches'] += 1
+            for sink in sinks:
+                with metrics.stage(f"append_{sink.name}", rows=len(df)):
+                    ok = sink.write(df)
+                if ok:
+                    report['rows_loaded'][sink.name] += len(df)
+                else:
+                    report['failed_batches'][sink.name] += 1
+            if report['first_load_seconds'] is None:
+                report['first_load_seconds'] = round(time.perf_counter() - start, 3)
+    finally:
+        # Stage yang masih berjalan (mis. load gagal di tengah) berhenti di put/get berikutnya
+        stop_event.set()
+        for stage in stages:
+            stage.join()
+        for sink in sinks:
+            sink.close()
+
+    report['rows_scraped'] = counter['rows_scraped']
+    report['elapsed_seconds'] = round(time.perf_counter() - start, 3)
+    logging.info(
+        f"Streaming pipeline finished: {report['rows_scraped']} rows scraped in {report['batches']} batches, "
+        f"first load after {report['first_load_seconds']}s, total {report['elapsed_seconds']}s"
+    )
+    return report
@@ -0,0 +1,107 @@
+from datetime import datetime
+import hashlib
+import json
+import logging
+import os
+import secrets
+import threading
+
+# Fungsi untuk menghitung checksum SHA-256 sebuah artifact (file, atau direktori seperti dataset Parquet
+# yang dipartisi: path relatif dan isi setiap file ikut di-hash secara berurutan)
+def file_checksum(path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    if os.path.isdir(path):
+        files = sorted(os.path.relpath(os.path.join(directory, name), path)
+                       for directory, _, names in os.walk(path) for name in names)
+    else:
+        files = ['']
+    for name in files:
+        if name:
+            digest.update(name.encode('utf-8'))
+        with open(os.path.join(path, name) if name else path, 'rb') as f:
+            for block in iter(lambda: f.read(block_size), b''):
+                digest.update(block)
+    return digest.hexdigest()
+
+# Fungsi untuk menghitung checksum konfigurasi (dict/list yang bisa di-serialisasi JSON)
+def config_checksum(value):
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=repr).encode('utf-8')).hexdigest()
+
+# Fungsi untuk membuat run ID baru berbasis waktu (mis. 20240501-093000-1a2b3c); sufiks acak mencegah
+# dua run yang dimulai pada detik yang sama memakai direktori run yang sama
+def new_run_id():
+    return f"{datetime.now():%Y%m%d-%H%M%S}-{secrets.token_hex(3)}"
+
+# Manifest satu run pipeline: setiap stage (extract, transform, tiap sink) dicatat dengan status,
+# checksum inputnya, artifact yang dihasilkan beserta checksum-nya, jumlah baris dan error.
+# Manifest disimpan di <root>/<run_id>/manifest.json (ditulis atomik setiap kali stage selesai).
+# Run ulang dengan run ID yang sama melewati stage yang sudah ok selama inputnya sama dan artifact-nya
+# tidak berubah, sehingga kegagalan satu sink hanya mengulang sink tersebut, bukan crawl dari awal.
+class RunManifest:
+    def __init__(self, run_id=None, root='.runs'):
+        self.run_id = run_id or new_run_id()
+        self.directory = os.path.join(root, self.run_id)
+        self.path = os.path.join(self.directory, 'manifest.json')
+        self._lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        if os.path.exists(self.path):
+            with open(self.path, encoding='utf-8') as f:
+                self.state = json.load(f)
+            logging.info(f"Resuming run {self.run_id}: {self.summary()}")
+        else:
+            self.state = {'run_id': self.run_id, 'created_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"), 'stages': {}}
+            self._save()
+            logging.info(f"Run {self.run_id} started (resume with --run-id {self.run_id})")
+
+    @property
+    def stages(self):
+        return self.state['stages']
+
+    # Path artifact di dalam direktori run
+    def artifact(self, name):
+        return os.path.join(self.directory, name)
+
+    # Stage bisa dilewati jika terakhir ok, inputnya sama, dan artifact-nya (jika ada) masih utuh
+    def is_fresh(self, stage, inputs):
+        entry = self.stages.get(stage)
+        if not entry or entry['status'] != 'ok' or entry['inputs'] != inputs:
+            return False
+        artifact = entry.get('artifact')
+        if artifact and (not os.path.exists(artifact) or file_checksum(artifact) != entry['checksum']):
+            logging.warning(f"Artifact {artifact} of stage {stage} is missing or modified, re-running stage")
+            return False
+        return True
+
+    # Checksum artifact stage yang sudah selesai (dipakai sebagai input stage berikutnya)
+    def checksum(self, stage):
+        entry = self.stages.get(stage)
+        return entry.get('checksum') if entry else None
+
+    # Mencatat hasil satu stage; checksum artifact dihitung saat itu juga
+    def record(self, stage, status, inputs, artifact=None, rows=None, error=None):
+        entry = {
+            'status': status,
+            'inputs': inputs,
+            'artifact': artifact,
+            'checksum': file_checksum(artifact) if artifact and status == 'ok' else None,
+            'rows': rows,
+            'error': error,
+            'finished_at': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        }
+        with self._lock:
+            self.stages[stage] = entry
+            self._save()
+        return entry
+
+    def _save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+    # Stage yang tercatat tidak ok (failed/timeout) dan perlu diulang dengan run ID yang sama
+    def failed(self):
+        return [stage for stage, entry in self.stages.items() if entry['status'] != 'ok']
+
+    def summary(self):
+        return ', '.join(f"{stage}={entry['status']}" for stage, entry in self.stages.items())
@@ -0,0 +1,284 @@
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from collections import deque
+from urllib.parse import urlsplit
+import logging
+import threading
+import time
+import requests
+from utils.extract import (DEFAULT_HEADERS, CrawlCheckpoint, CrawlProgress, PageOutcomes, build_page_url, discover_last_page,
+                           get_page_content, parse_products, _parse_page, _parse_process_pool)
+from utils.parsers import DEFAULT_PARSER, get_parser
+from utils.metrics import instrument, result_rows
+
+# Satu sumber katalog (storefront dengan layout yang sama seperti fashion-studio).
+# url_template untuk skema halaman selain /pageN (lihat build_page_url), pages untuk daftar halaman eksplisit.
+# checkpoint/outcomes (objek atau path) sama seperti di scrape_fashion_data, tetapi per sumber.
+class CatalogSource:
+    def __init__(self, base_url, name=None, url_template=None, start_page=1, end_page=50, limit=1000, pages=None,
+                 checkpoint=None, outcomes=None):
+        self.base_url = base_url
+        self.name = name or urlsplit(base_url).netloc
+        self.url_template = url_template
+        self.start_page = start_page
+        self.end_page = end_page
+        self.limit = limit
+        self.pages = pages
+        self.checkpoint = CrawlCheckpoint(checkpoint) if isinstance(checkpoint, str) else checkpoint
+        self.outcomes = PageOutcomes(outcomes) if isinstance(outcomes, str) else outcomes
+
+    @property
+    def domain(self):
+        return urlsplit(self.base_url).netloc
+
+    def page_url(self, page):
+        return build_page_url(self.base_url, page, self.url_template)
+
+# Batas per domain: laju request dan pool koneksi sendiri (Session dengan pool_maxsize = max_connections).
+# Dipakai bersama oleh semua sumber pada domain yang sama.
+class DomainSlot:
+    def __init__(self, domain, rate_limit=None, max_connections=4):
+        self.domain = domain
+        self.interval = 1.0 / rate_limit if rate_limit else 0.0
+        self.max_connections = max_connections
+        self.in_flight = 0
+        self.next_time = 0.0
+        self.requests = 0
+        self.session = requests.Session()
+        self.session.headers.update(DEFAULT_HEADERS)
+        adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=max_connections)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    # Waktu (monotonic) paling awal request berikutnya boleh dikirim; None jika koneksi penuh
+    def ready_at(self):
+        if self.in_flight >= self.max_connections:
+            return None
+        return self.next_time
+
+    def acquire(self, now):
+        self.in_flight += 1
+        self.requests += 1
+        self.next_time = max(now, self.next_time) + self.interval
+
+    def release(self):
+        self.in_flight -= 1
+
+# State crawl satu sumber di dalam scheduler: urutan halaman dan hasil yang menunggu urutan.
+# Limit, checkpoint, outcomes dan max_empty_pages ditangani CrawlProgress (sama seperti iter_fashion_data).
+class _SourceCrawl:
+    def __init__(self, source, discover_pages, max_empty_pages=None, breaker=None):
+        self.source = source
+        self.discover_pages = discover_pages and source.pages is None
+        self.progress = CrawlProgress(source.base_url, source.start_page, source.end_page, source.limit, source.checkpoint,
+                                      source.outcomes, max_empty_pages, name=source.name, breaker=breaker)
+        self.order = deque()
+        self.completed = {}
+        self.resumed = self.progress.resume()
+        self._pages = iter(sorted(source.pages)) if source.pages is not None else None
+        self._next_page = source.start_page
+        self._exhausted = False
+
+    # Nomor halaman berikutnya yang belum diambil (None jika sumber sudah habis)
+    def next_page(self):
+        while not self.progress.stopped:
+            if self._pages is not None:
+                page = next(self._pages, None)
+            else:
+                page = self._next_page if self._next_page <= self.progress.end_page else None
+                self._next_page += 1
+            if page is None:
+                self._exhausted = True
+                return None
+            if not self.progress.is_done(page):
+                return page
+        return None
+
+    def has_work(self):
+        return (not self.progress.stopped and not self._exhausted
+                and (self._pages is not None or self._next_page <= self.progress.end_page))
+
+# Scheduler crawl multi-sumber: halaman dari semua sumber diambil bergiliran (round-robin) lewat satu
+# thread pool bersama (workers). Setiap domain punya rate limit dan pool koneksi sendiri (DomainSlot);
+# request hanya dikirim saat domainnya siap, jadi worker tidak pernah tertahan menunggu domain yang
+# lambat/terbatas dan throughput total bertambah sesuai jumlah sumber, bukan dibatasi sumber paling lambat.
+# domain_limits: {domain: {'rate_limit': ..., 'max_connections': ...}} untuk menimpa default per domain.
+# Fetch dan parsing halaman berjalan di worker; parse_workers > 0 memindahkan parsing ke process pool
+# (worker menunggu hasilnya) agar parser berat seperti bs4 tidak dibatasi GIL saat sumber bertambah.
+# Hasil per sumber dikirim berurutan halaman.
+class CrawlScheduler:
+    def __init__(self, sources, workers=8, rate_limit=None, max_connections=4, domain_limits=None, parser=DEFAULT_PARSER,
+                 cache=None, fetch_policy=None, discover_pages=True, max_empty_pages=None, parse_workers=0):
+        get_parser(parser)
+        self.sources = list(sources)
+        self.workers = workers
+        self.parse_workers = parse_workers
+        self.parser = parser
+        self.cache = cache
+        self.fetch_policy = fetch_policy
+        self.discover_pages = discover_pages
+        self.max_empty_pages = max_empty_pages
+        domain_limits = domain_limits or {}
+        self.domains = {}
+        for source in self.sources:
+            if source.domain not in self.domains:
+                limits = dict({'rate_limit': rate_limit, 'max_connections': max_connections}, **domain_limits.get(source.domain, {}))
+                self.domains[source.domain] = DomainSlot(source.domain, **limits)
+        self.stats = {source.name: {'pages': 0, 'failed': 0, 'items': 0} for source in self.sources}
+        self._lock = threading.Lock()
+        self._parse_pool = None
+
+    # Fetch + parsing satu halaman di worker; None jika fetch gagal
+    def _fetch(self, source, page):
+        url = source.page_url(page)
+        options = {}
+        if self.cache is not None:
+            options['cache'] = self.cache
+        if self.fetch_policy is not None:
+            options['policy'] = self.fetch_policy
+        try:
+            content = get_page_content(self.domains[source.domain].session, url, **options)
+            if content is None:
+                return None, None
+            items = self._parse(content, page, url) if content else []
+            return items, discover_last_page(content)
+        except Exception as e:
+            logging.error(f"Error scraping {url}: {e}")
+            return None, None
+
+    # Parsing (dengan cache) di worker, atau di process pool jika parse_workers > 0
+    def _parse(self, content, page, url):
+        parse = None
+        if self._parse_pool is not None:
+            parse = lambda *args: self._parse_pool.submit(parse_products, *args).result()
+        return _parse_page(content, page, url, self.parser, self.cache, parse)
+
+    # Mengirim request sebanyak mungkin (bergiliran per sumber) tanpa melebihi workers dan batas domain.
+    # Mengembalikan waktu paling awal sumber yang tertahan rate limit bisa dikirim lagi (atau None).
+    def _dispatch(self, executor, crawls, pending, start_index):
+        blocked_until = None
+        dispatched = True
+        while dispatched and len(pending) < self.workers:
+            dispatched = False
+            for offset in range(len(crawls)):
+                crawl = crawls[(start_index + offset) % len(crawls)]
+                if len(pending) >= self.workers or not crawl.has_work():
+                    continue
+                slot = self.domains[crawl.source.domain]
+                ready_at = slot.ready_at()
+                if ready_at is None:
+                    continue
+                now = time.monotonic()
+                if ready_at > now:
+                    blocked_until = ready_at if blocked_until is None else min(blocked_until, ready_at)
+                    continue
+                page = crawl.next_page()
+                if page is None:
+                    continue
+                slot.acquire(now)
+                crawl.order.append(page)
+                pending[executor.submit(self._fetch, crawl.source, page)] = (crawl, page)
+                dispatched = True
+        return blocked_until
+
+    # Mengirim hasil sumber sesuai urutan halaman; limit, checkpoint, outcomes dan max_empty_pages lewat CrawlProgress
+    def _emit(self, crawl):
+        source, progress = crawl.source, crawl.progress
+        while crawl.order and crawl.order[0] in crawl.completed and not progress.stopped:
+            page = crawl.order.popleft()
+            items = crawl.completed.pop(page)
+            if page > progress.end_page and source.pages is None:
+                continue
+            failed = items is None
+            items = progress.record(page, items)
+            with self._lock:
+                stats = self.stats[source.name]
+                stats['pages'] += 1
+                stats['failed'] += failed
+                stats['items'] += len(items)
+            if items:
+                yield page, items
+        if not crawl.has_work() and not crawl.order:
+            progress.exhausted()
+
+    # Generator (source, page, items) dari semua sumber; produk dari checkpoint tiap sumber dikirim lebih dulu
+    def iter_pages(self):
+        breaker = self.fetch_policy.breaker if self.fetch_policy is not None else None
+        crawls = [_SourceCrawl(source, self.discover_pages, self.max_empty_pages, breaker) for source in self.sources]
+        for crawl in crawls:
+            if crawl.resumed:
+                yield crawl.source, None, crawl.resumed
+
+        pending = {}
+        start_index = 0
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='crawl')
+        self._parse_pool = _parse_process_pool(self.parse_workers) if self.parse_workers > 0 else None
+        try:
+            while True:
+                blocked_until = self._dispatch(executor, crawls, pending, start_index)
+                start_index = (start_index + 1) % max(len(crawls), 1)
+                if not pending:
+                    if blocked_until is None:
+                        break
+                    time.sleep(max(blocked_until - time.monotonic(), 0))
+                    continue
+
+                timeout = max(blocked_until - time.monotonic(), 0) if blocked_until is not None else None
+                done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    crawl, page = pending.pop(future)
+                    self.domains[crawl.source.domain].release()
+                    items, last_page = future.result()
+                    if crawl.discover_pages:
+                        crawl.progress.discover(last_page)
+                    crawl.completed[page] = items
+
+                for crawl in crawls:
+                    for page, items in self._emit(crawl):
+                        yield crawl.source, page, items
+        finally:
+            for future in pending:
+                future.cancel()
+            executor.shutdown(wait=True, cancel_futures=True)
+            if self._parse_pool is not None:
+                self._parse_pool.shutdown(wait=True, cancel_futures=True)
+                self._parse_pool = None
+            for crawl in crawls:
+                crawl.progress.close()
+            if self.cache is not None:
+                self.cache.report()
+
+    # Ringkasan per sumber dan jumlah request per domain
+    def report(self):
+        with self._lock:
+            report = {name: dict(stats) for name, stats in self.stats.items()}
+        requests_per_domain = {domain: slot.requests for domain, slot in self.domains.items()}
+        logging.info("Crawl scheduler: " + ', '.join(
+            f"{name} {stats['items']} items from {stats['pages']} pages ({stats['failed']} failed)" for name, stats in report.items()
+        ) + f"; requests per domain: {requests_per_domain}")
+        return {'sources': report, 'requests_per_domain': requests_per_domain}
+
+    def close(self):
+        for slot in self.domains.values():
+            slot.session.close()
+
+# Generator list produk per halaman dari semua sumber (format sama dengan iter_fashion_data).
+# source_column (mis. 'Source') menambahkan nama sumber ke setiap produk agar katalog yang berbeda bisa dibedakan.
+def iter_catalog_data(sources, source_column=None, **options):
+    scheduler = CrawlScheduler(sources, **options)
+    try:
+        for source, _, items in scheduler.iter_pages():
+            if source_column:
+                items = [dict(item, **{source_column: source.name}) for item in items]
+            yield items
+    finally:
+        scheduler.report()
+        scheduler.close()
+
+# Fungsi untuk scraping banyak sumber katalog sekaligus; hasilnya list produk seperti scrape_fashion_data.
+# options diteruskan ke CrawlScheduler (workers, rate_limit, max_connections, domain_limits, parser, cache, ...).
+@instrument('extract', rows=result_rows)
+def scrape_catalogs(sources, source_column=None, **options):
+    data = []
+    for items in iter_catalog_data(sources, source_column, **options):
+        data.extend(items)
+    return data
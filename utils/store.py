@@ -0,0 +1,173 @@
+import logging
+import os
+import sqlite3
+import threading
+import pandas as pd
+from utils.load import NATURAL_KEY
+from utils.cdc import FingerprintIndex
+from utils.metrics import instrument, frame_rows
+
+STORE_PATH = 'products.sqlite'
+STORE_COLUMNS = ('Title', 'Price', 'Rating', 'Colors', 'Size', 'Gender', 'timestamp')
+
+# Index untuk pertanyaan analis yang umum: rentang harga per Gender+Size, filter Size saja,
+# rentang harga, dan produk rating tertinggi (ORDER BY Rating DESC LIMIT n tanpa sort penuh)
+STORE_INDEXES = {
+    'idx_products_gender_size_price': ('Gender', 'Size', 'Price'),
+    'idx_products_size_price': ('Size', 'Price'),
+    'idx_products_price': ('Price',),
+    'idx_products_rating': ('Rating',),
+}
+
+# Fungsi untuk menulis daftar nama kolom sebagai identifier SQL ("Price", "Rating", ...)
+def _quote(columns):
+    return ', '.join(f'"{column}"' for column in columns)
+
+# Fungsi untuk mengubah DataFrame menjadi tuple Python (int/float/str/None) yang bisa di-bind oleh sqlite3
+def _rows(df, columns):
+    values = df[list(columns)].astype(object)
+    return list(values.where(values.notna(), None).itertuples(index=False, name=None))
+
+# Store query lokal (SQLite di disk) untuk produk bersih hasil process_dataframe.
+# Satu baris per natural key (Title + Size + Gender), dengan index pada Gender, Size, Price dan Rating,
+# sehingga pertanyaan seperti "rentang harga Women XL" atau "hoodie rating tertinggi" tidak perlu
+# membaca ulang seluruh products.csv. Diperbarui incremental lewat delta CDC (apply / save_to_store).
+class ProductStore:
+    def __init__(self, path=STORE_PATH):
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        columns = ', '.join(f'"{column}" {kind}' for column, kind in zip(STORE_COLUMNS, ('TEXT NOT NULL', 'REAL', 'REAL', 'INTEGER', 'TEXT', 'TEXT', 'TEXT')))
+        self._conn.execute(f"CREATE TABLE IF NOT EXISTS products ({columns}, PRIMARY KEY ({_quote(NATURAL_KEY)}))")
+        self._create_indexes()
+        self._conn.commit()
+
+    def _create_indexes(self):
+        for name, index_columns in STORE_INDEXES.items():
+            self._conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON products ({_quote(index_columns)})")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM products").fetchone()[0]
+
+    # Fungsi untuk menerapkan ChangeSet (insert/update di-upsert, delete dihapus) dalam satu transaksi
+    def apply(self, changes):
+        upserts = changes.upserts
+        if 'timestamp' in upserts:
+            upserts = upserts.assign(timestamp=upserts['timestamp'].astype(str))
+        updates = ', '.join(f'"{column}" = excluded."{column}"' for column in STORE_COLUMNS if column not in NATURAL_KEY)
+        key_match = ' AND '.join(f'"{column}" = ?' for column in NATURAL_KEY)
+        with self._lock, self._conn:
+            # Load awal ke store kosong: index sekunder dibuat setelah insert (sekali sort, bukan per baris)
+            bulk = self._conn.execute("SELECT 1 FROM products LIMIT 1").fetchone() is None
+            if bulk:
+                for name in STORE_INDEXES:
+                    self._conn.execute(f"DROP INDEX IF EXISTS {name}")
+            self._conn.executemany(
+                f"INSERT INTO products ({_quote(STORE_COLUMNS)}) VALUES ({', '.join('?' * len(STORE_COLUMNS))}) "
+                f"ON CONFLICT ({_quote(NATURAL_KEY)}) DO UPDATE SET {updates}",
+                _rows(upserts, STORE_COLUMNS))
+            self._conn.executemany(
+                f"DELETE FROM products WHERE {key_match}",
+                _rows(changes.deletes, NATURAL_KEY))
+            if bulk:
+                self._create_indexes()
+        logging.info(f"Product store updated: {len(upserts)} upserted, {len(changes.deletes)} deleted ({self.path})")
+
+    # Fungsi untuk membangun klausa WHERE dari filter query (semua opsional)
+    @staticmethod
+    def _where(gender=None, size=None, min_price=None, max_price=None, min_rating=None, max_rating=None, title_contains=None):
+        clauses, params = [], []
+        for column, operator_, value in (('Gender', '=', gender), ('Size', '=', size), ('Price', '>=', min_price), ('Price', '<=', max_price),
+                                         ('Rating', '>=', min_rating), ('Rating', '<=', max_rating)):
+            if value is not None:
+                clauses.append(f'"{column}" {operator_} ?')
+                params.append(value)
+        if title_contains:
+            clauses.append('"Title" LIKE ?')
+            params.append(f"%{title_contains}%")
+        return (f" WHERE {' AND '.join(clauses)}" if clauses else ''), params
+
+    def _read(self, sql, params):
+        with self._lock:
+            return pd.read_sql_query(sql, self._conn, params=params)
+
+    # Fungsi untuk mengambil produk yang cocok dengan filter, opsional diurutkan dan dibatasi
+    def query(self, columns=None, order_by=None, descending=False, limit=None, **filters):
+        columns = list(columns or STORE_COLUMNS)
+        for column in columns + ([order_by] if order_by else []):
+            if column not in STORE_COLUMNS:
+                raise ValueError(f"Unknown column '{column}'. Available: {', '.join(STORE_COLUMNS)}")
+        where, params = self._where(**filters)
+        sql = f"SELECT {_quote(columns)} FROM products{where}"
+        if order_by:
+            sql += f' ORDER BY "{order_by}" {"DESC" if descending else "ASC"}'
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+        return self._read(sql, params)
+
+    # Fungsi untuk ringkasan harga (jumlah, min, max, rata-rata) produk yang cocok dengan filter
+    def price_range(self, **filters):
+        where, params = self._where(**filters)
+        with self._lock:
+            count, low, high, mean = self._conn.execute(
+                f'SELECT COUNT(*), MIN("Price"), MAX("Price"), AVG("Price") FROM products{where}', params).fetchone()
+        return {'count': count, 'min': low, 'max': high, 'avg': round(mean, 2) if mean is not None else None}
+
+    # Fungsi untuk produk dengan rating tertinggi (harga termurah lebih dulu jika rating sama)
+    def top_rated(self, limit=10, **filters):
+        where, params = self._where(**filters)
+        return self._read(f'SELECT {_quote(STORE_COLUMNS)} FROM products{where} ORDER BY "Rating" DESC, "Price" ASC LIMIT ?', params + [int(limit)])
+
+    # Fungsi untuk melihat rencana query SQLite (index mana yang dipakai) untuk filter tertentu
+    def explain(self, **filters):
+        where, params = self._where(**filters)
+        with self._lock:
+            plan = self._conn.execute(f"EXPLAIN QUERY PLAN SELECT * FROM products{where}", params).fetchall()
+        return [row[-1] for row in plan]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+# Fungsi untuk menyinkronkan store dengan katalog bersih: delta dihitung terhadap index fingerprint yang
+# disimpan di file SQLite yang sama, sehingga hanya produk baru/berubah/hilang yang ditulis.
+# full=False (micro-batch streaming) hanya menambah/memperbarui, tanpa menghapus produk lain.
+@instrument('save_to_store', rows=frame_rows)
+def save_to_store(df, path=STORE_PATH, full=True):
+    store = index = None
+    try:
+        store = ProductStore(path)
+        index = FingerprintIndex(path)
+        changes = index.diff(df, full=full)
+        if len(changes):
+            store.apply(changes)
+            index.commit(changes)
+        else:
+            logging.info(f"Product store up to date (no changes, {path})")
+        return True
+    except Exception as e:
+        logging.error(f"Failed to save to product store: {e}")
+        return False
+    finally:
+        for handle in (index, store):
+            if handle is not None:
+                handle.close()
+
+# Sink append untuk pipeline streaming: setiap micro-batch disinkronkan incremental ke store
+class StoreAppendSink:
+    def __init__(self, path=STORE_PATH):
+        self.name = 'store'
+        self.path = path
+
+    def write(self, df):
+        return save_to_store(df, self.path, full=False)
+
+    def close(self):
+        logging.info(f"Data saved to {self.path}")
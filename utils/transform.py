@@ -1,16 +1,27 @@
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+from collections import OrderedDict
+import operator
 import re
 import logging
+import threading
+from utils.metrics import metrics, instrument, result_rows
+
+# Kurs konversi USD ke IDR
+USD_TO_IDR = 16000
 
 # Fungsi transform data price
-def clean_price(price_str):
+# rate: kurs konversi USD ke IDR
+def clean_price(price_str, rate=USD_TO_IDR):
     try:
         if pd.isna(price_str): return 0.0
         # Hapus semua karakter kecuali digit dan titik desimal
         clean_str = re.sub(r'[^\d.]', '', str(price_str))
         if not clean_str: return 0.0
         usd = float(clean_str)
-        converted = usd * 16000
+        converted = usd * rate
         return float(round(converted, 0))
     except Exception:
         return 0.0
@@ -46,8 +57,423 @@ def clean_text_field(text, prefix):
     except Exception:
         return str(text)
 
-# Fungsi utama untuk memproses transform DataFrame
-def process_dataframe(data_list):
+# Versi vektor (per kolom) dari fungsi clean_* di atas, dijalankan dengan kernel pyarrow.compute.
+# Hasilnya identik dengan versi skalar, termasuk fallback 0.0/1: \p{Nd} pada regex RE2 setara \d
+# pada modul re Python, dan nilai langka yang tidak bisa dikonversi Arrow (mis. digit Unicode)
+# diproses ulang dengan fungsi skalar sebagai implementasi referensi.
+
+# Fungsi untuk mengubah Series menjadi array string Arrow (null untuk None/NaN)
+def _arrow_strings(series):
+    try:
+        return pa.array(series, type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Kolom berisi campuran tipe (mis. angka): samakan dengan str(x) pada versi skalar
+        return pa.array(series.astype(str), type=pa.string())
+
+# Fungsi untuk konversi string angka ASCII ke numpy array; null dan string tidak valid menjadi NaN
+def _arrow_to_float(strings):
+    valid = pc.match_substring_regex(strings, r'^(?:[0-9]+\.?[0-9]*|\.[0-9]+)$')
+    numbers = pc.cast(pc.if_else(valid, strings, pa.scalar(None, pa.string())), pa.float64())
+    return numbers.to_numpy(zero_copy_only=False, writable=True)
+
+# Fungsi untuk memproses ulang baris yang gagal dikonversi Arrow memakai fungsi skalar
+def _apply_fallback(result, series, fallback, scalar_func):
+    if fallback.any():
+        result[fallback] = series[fallback].map(scalar_func)
+    return result
+
+# Fungsi transform kolom price (vektor)
+def clean_price_series(series, rate=USD_TO_IDR):
+    digits = pc.replace_substring_regex(_arrow_strings(series), r'[^\p{Nd}.]+', '')
+    usd = _arrow_to_float(digits)
+    result = pd.Series(np.round(usd * rate, 0), index=series.index)
+
+    unparsed = np.isnan(usd) & pc.fill_null(pc.not_equal(digits, ''), False).to_numpy(zero_copy_only=False)
+    return _apply_fallback(result, series, unparsed, lambda x: clean_price(x, rate)).fillna(0.0).astype(float)
+
+# Fungsi transform kolom rating (vektor)
+def clean_rating_series(series):
+    match = pc.extract_regex(_arrow_strings(series), r'(?P<value>\p{Nd}+(?:\.\p{Nd}+)?)')
+    extracted = pc.struct_field(match, 'value')
+    values = _arrow_to_float(extracted)
+    result = pd.Series(values, index=series.index)
+
+    unparsed = np.isnan(values) & pc.is_valid(extracted).to_numpy(zero_copy_only=False)
+    return _apply_fallback(result, series, unparsed, clean_rating).fillna(0.0).astype(float)
+
+# Fungsi transform kolom colors (vektor)
+def clean_colors_series(series):
+    match = pc.extract_regex(_arrow_strings(series), r'(?P<value>\p{Nd}+)')
+    extracted = pc.struct_field(match, 'value')
+    # Maksimal 18 digit ASCII agar selalu muat di int64; sisanya lewat fungsi skalar
+    valid = pc.fill_null(pc.match_substring_regex(extracted, r'^[0-9]{1,18}$'), False)
+    values = pc.fill_null(pc.cast(pc.if_else(valid, extracted, pa.scalar(None, pa.string())), pa.int64()), 1)
+    result = pd.Series(values.to_numpy(zero_copy_only=False, writable=True), index=series.index)
+
+    unparsed = pc.and_(pc.is_valid(extracted), pc.invert(valid)).to_numpy(zero_copy_only=False)
+    return _apply_fallback(result, series, unparsed, clean_colors).astype('int64')
+
+# Fungsi untuk membersihkan kolom teks dengan prefix tertentu (vektor)
+def clean_text_series(series, prefix):
+    cleaned = pc.utf8_trim_whitespace(pc.replace_substring(_arrow_strings(series), prefix, ''))
+    result = pd.Series(cleaned.to_numpy(zero_copy_only=False), index=series.index, dtype=object)
+
+    # None/NaN menjadi teks 'None'/'nan' seperti str(x) pada versi skalar
+    nulls = series.isna()
+    if nulls.any():
+        result[nulls] = series[nulls].map(lambda x: clean_text_field(x, prefix))
+    return result
+
+# Cache LRU terbatas untuk hasil cleaning per nilai mentah (kunci: kolom + varian parser + nilai).
+# Kolom mentah sangat berulang (Size, Gender, Colors, Rating), jadi setiap nilai unik cukup dibersihkan
+# sekali: Series dipecah menjadi kode kategori + nilai unik, hanya nilai unik yang belum ada di cache
+# yang dibersihkan (dengan fungsi vektor), lalu hasilnya dipetakan kembali lewat kode. Cache bertahan
+# lintas chunk streaming; entri yang paling lama tidak dipakai dibuang saat melebihi maxsize.
+class ValueCache:
+    def __init__(self, maxsize=100000):
+        self.maxsize = maxsize
+        self.stats = {}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.stats = {}
+
+    # Membersihkan series memakai cleaner vektor (Series -> Series) hanya untuk nilai unik yang belum di-cache.
+    # variant membedakan parser/opsi yang berbeda untuk kolom yang sama (mis. kurs harga lain di spec lain).
+    def clean(self, column, series, cleaner, dtype, variant=None):
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+        else:
+            codes, uniques = pd.factorize(series)
+        uniques = np.asarray(uniques, dtype=object)
+
+        with self._lock:
+            stats = self.stats.setdefault(column, {'rows': 0, 'distinct': 0, 'hits': 0, 'misses': 0})
+            cleaned = np.empty(len(uniques), dtype=dtype)
+            missing = []
+            for i, value in enumerate(uniques):
+                key = (column, variant, value)
+                if key in self._entries:
+                    self._entries.move_to_end(key)
+                    cleaned[i] = self._entries[key]
+                else:
+                    missing.append(i)
+
+            if missing:
+                fresh = cleaner(pd.Series(uniques[missing], dtype=object)).to_numpy()
+                cleaned[missing] = fresh
+                for i, value in zip(missing, fresh):
+                    self._entries[(column, variant, uniques[i])] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+            stats['rows'] += len(series)
+            stats['distinct'] += len(uniques)
+            stats['hits'] += len(uniques) - len(missing)
+            stats['misses'] += len(missing)
+
+        result = pd.Series(cleaned.take(np.maximum(codes, 0)) if len(uniques) else np.empty(len(series), dtype=dtype),
+                           index=series.index, dtype=dtype)
+        # Null (kode -1) dibersihkan langsung agar None/NaN tetap sama dengan fungsi skalar
+        nulls = codes < 0
+        if nulls.any():
+            result[nulls] = cleaner(series[nulls].astype(object)).to_numpy()
+        return result
+
+    # Ringkasan hit rate per kolom (hit = nilai unik yang sudah ada di cache)
+    def report(self):
+        with self._lock:
+            report = {column: dict(stats) for column, stats in self.stats.items()}
+        for stats in report.values():
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else None
+            # Baris yang tidak perlu dibersihkan ulang (nilai berulang dalam chunk + hit cache)
+            stats['rows_saved'] = stats['rows'] - stats['misses']
+        logging.info("Value cache: " + ', '.join(
+            f"{column} {stats['hit_rate'] if stats['hit_rate'] is not None else 0:.1%} hits ({stats['misses']} cleaned for {stats['rows']} rows)"
+            for column, stats in report.items()
+        ))
+        return report
+
+# Cache default yang dipakai engine 'memoized'
+value_cache = ValueCache()
+
+# Parser nilai yang bisa dipakai di spec transform: nama -> (fungsi skalar, fungsi vektor, dtype hasil).
+# Opsi parser di spec (mis. rate, prefix) diteruskan sebagai keyword ke kedua fungsi.
+VALUE_PARSERS = {
+    'price': (clean_price, clean_price_series, 'float64'),
+    'rating': (clean_rating, clean_rating_series, 'float64'),
+    'colors': (clean_colors, clean_colors_series, 'int64'),
+    'text': (clean_text_field, clean_text_series, object),
+}
+
+# Spec transform deklaratif untuk data fashion-studio:
+# - dedupe: kolom kunci duplikat (None = seluruh kolom)
+# - exclude: nilai mentah yang langsung dibuang sebelum cleaning apa pun
+# - columns: parser per kolom beserta opsinya (termasuk kurs konversi harga)
+# - filters: syarat (kolom, operator, nilai) pada nilai yang sudah dibersihkan
+TRANSFORM_SPEC = {
+    'dedupe': None,
+    'exclude': {'Title': ['Unknown Product']},
+    'columns': {
+        'Price': {'parser': 'price', 'rate': USD_TO_IDR},
+        'Rating': {'parser': 'rating'},
+        'Colors': {'parser': 'colors'},
+        'Size': {'parser': 'text', 'prefix': 'Size: '},
+        'Gender': {'parser': 'text', 'prefix': 'Gender: '},
+    },
+    'filters': [('Price', '>', 0), ('Rating', '>', 0)],
+}
+
+FILTER_OPERATORS = {
+    '>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '==': operator.eq, '!=': operator.ne,
+}
+
+# Fungsi untuk membuat satu pass cleaning kolom (Series -> Series) sesuai engine
+def _column_pass(column, parser, options, engine):
+    scalar_func, series_func, dtype = VALUE_PARSERS[parser]
+    if engine == 'scalar':
+        return lambda series: series.apply(lambda x: scalar_func(x, **options)).astype(str if dtype is object else dtype)
+    vectorized = lambda series: series_func(series, **options)
+    if engine == 'memoized':
+        variant = (parser, tuple(sorted(options.items())))
+        return lambda series: value_cache.clean(column, series, vectorized, dtype, variant)
+    return vectorized
+
+# Rencana transform hasil kompilasi spec. Urutan eksekusi:
+# 1. exclude pada nilai mentah (murah, tanpa konversi)
+# 2. pass kolom yang dipakai filter, lalu semua filter digabung menjadi satu mask dan satu subset
+# 3. pass kolom lainnya hanya untuk baris yang lolos
+class TransformPlan:
+    def __init__(self, engine, dedupe, exclusions, filter_passes, filters, other_passes):
+        self.engine = engine
+        self.dedupe = dedupe
+        self.exclusions = exclusions
+        self.filter_passes = filter_passes
+        self.filters = filters
+        self.other_passes = other_passes
+
+    # Langkah rencana dalam bentuk teks (untuk log/debug)
+    def describe(self):
+        steps = [f"exclude {column} in {values}" for column, values in self.exclusions]
+        steps += [f"clean {column}" for column, _ in self.filter_passes]
+        if self.filters:
+            steps.append("filter " + " & ".join(f"{column} {op} {value}" for column, op, _, value in self.filters))
+        steps += [f"clean {column}" for column, _ in self.other_passes]
+        return steps
+
+    def _run_pass(self, column, cleaner, series):
+        with metrics.stage(f"clean_{column.lower()}", rows=len(series)):
+            return cleaner(series)
+
+    # Semua pass kolom tanpa exclude/filter (df diubah langsung)
+    def clean_columns(self, df):
+        for column, cleaner in self.filter_passes + self.other_passes:
+            if column in df:
+                df[column] = self._run_pass(column, cleaner, df[column])
+        return df
+
+    def run(self, df):
+        keep = np.ones(len(df), dtype=bool)
+        for column, values in self.exclusions:
+            if column in df:
+                keep &= ~df[column].isin(values).to_numpy()
+
+        cleaned = {}
+        candidates = df[keep] if not keep.all() else df
+        for column, cleaner in self.filter_passes:
+            if column in df:
+                cleaned[column] = self._run_pass(column, cleaner, candidates[column])
+
+        mask = np.ones(len(candidates), dtype=bool)
+        for column, _, compare, value in self.filters:
+            values = cleaned[column] if column in cleaned else candidates[column]
+            mask &= compare(values, value).to_numpy()
+
+        df = candidates[mask].copy()
+        for column, values in cleaned.items():
+            df[column] = values[mask]
+        for column, cleaner in self.other_passes:
+            if column in df:
+                df[column] = self._run_pass(column, cleaner, df[column])
+        return df
+
+# Fungsi untuk mengompilasi spec transform menjadi TransformPlan (sekali, lalu dipakai ulang per chunk)
+def compile_spec(spec=None, engine='vectorized'):
+    spec = TRANSFORM_SPEC if spec is None else spec
+    if engine not in ('vectorized', 'scalar', 'memoized'):
+        raise ValueError(f"Unknown transform engine '{engine}'")
+
+    passes = {}
+    for column, options in spec.get('columns', {}).items():
+        options = dict(options)
+        parser = options.pop('parser')
+        if parser not in VALUE_PARSERS:
+            raise ValueError(f"Unknown parser '{parser}' for column '{column}'")
+        passes[column] = _column_pass(column, parser, options, engine)
+
+    filters = []
+    for column, op, value in spec.get('filters', []):
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unknown filter operator '{op}'")
+        filters.append((column, op, FILTER_OPERATORS[op], value))
+    filter_columns = {column for column, *_ in filters}
+
+    return TransformPlan(
+        engine=engine,
+        dedupe=list(spec['dedupe']) if spec.get('dedupe') else None,
+        exclusions=[(column, list(values)) for column, values in spec.get('exclude', {}).items()],
+        filter_passes=[(column, cleaner) for column, cleaner in passes.items() if column in filter_columns],
+        filters=filters,
+        other_passes=[(column, cleaner) for column, cleaner in passes.items() if column not in filter_columns],
+    )
+
+# Rencana untuk spec default, dikompilasi sekali per engine
+_DEFAULT_PLANS = {}
+
+# Fungsi untuk mengambil TransformPlan: plan yang sudah dikompilasi, spec dict, atau spec default
+def get_plan(spec=None, engine='vectorized'):
+    if isinstance(spec, TransformPlan):
+        return spec
+    if spec is not None:
+        return compile_spec(spec, engine)
+    if engine not in _DEFAULT_PLANS:
+        _DEFAULT_PLANS[engine] = compile_spec(None, engine)
+    return _DEFAULT_PLANS[engine]
+
+# Fungsi untuk membersihkan dan mengonversi tipe data setiap kolom.
+# engine='vectorized' memakai operasi per kolom (Arrow), engine='scalar' memakai fungsi clean_* per baris,
+# engine='memoized' membersihkan setiap nilai unik sekali lewat value_cache (LRU lintas chunk).
+# Setiap pass kolom diukur sebagai stage clean_<kolom> (lihat utils.metrics).
+def clean_columns(df, engine='vectorized', spec=None):
+    return get_plan(spec, engine).clean_columns(df)
+
+# Fungsi untuk menjalankan exclude, cleaning dan filter (sesuai spec) pada DataFrame mentah yang sudah dideduplikasi
+def transform_frame(df, engine='vectorized', spec=None):
+    return get_plan(spec, engine).run(df)
+
+# Himpunan fingerprint baris (hash 64-bit per baris) untuk deduplikasi lintas chunk.
+# Disimpan sebagai beberapa array uint64 terurut (8 byte per baris unik); array kecil
+# digabung ke array sebelumnya saat ukurannya menyamai, sehingga jumlah array tetap O(log n).
+class RowFingerprints:
+    def __init__(self):
+        self._runs = []
+
+    def __len__(self):
+        return sum(len(run) for run in self._runs)
+
+    @property
+    def nbytes(self):
+        return sum(run.nbytes for run in self._runs)
+
+    # Fungsi untuk menghitung fingerprint setiap baris DataFrame
+    @staticmethod
+    def hash_rows(df):
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+    # Menandai baris yang belum pernah terlihat (kemunculan pertama) lalu menyimpannya
+    def add_new(self, hashes):
+        new = np.zeros(len(hashes), dtype=bool)
+        if not len(hashes):
+            return new
+        _, first_index = np.unique(hashes, return_index=True)
+        new[first_index] = True
+
+        for run in self._runs:
+            positions = np.minimum(np.searchsorted(run, hashes), len(run) - 1)
+            new &= run[positions] != hashes
+
+        if new.any():
+            self._runs.append(np.sort(hashes[new]))
+        while len(self._runs) > 1 and len(self._runs[-2]) <= len(self._runs[-1]):
+            last = self._runs.pop()
+            self._runs[-1] = np.sort(np.concatenate([self._runs[-1], last]))
+        return new
+
+# Fungsi untuk membaca products_raw.csv (atau CSV mentah lain) per chunk sebagai string
+def read_raw_csv_chunks(filename='products_raw.csv', chunk_size=50000):
+    return pd.read_csv(filename, dtype=str, chunksize=chunk_size)
+
+# Fungsi untuk mengubah sumber data (iterator dict atau iterator DataFrame) menjadi DataFrame berukuran <= chunk_size
+def _iter_raw_frames(source, chunk_size):
+    batch = []
+    offset = 0
+    for item in source:
+        if isinstance(item, pd.DataFrame):
+            for start in range(0, len(item), chunk_size):
+                yield item.iloc[start:start + chunk_size]
+            continue
+        batch.append(item)
+        if len(batch) >= chunk_size:
+            yield pd.DataFrame(batch, index=pd.RangeIndex(offset, offset + len(batch)))
+            offset += len(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch, index=pd.RangeIndex(offset, offset + len(batch)))
+
+# Fungsi transform streaming: menerima iterator record mentah (dict) atau chunk DataFrame
+# (mis. dari read_raw_csv_chunks) dan menghasilkan chunk bersih berukuran <= chunk_size.
+# Deduplikasi lintas chunk memakai RowFingerprints, sehingga memori hanya bergantung pada
+# ukuran chunk dan 8 byte per baris unik, bukan pada ukuran seluruh katalog.
+# spec: dict spec transform atau TransformPlan (default TRANSFORM_SPEC), dikompilasi sekali untuk semua chunk.
+def iter_clean_chunks(source, chunk_size=50000, engine='vectorized', fingerprints=None, spec=None):
+    fingerprints = fingerprints if fingerprints is not None else RowFingerprints()
+    plan = get_plan(spec, engine)
+    rows_in = rows_out = 0
+    for raw_df in _iter_raw_frames(source, chunk_size):
+        rows_in += len(raw_df)
+        keys = raw_df[plan.dedupe] if plan.dedupe else raw_df
+        df = raw_df[fingerprints.add_new(RowFingerprints.hash_rows(keys))]
+        df = plan.run(df)
+        rows_out += len(df)
+        if not df.empty:
+            yield df
+    logging.info(f"Streaming transformation done. Rows in: {rows_in}, rows out: {rows_out}")
+
+# Fungsi untuk mengubah DataFrame bersih ke skema hemat memori:
+# kolom teks berkardinalitas rendah menjadi category, Rating float32, Colors int8/int16,
+# dan timestamp string menjadi datetime64
+def compact_dtypes(df, max_category_ratio=0.5, category_columns=('Size', 'Gender')):
+    df = df.copy()
+    for column in df.columns:
+        if column == 'timestamp' or df[column].dtype != object:
+            continue
+        if column in category_columns or (len(df) and df[column].nunique() / len(df) <= max_category_ratio):
+            df[column] = df[column].astype('category')
+
+    if 'Rating' in df:
+        df['Rating'] = df['Rating'].astype('float32')
+    if 'Colors' in df:
+        # Tipe integer terkecil yang cukup: int8 untuk jumlah warna normal, int16 jika lebih besar
+        df['Colors'] = pd.to_numeric(df['Colors'], downcast='integer')
+    if 'timestamp' in df:
+        df['timestamp'] = pd.to_datetime(df['timestamp'], format="%Y-%m-%d %H:%M:%S", errors='coerce')
+    return df
+
+# Fungsi untuk membandingkan pemakaian memori (deep) per kolom sebelum dan sesudah compact_dtypes
+def memory_report(before, after):
+    report = pd.DataFrame({
+        'dtype_before': before.dtypes.astype(str),
+        'dtype_after': after.dtypes.astype(str),
+        'bytes_before': before.memory_usage(index=False, deep=True),
+        'bytes_after': after.memory_usage(index=False, deep=True),
+    })
+    report.loc['TOTAL'] = ['', '', report['bytes_before'].sum(), report['bytes_after'].sum()]
+    report['ratio'] = (report['bytes_after'] / report['bytes_before']).round(3)
+    return report
+
+# Fungsi utama untuk memproses transform DataFrame.
+# compact=True mengembalikan skema hemat memori (lihat compact_dtypes) dan mencatat memory report.
+# verbose=True mencetak df.info() sebelum/sesudah transformasi (tidak gratis untuk DataFrame besar).
+# spec: dict spec transform atau TransformPlan hasil compile_spec (default TRANSFORM_SPEC).
+@instrument('transform', rows=result_rows)
+def process_dataframe(data_list, engine='vectorized', compact=False, verbose=False, spec=None):
     logging.info("Starting transformation...")
     
     if not data_list:
@@ -56,26 +482,24 @@ def process_dataframe(data_list):
 
     try:
         df = pd.DataFrame(data_list)
-        print("\nInitial DataFrame info (before transformation):")
-        df.info()
+        if verbose:
+            print("\nInitial DataFrame info (before transformation):")
+            df.info()
 
-        # Menghapus Data Duplikat
-        df.drop_duplicates(inplace=True)
+        plan = get_plan(spec, engine)
 
-        # Menghapus Produk dengan Title "Unknown Product"
-        df = df[df['Title'] != "Unknown Product"]
-        
-        # Cleaning & Konversi Tipe Data
-        df['Price'] = df['Price'].apply(clean_price).astype(float)
-        df['Rating'] = df['Rating'].apply(clean_rating).astype(float)
-        df['Colors'] = df['Colors'].apply(clean_colors).astype('int64')
-        df['Size'] = df['Size'].apply(lambda x: clean_text_field(x, "Size: ")).astype(str)
-        df['Gender'] = df['Gender'].apply(lambda x: clean_text_field(x, "Gender: ")).astype(str)
-
-        # Filtering Data Invalid (Harga > 0 dan Rating > 0) indikasi Price Unavailable atau Invalid Rating
-        df = df[(df['Price'] > 0) & (df['Rating'] > 0)]
-        print("\nInitial DataFrame info (after transformation):")
-        df.info()
+        # Menghapus Data Duplikat (berdasarkan kolom kunci dedupe di spec, default seluruh kolom)
+        df.drop_duplicates(subset=plan.dedupe, inplace=True)
+
+        df = plan.run(df)
+        if compact:
+            compacted = compact_dtypes(df)
+            report = memory_report(df, compacted)
+            logging.info(f"Compact dtypes: {report.loc['TOTAL', 'bytes_before']} -> {report.loc['TOTAL', 'bytes_after']} bytes")
+            df = compacted
+        if verbose:
+            print("\nInitial DataFrame info (after transformation):")
+            df.info()
 
         logging.info(f"Transformation done. Rows: {len(df)}")
         return df